@@ -18,4 +18,135 @@ class Settings(BaseSettings):
     FRED_API_KEY: str
     DATABASE_URL: str
 
+    # --- 선택 설정 (기본값 제공) ---
+    # OpenAI 호환 API 주소 (비워 두면 공식 OpenAI 엔드포인트 사용)
+    OPENAI_BASE_URL: str | None = None
+    # DeepSearch API 주소 (벤치마크/테스트 시 로컬 스텁 서버로 교체 가능)
+    DEEPSEARCH_API_BASE_URL: str = "https://api-v2.deepsearch.com"
+    # 네이버 증권 시세 API 주소 (벤치마크/테스트 시 로컬 스텁 서버로 교체 가능)
+    NAVER_STOCK_API_BASE_URL: str = "https://m.stock.naver.com/api/stock"
+    # 종목 시세 캐시 유지 시간(초)
+    STOCK_QUOTE_CACHE_TTL: float = 5.0
+    # 여러 종목 일괄 조회 시 동시 요청 수 / 종목당 제한 시간(초) / 최대 종목 수
+    STOCK_BATCH_CONCURRENCY: int = 10
+    STOCK_BATCH_TIMEOUT: float = 3.0
+    STOCK_BATCH_MAX_CODES: int = 100
+    # 실시간 시세 구독(WebSocket): 종목별 조회 주기(초), 구독자가 모두 떠난 종목의 조회 중단까지 대기(초),
+    # 연결당/서버 전체 최대 구독 종목 수, 느린 클라이언트로의 메시지 전송 제한 시간(초, 넘으면 연결 종료)
+    PRICE_STREAM_INTERVAL: float = 2.0
+    PRICE_STREAM_IDLE_TIMEOUT: float = 30.0
+    PRICE_STREAM_MAX_CODES_PER_CLIENT: int = 50
+    PRICE_STREAM_MAX_CODES: int = 1000
+    PRICE_STREAM_SEND_TIMEOUT: float = 10.0
+    # 공용 비동기 HTTP 클라이언트 커넥션 풀 설정
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_TIMEOUT: float = 5.0
+    # 기사 클릭 수를 모아서 DB 에 반영하는 주기(초). CLICK_SYNC_FLUSH=true 이면 클릭마다 즉시 반영(테스트용)
+    CLICK_FLUSH_INTERVAL: float = 5.0
+    CLICK_SYNC_FLUSH: bool = False
+    # 인기 검색어 집계 윈도우/버킷 크기(초), 메모리에 유지할 상위 개수, DB 와 재동기화 주기(초)
+    KEYWORD_RANKING_WINDOW_SECONDS: int = 86400
+    KEYWORD_RANKING_BUCKET_SECONDS: int = 300
+    KEYWORD_RANKING_TOP_K: int = 50
+    KEYWORD_RANKING_RECONCILE_INTERVAL: int = 1800
+    # 검색 로그 버퍼 큐 크기 / 한 번에 저장할 개수 / 최대 대기 시간(초)
+    SEARCH_LOG_QUEUE_SIZE: int = 10_000
+    SEARCH_LOG_BATCH_SIZE: int = 500
+    SEARCH_LOG_FLUSH_INTERVAL: float = 1.0
+    # AI 인사이트 캐시 유지 시간(초) / 메모리 최대 항목 수
+    INSIGHT_CACHE_TTL: float = 86400
+    INSIGHT_CACHE_MAX_ENTRIES: int = 1024
+    # LLM(CLOVA/GPT) 호출 보호: 요청 마감 시간(초), 제공자별 최대 동시 요청 수, 재시도 횟수, 서킷 브레이커
+    LLM_TIMEOUT: float = 30.0
+    CLOVA_MAX_IN_FLIGHT: int = 8
+    GPT_MAX_IN_FLIGHT: int = 8
+    LLM_MAX_RETRIES: int = 3
+    LLM_BREAKER_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # AI 보고서 저장소: sqlite(기본, 단일 파일 + zlib 압축) 또는 files(기존 reports/*.txt), 메모리 LRU 크기
+    REPORT_STORE_BACKEND: str = "sqlite"
+    REPORT_STORE_PATH: str = "reports/reports.db"
+    REPORTS_DIR: str = "reports"
+    REPORT_CACHE_SIZE: int = 256
+    # 문서 챗봇 검색: 보고서를 청크로 나눠 BM25 상위 청크만 프롬프트에 넣습니다. (false 면 보고서 전체 사용)
+    CHATBOT_RETRIEVAL_ENABLED: bool = True
+    CHATBOT_CHUNK_CHARS: int = 500
+    CHATBOT_TOP_K: int = 4
+    CHATBOT_INDEX_CACHE_SIZE: int = 256
+    # 뉴스 피드 API: 페이지 최대 크기, 첫 페이지 / 커서로 조회한 이후 페이지의 Cache-Control max-age(초)
+    NEWS_FEED_MAX_LIMIT: int = 100
+    NEWS_FEED_MAX_AGE: int = 30
+    NEWS_FEED_CURSOR_MAX_AGE: int = 300
+    # 읽기 전용 DB 주소 (예: PostgreSQL 읽기 복제본). 비워 두면 DATABASE_URL 에 읽기 전용 풀을 따로 만듭니다.
+    DATABASE_READ_URL: str | None = None
+    # 서버 DB(PostgreSQL 등) 커넥션 풀 설정
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    # SQLite 운영 설정 (SQLITE_TUNED=false 면 기본 설정 그대로): busy_timeout(ms), mmap 크기(bytes), 페이지 캐시(KB), 읽기/쓰기 풀 크기
+    SQLITE_TUNED: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_READER_POOL_SIZE: int = 8
+    SQLITE_WRITER_POOL_SIZE: int = 8
+    # 경제지표 스냅샷: 다른 워커가 저장한 새 버전을 확인하는 주기(초), 보관할 버전 수,
+    # 시작 시 이보다 오래된 스냅샷이면(또는 없으면) 백그라운드로 바로 다시 가져옵니다(초)
+    INDICATOR_REFRESH_INTERVAL: int = 30
+    INDICATOR_SNAPSHOT_KEEP: int = 100
+    INDICATOR_MAX_AGE: int = 86400
+    # FRED API 주소 (벤치마크/테스트 시 로컬 스텁 서버로 교체 가능)
+    FRED_API_BASE_URL: str = "https://api.stlouisfed.org/fred"
+    # FRED 시계열 로컬 저장소 경로, 증분 갱신 시 마지막 관측일보다 며칠 앞부터 다시 받을지(수정 발표 반영)
+    FRED_STORE_DIR: str = "data/fred"
+    FRED_OVERLAP_DAYS: int = 0
+    # 빅컷 판단: FRED_BIG_CUT_WINDOW_DAYS 일 사이 FRED_BIG_CUT_THRESHOLD %p 이상 인하, 최근 FRED_BIG_CUT_LOOKBACK_DAYS 일 안의 인하만 표시
+    FRED_BIG_CUT_THRESHOLD: float = 0.4
+    FRED_BIG_CUT_WINDOW_DAYS: int = 7
+    FRED_BIG_CUT_LOOKBACK_DAYS: int = 180
+
+    # 주요 테마 외 테마 뉴스 캐시: 신선 유지 시간(초), 만료 후 옛 값을 돌려주며 백그라운드 갱신하는 시간(초), 최대 테마 수
+    THEME_CACHE_TTL: float = 300.0
+    THEME_CACHE_STALE_TTL: float = 1800.0
+    THEME_CACHE_MAXSIZE: int = 256
+    # THEME_PROMOTE_WINDOW 초 안에 THEME_PROMOTE_THRESHOLD 번 이상 요청된 테마는 정기 수집 대상에 추가 (최대 THEME_PROMOTE_MAX 개)
+    # THEME_PROMOTE_IDLE 초 동안 다시 승격되지 않은 테마는 정기 수집에서 빠집니다.
+    THEME_PROMOTE_THRESHOLD: int = 20
+    THEME_PROMOTE_WINDOW: float = 3600.0
+    THEME_PROMOTE_MAX: int = 10
+    THEME_PROMOTE_IDLE: float = 86400.0
+
+    # 종목 색인 원본: "fdr"(FinanceDataReader KRX 상장 목록) 또는 "csv"(STOCK_SYMBOLS_CSV, Code/Name 열)
+    STOCK_SYMBOLS_SOURCE: str = "fdr"
+    STOCK_SYMBOLS_CSV: str = "data/stock_symbols.csv"
+    # 종목 목록을 원본에서 다시 받는 시각(매일, 시) / 다른 워커가 갱신한 목록을 DB 에서 다시 읽는 주기(초)
+    STOCK_SYMBOLS_REFRESH_HOUR: int = 7
+    STOCK_SYMBOLS_RELOAD_INTERVAL: int = 600
+    # 색인에서 못 찾아 DeepSearch 로 찾은 종목명 → 코드 기억 개수, 자동완성 최대 개수
+    STOCK_SYMBOLS_ALIAS_CACHE_SIZE: int = 4096
+    STOCK_AUTOCOMPLETE_MAX_LIMIT: int = 20
+
+    # 조회 API 응답 캐시: 다른 워커의 쓰기를 반영하기까지 최대 시간(초), 클라이언트 Cache-Control max-age(초),
+    # 테마 목록처럼 거의 바뀌지 않는 응답의 유지 시간(초)
+    RESPONSE_CACHE_TTL: float = 30.0
+    RESPONSE_CACHE_MAX_AGE: int = 5
+    RESPONSE_CACHE_STATIC_TTL: float = 3600.0
+
+    # /metrics (Prometheus) 요청/DB 계측 사용 여부
+    METRICS_ENABLED: bool = True
+
+    # 스케줄러 실행 방식
+    # "leader": DB 리스를 가진 프로세스 하나만 뉴스/경제지표 수집 작업 실행 (워커 여러 개일 때)
+    # "local": 프로세스마다 모든 작업 실행 (기존 방식)
+    SCHEDULER_MODE: str = "leader"
+    # 리더 리스 유효 시간(초)과 연장 주기(초). 리더가 죽으면 최대 TTL 후 다른 워커가 넘겨받습니다.
+    LEADER_LEASE_TTL: float = 30.0
+    LEADER_LEASE_RENEW_INTERVAL: float = 10.0
+
+    # 앱 시작(lifespan) 시 테이블 생성 여부. 워커가 여러 개인 배포에서는 false 로 두고
+    # 배포 때 한 번 `python create_tables.py` 로 스키마를 만듭니다.
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = True
+
 settings = Settings()
\ No newline at end of file
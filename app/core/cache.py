@@ -0,0 +1,89 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+class AsyncTTLCache:
+    """
+    TTL + LRU 기반의 비동기 캐시입니다.
+    같은 키에 대한 동시 miss 는 하나의 로더 실행 결과를 함께 기다립니다. (single-flight)
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any | None:
+        """만료되지 않은 값이 있으면 반환하고, 없으면 None 을 반환합니다."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable | None = None):
+        """키 하나 또는 (key=None 이면) 전체 항목을 삭제합니다."""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        should_cache: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """
+        캐시에 값이 있으면 바로 반환하고, 없으면 loader 를 한 번만 실행해 결과를 저장합니다.
+        loader 가 None 을 반환하거나(조회 실패) should_cache 가 False 를 반환하면 캐시에 저장하지 않습니다.
+        """
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._load(key, loader, should_cache))
+            self._inflight[key] = task
+        # 대기 중인 요청 하나가 취소되어도 공유 중인 로더는 계속 진행되도록 shield 로 감쌉니다.
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], should_cache) -> Any:
+        try:
+            value = await loader()
+            if value is not None and (should_cache is None or should_cache(value)):
+                self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
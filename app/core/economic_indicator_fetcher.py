@@ -1,23 +1,66 @@
-from fredapi import Fred
+from datetime import timedelta
+
 from app.config import settings
+from app.core.metrics import external_call
+from app.core.timeseries_store import TimeSeriesStore
+
+# fredapi(pandas 포함)는 임포트가 무거우므로, 임포트와 클라이언트 생성 모두 처음 사용할 때 합니다.
+_fred = None
+
+def get_fred_client():
+    """FRED API 클라이언트를 반환합니다. (최초 호출 시 생성)"""
+    global _fred
+    if _fred is None:
+        from fredapi import Fred
+
+        _fred = Fred(api_key=settings.FRED_API_KEY)
+        _fred.root_url = settings.FRED_API_BASE_URL
+    return _fred
+
+# 미국 기준 금리 (Effective Federal Funds Rate, 일별) / 미국 실질 GDP 성장률 (전분기 대비, 분기별)
+INTEREST_RATE_SERIES = "DFF"
+GDP_GROWTH_SERIES = "A191RL1Q225SBEA"
+
+# FRED 시계열 로컬 저장소 (시계열별 .npz 파일)
+series_store = TimeSeriesStore(settings.FRED_STORE_DIR)
+
+def update_fred_series(client=None) -> dict[str, int]:
+    """저장된 마지막 관측일 이후 값만 FRED 에서 받아 로컬 저장소를 갱신합니다. (시계열별 받은 관측 수)"""
+    client = client or get_fred_client()
+    fetched = {}
+    for series_id in (INTEREST_RATE_SERIES, GDP_GROWTH_SERIES):
+        try:
+            with external_call("fred", series_id):
+                fetched[series_id] = series_store.update_from_fred(series_id, client, overlap_days=settings.FRED_OVERLAP_DAYS)
+        except Exception as e:
+            # 갱신에 실패해도 이미 저장된 이력으로 지표를 계산합니다.
+            print(f"Error fetching {series_id} from FRED API: {e}")
+            fetched[series_id] = 0
+    return fetched
+
+def _format_change(change: float | None) -> str:
+    return "N/A" if change is None else f"{change:+.2f}%p"
+
+def get_us_economic_indicators(client=None):
+    """FRED 시계열을 증분 갱신한 뒤, 미국의 최신 주요 경제 지표와 금리 변화를 계산합니다."""
+    update_fred_series(client)
+    rates = series_store.load(INTEREST_RATE_SERIES)
+    gdp = series_store.load(GDP_GROWTH_SERIES)
+    if rates.latest is None or gdp.latest is None:
+        return None
 
-fred = Fred(api_key=settings.FRED_API_KEY)
-
-def get_us_economic_indicators():
-    """FRED API를 이용해 미국의 최신 주요 경제 지표를 가져옵니다."""
-    try:
-        # 미국 기준 금리 (Effective Federal Funds Rate), 가장 최신 값
-        interest_rate_series = fred.get_series('DFF')
-        latest_interest_rate = interest_rate_series.iloc[-1]
-
-        # 미국 실질 GDP 성장률 (전분기 대비), 가장 최신 값
-        gdp_growth_series = fred.get_series('A191RL1Q225SBEA')
-        latest_gdp_growth = gdp_growth_series.iloc[-1]
-        
-        return {
-            "current_us_interest_rate": f"{latest_interest_rate:.2f}%",
-            "current_us_gdp_growth": f"{latest_gdp_growth:.2f}%"
-        }
-    except Exception as e:
-        print(f"Error fetching from FRED API: {e}")
-        return None
\ No newline at end of file
+    # 최근 BIG_CUT_LOOKBACK 일 안에 있었던 대규모 금리 인하(빅컷)
+    big_cuts = rates.detect_drops(
+        threshold=settings.FRED_BIG_CUT_THRESHOLD,
+        window_days=settings.FRED_BIG_CUT_WINDOW_DAYS,
+        since=rates.last_date - timedelta(days=settings.FRED_BIG_CUT_LOOKBACK_DAYS),
+    )
+    return {
+        "current_us_interest_rate": f"{rates.latest:.2f}%",
+        "current_us_gdp_growth": f"{gdp.latest:.2f}%",
+        "us_interest_rate_change_30d": _format_change(rates.change_over(30)),
+        "us_interest_rate_change_1y": _format_change(rates.change_over(365)),
+        "recent_big_cut": (
+            ", ".join(f"{day.isoformat()} ({change:+.2f}%p)" for day, change in big_cuts) if big_cuts else "없음"
+        ),
+    }
@@ -0,0 +1,35 @@
+import hashlib
+import json
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더(여러 개, W/ 약한 비교, * 포함)가 etag 와 일치하는지 확인합니다."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+def render_json(payload) -> bytes:
+    """응답 본문용 JSON 바이트 (공백 없이, 한글은 그대로)."""
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def json_response(request: Request, body: bytes, etag: str, max_age: int) -> Response:
+    """직렬화된 본문을 ETag / Cache-Control 헤더와 함께 반환합니다. ETag 가 일치하면 본문 없이 304."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def cached_json_response(request: Request, payload, max_age: int) -> Response:
+    """
+    payload 를 JSON 으로 직렬화해 ETag / Cache-Control 헤더와 함께 반환합니다.
+    클라이언트(또는 CDN)가 같은 ETag 를 가지고 있으면 본문 없이 304 를 돌려줍니다.
+    """
+    body = render_json(payload)
+    return json_response(request, body, make_etag(body), max_age)
@@ -0,0 +1,33 @@
+import httpx
+
+from app.config import settings
+
+# --- 공용 비동기 HTTP 클라이언트 ---
+# 요청마다 커넥션을 새로 맺지 않도록 keep-alive 커넥션 풀을 프로세스 전체에서 공유합니다.
+# 임포트 시점에는 아무것도 만들지 않고, 처음 사용할 때 생성합니다.
+_client: httpx.AsyncClient | None = None
+
+def create_async_client(**kwargs) -> httpx.AsyncClient:
+    """설정(HTTP_TIMEOUT, HTTP_MAX_*)대로 커넥션 풀을 잡은 새 httpx.AsyncClient 를 만듭니다."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        **kwargs,
+    )
+
+def get_async_client() -> httpx.AsyncClient:
+    """공용 httpx.AsyncClient 를 반환합니다. (최초 호출 시 생성)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_async_client(headers={"User-Agent": "Mozilla/5.0"})
+    return _client
+
+async def close_async_client():
+    """앱 종료 시 커넥션 풀을 정리합니다."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,23 +1,61 @@
-import os
+import asyncio
 import uuid
-import openai
+from contextlib import aclosing
+from typing import AsyncIterator
 from app.config import settings
-from app.services.scheduler import indicator_cache
+from app.core.llm_client import clova_guard, gpt_guard
+from app.core.metrics import FirstToken, external_call
+from app.core.report_store import get_report_store
+from app.core.retrieval import report_retriever
+from app.models.schemas import InsightResponse
+from app.services.indicator_store import indicator_store
 
 # --- API 클라이언트 설정 ---
-clova_client = openai.OpenAI(
-    api_key=settings.NCP_API_KEY,
-    base_url=settings.NCP_APIGW_URL
-)
-gpt_client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+# 재시도/타임아웃은 llm_client 의 ProviderGuard 가 담당하므로 SDK 자체 재시도는 끕니다.
+# openai 패키지는 임포트가 무거우므로, 임포트와 클라이언트 생성 모두 처음 사용할 때 합니다.
+_clients: dict = {}
+
+def _get_client(name: str, api_key: str, base_url: str | None):
+    client = _clients.get(name)
+    if client is None or client.is_closed():
+        import openai
+
+        client = _clients[name] = openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=settings.LLM_TIMEOUT,
+            max_retries=0
+        )
+    return client
+
+def get_clova_client():
+    """HyperCLOVA X (OpenAI 호환) 클라이언트. (최초 호출 시 생성)"""
+    return _get_client("clova", settings.NCP_API_KEY, settings.NCP_APIGW_URL)
+
+def get_gpt_client():
+    """GPT 클라이언트. (최초 호출 시 생성)"""
+    return _get_client("gpt", settings.OPENAI_API_KEY, settings.OPENAI_BASE_URL)
+
+async def close_clients():
+    """앱 종료 시 LLM 클라이언트의 커넥션 풀을 정리합니다. (만든 적 없는 클라이언트는 건너뜀)"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
+
+# 오류 시 반환하는 문구 (캐시에 저장하지 않기 위해 구분합니다)
+CLOVA_ERROR_CONCLUSION = "분석 오류"
+GPT_ERROR_REPORT = "보고서 생성 중 오류가 발생했습니다."
 
 # --- 1단계: HyperCLOVA X로 빠른 인사이트 생성 ---
-def get_clova_insight(stock_name: str) -> tuple[str, str]:
+async def get_clova_insight(stock_name: str, economic_data: dict | None = None) -> tuple[str, str]:
     """
     매일 업데이트되는 실시간 경제지표를 바탕으로
     HyperCLOVA X로부터 신속한 1차 결론 및 근거를 도출합니다.
+    economic_data 를 주지 않으면 현재 경제지표 스냅샷을 사용합니다.
     """
-    economic_data = indicator_cache
+    if economic_data is None:
+        economic_data = indicator_store.data
 
     prompt = f"""
     당신은 아래의 [분석 프레임워크]에 따라 시장을 해석하는 숙련된 매크로 전략가입니다.
@@ -32,6 +70,8 @@ def get_clova_insight(stock_name: str) -> tuple[str, str]:
 
     [최신 경제 동향]
     - 미국 기준 금리: {economic_data.get('current_us_interest_rate', 'N/A')}
+    - 기준 금리 변화: 최근 30일 {economic_data.get('us_interest_rate_change_30d', 'N/A')}, 최근 1년 {economic_data.get('us_interest_rate_change_1y', 'N/A')}
+    - 최근 대규모 금리 인하(빅컷): {economic_data.get('recent_big_cut', 'N/A')}
     - 미국 GDP 성장률: {economic_data.get('current_us_gdp_growth', 'N/A')}
     - 최신 무역 정책 동향: {economic_data.get('latest_trade_policy', 'N/A')}
     - 분석 대상 종목: {stock_name}
@@ -42,12 +82,13 @@ def get_clova_insight(stock_name: str) -> tuple[str, str]:
     형식: 결론: [매수/매도/중립], 근거: [핵심 근거 한 문장]
     """
     try:
-        response = clova_client.chat.completions.create(
-            model="HCX-003",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=100,
-            temperature=0.3
-        )
+        with external_call("clova", "insight"):
+            response = await clova_guard.call(lambda: get_clova_client().chat.completions.create(
+                model="HCX-003",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=100,
+                temperature=0.3
+            ))
         result_text = response.choices[0].message.content.strip()
         
         parts = result_text.split(', 근거:')
@@ -58,12 +99,11 @@ def get_clova_insight(stock_name: str) -> tuple[str, str]:
 
     except Exception as e:
         print(f"CLOVA Insight Error: {e}")
-        return "분석 오류", "오류로 인해 근거를 생성할 수 없습니다."
+        return CLOVA_ERROR_CONCLUSION, "오류로 인해 근거를 생성할 수 없습니다."
 
 # --- 2단계: GPT로 심층 보고서 생성 ---
-def get_gpt_report(stock_name: str, clova_conclusion: str, clova_reason: str) -> str:
-    """GPT를 이용해 과거 사례와 비교 분석하는 심층 보고서를 작성합니다."""
-    prompt = f"""
+def _build_gpt_report_prompt(stock_name: str, clova_conclusion: str, clova_reason: str) -> str:
+    return f"""
     당신은 30년 경력의 베테랑 애널리스트입니다. '{stock_name}' 종목에 대한 1차 분석 결과는 다음과 같습니다.
     - 결론: '{clova_conclusion}'
     - 핵심 근거: '{clova_reason}'
@@ -73,41 +113,86 @@ def get_gpt_report(stock_name: str, clova_conclusion: str, clova_reason: str) ->
     2. 과거에 유사한 경제 상황(예: 2022년 금리인상기)이 있었는지 찾아보고, 당시 '{stock_name}'의 주가 흐름과 현재 상황의 다른 점을 비교 분석해주세요.
     3. 모든 내용을 종합하여, 전문적이지만 이해하기 쉬운 최종 투자 보고서를 500자 내외로 작성해주세요.
     """
+
+async def get_gpt_report(stock_name: str, clova_conclusion: str, clova_reason: str) -> str:
+    """GPT를 이용해 과거 사례와 비교 분석하는 심층 보고서를 작성합니다."""
+    prompt = _build_gpt_report_prompt(stock_name, clova_conclusion, clova_reason)
     try:
-        response = gpt_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with external_call("gpt", "report"):
+            response = await gpt_guard.call(lambda: get_gpt_client().chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": prompt}]
+            ))
         return response.choices[0].message.content
     except Exception as e:
         print(f"GPT Report Error: {e}")
-        return "보고서 생성 중 오류가 발생했습니다."
+        return GPT_ERROR_REPORT
 
-# --- 보고서 파일 저장 ---
-def save_report_to_file(report_text: str) -> str:
-    """생성된 보고서 텍스트를 고유한 ID를 가진 파일로 저장합니다."""
-    reports_dir = "reports"
-    os.makedirs(reports_dir, exist_ok=True)
-    
-    report_id = str(uuid.uuid4())
-    file_path = os.path.join(reports_dir, f"{report_id}.txt")
-    
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(report_text)
-        
+async def stream_gpt_report(stock_name: str, clova_conclusion: str, clova_reason: str) -> AsyncIterator[str]:
+    """get_gpt_report 의 스트리밍 버전. 생성되는 토큰 조각을 바로바로 내보냅니다. (오류는 호출자에게 전달)"""
+    prompt = _build_gpt_report_prompt(stock_name, clova_conclusion, clova_reason)
+    stream = gpt_guard.stream(lambda: get_gpt_client().chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": prompt}],
+        stream=True
+    ))
+    first_token = FirstToken("gpt", "report_stream")
+    with external_call("gpt", "report_stream"):
+        async with aclosing(stream):
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    first_token.mark()
+                    yield chunk.choices[0].delta.content
+
+# --- 보고서 저장 ---
+def new_report_id() -> str:
+    return str(uuid.uuid4())
+
+def save_report(report_text: str) -> str:
+    """생성된 보고서 텍스트를 고유한 ID로 보고서 저장소에 저장합니다."""
+    report_id = new_report_id()
+    get_report_store().put(report_id, report_text)
     return report_id
 
+async def stream_report_to_store(chunks: AsyncIterator[str], report_id: str) -> AsyncIterator[str]:
+    """
+    보고서 조각을 그대로 흘려보내면서, 도착하는 대로 보고서 저장소에 이어서 기록합니다.
+    끝까지 받은 경우에만 완성본으로 저장하고, 업스트림 오류나 클라이언트 중단으로 끝나면 기록해 둔 조각을 지웁니다.
+    """
+    writer = get_report_store().open_writer(report_id)
+    completed = False
+    async with aclosing(chunks):
+        try:
+            async for chunk in chunks:
+                writer.write(chunk)
+                if writer.needs_flush:
+                    await asyncio.to_thread(writer.flush)
+                yield chunk
+            completed = True
+        finally:
+            await asyncio.to_thread(writer.close if completed else writer.abort)
+
+def load_report(report_id: str) -> str | None:
+    """저장된 보고서 본문을 읽습니다. 없으면 None 을 반환합니다."""
+    return get_report_store().get(report_id)
+
+# --- 1~2단계 + 저장을 묶은 전체 파이프라인 ---
+async def run_insight_pipeline(stock_name: str, economic_data: dict | None = None) -> tuple[InsightResponse, bool]:
+    """
+    CLOVA 1차 결론 → GPT 심층 보고서 → 보고서 저장을 차례로 실행합니다.
+    (결과, 캐시 가능 여부) 를 반환하며, 어느 단계든 오류가 있었으면 캐시하지 않습니다.
+    """
+    clova_conclusion, clova_reason = await get_clova_insight(stock_name, economic_data)
+    gpt_report_text = await get_gpt_report(stock_name, clova_conclusion, clova_reason)
+    report_id = await asyncio.to_thread(save_report, gpt_report_text)
+    cacheable = clova_conclusion != CLOVA_ERROR_CONCLUSION and gpt_report_text != GPT_ERROR_REPORT
+    return InsightResponse(quick_insight=clova_conclusion, report_id=report_id), cacheable
+
 # --- 3단계: 문서 기반 챗봇 응답 생성 ---
-def query_document_chatbot(report_id: str, user_question: str) -> str:
-    """저장된 보고서 파일을 기반으로 사용자의 질문에 답변합니다."""
-    file_path = f"reports/{report_id}.txt"
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            document_content = f.read()
-    except FileNotFoundError:
-        return "죄송합니다. 해당 보고서를 찾을 수 없습니다."
+REPORT_NOT_FOUND_ANSWER = "죄송합니다. 해당 보고서를 찾을 수 없습니다."
 
-    prompt = f"""
+def _build_chatbot_prompt(document_content: str, user_question: str) -> str:
+    return f"""
     당신은 아래 [문서]의 내용을 완벽하게 이해한 AI 비서입니다. 사용자의 [질문]에 대해 [문서]의 내용만을 근거로 친절하게 답변해주세요.
     
     [문서]
@@ -116,14 +201,48 @@ def query_document_chatbot(report_id: str, user_question: str) -> str:
     [질문]
     {user_question}
     """
+
+def load_chatbot_context(report_id: str, user_question: str) -> str | None:
+    """보고서에서 질문과 관련된 부분(BM25 상위 청크)만 골라 반환합니다. 보고서가 없으면 None."""
+    document_content = load_report(report_id)
+    if document_content is None or not settings.CHATBOT_RETRIEVAL_ENABLED:
+        return document_content
+    return report_retriever.build_context(report_id, document_content, user_question)
+
+async def query_document_chatbot(report_id: str, user_question: str) -> str:
+    """저장된 보고서를 기반으로 사용자의 질문에 답변합니다."""
+    document_content = await asyncio.to_thread(load_chatbot_context, report_id, user_question)
+    if document_content is None:
+        return REPORT_NOT_FOUND_ANSWER
+
+    prompt = _build_chatbot_prompt(document_content, user_question)
     try:
-        response = clova_client.chat.completions.create(
-            model="HCX-003",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=300,
-            temperature=0.3
-        )
+        with external_call("clova", "chatbot"):
+            response = await clova_guard.call(lambda: get_clova_client().chat.completions.create(
+                model="HCX-003",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=300,
+                temperature=0.3
+            ))
         return response.choices[0].message.content
     except Exception as e:
         print(f"Chatbot Error: {e}")
-        return "답변 생성 중 오류가 발생했습니다."
\ No newline at end of file
+        return "답변 생성 중 오류가 발생했습니다."
+
+async def stream_document_chatbot(document_content: str, user_question: str) -> AsyncIterator[str]:
+    """query_document_chatbot 의 스트리밍 버전. 답변 토큰 조각을 바로바로 내보냅니다. (오류는 호출자에게 전달)"""
+    prompt = _build_chatbot_prompt(document_content, user_question)
+    stream = clova_guard.stream(lambda: get_clova_client().chat.completions.create(
+        model="HCX-003",
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=300,
+        temperature=0.3,
+        stream=True
+    ))
+    first_token = FirstToken("clova", "chatbot_stream")
+    with external_call("clova", "chatbot_stream"):
+        async with aclosing(stream):
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    first_token.mark()
+                    yield chunk.choices[0].delta.content
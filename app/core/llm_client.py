@@ -0,0 +1,234 @@
+import asyncio
+import random
+import sys
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않고 바로 실패시킬 때 발생합니다."""
+
+def is_retryable(error: Exception) -> bool:
+    """429 / 5xx / 연결 오류 / 타임아웃만 재시도합니다."""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    # openai 는 LLM 클라이언트를 처음 만들 때 임포트됩니다. 아직 임포트 전이면 openai 오류일 수 없습니다.
+    openai = sys.modules.get("openai")
+    if openai is None:
+        return False
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+class ProviderGuard:
+    """
+    LLM 제공자(CLOVA, GPT) 별 호출 보호 장치입니다.
+    - 최대 동시 요청 수 제한 (대기 시간도 마감 시간에 포함)
+    - 요청 전체에 대한 마감 시간(deadline) 기반 타임아웃
+    - 429/5xx 에 대해 지수 백오프 + 지터 재시도
+    - 연속 실패 시 서킷 브레이커로 일정 시간 즉시 실패 처리
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        timeout: float,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        breaker_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._half_open_trial = False
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    # --- 서킷 브레이커 ---
+    @property
+    def circuit_state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.breaker_reset_seconds:
+            return "half_open"
+        return "open"
+
+    def _before_request(self):
+        state = self.circuit_state
+        if state == "open" or (state == "half_open" and self._half_open_trial):
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+        if state == "half_open":
+            # 열린 뒤 reset 시간이 지나면 시험 요청 1건만 통과시킵니다.
+            self._half_open_trial = True
+
+    def _record_success(self):
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._half_open_trial = False
+
+    def _record_error(self, error: Exception):
+        # 재시도 대상(429/5xx/연결 오류/타임아웃)만 제공자 장애로 보고 브레이커에 셉니다. (400 등 요청 오류는 제외)
+        if is_retryable(error):
+            self._record_failure()
+        else:
+            self._half_open_trial = False
+
+    def _record_failure(self):
+        self.failures += 1
+        self._consecutive_failures += 1
+        if self._half_open_trial or self._consecutive_failures >= self.breaker_threshold:
+            self._opened_at = time.monotonic()
+        self._half_open_trial = False
+
+    # --- 호출 ---
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(max, base * 2^attempt)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _acquire(self, deadline: float):
+        remaining = deadline - time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), max(remaining, 0))
+        except BaseException as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.timeouts += 1
+            # 슬롯을 얻지 못했으면 업스트림에 요청하지 않았으므로 시험 요청 기회를 되돌립니다.
+            self._half_open_trial = False
+            raise
+
+    async def _call_with_retries(self, func: Callable[[], Awaitable[T]], deadline: float) -> T:
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.timeouts += 1
+                raise asyncio.TimeoutError(f"{self.name} deadline exceeded")
+            try:
+                return await asyncio.wait_for(func(), remaining)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timeouts += 1
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """func (코루틴 팩토리) 를 보호 장치를 거쳐 실행합니다. 재시도 시 func 가 다시 호출됩니다."""
+        self._before_request()
+        self.requests += 1
+        deadline = time.monotonic() + self.timeout
+        await self._acquire(deadline)
+        self.in_flight += 1
+        try:
+            result = await self._call_with_retries(func, deadline)
+        except Exception as e:
+            self._record_error(e)
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+        self._record_success()
+        return result
+
+    async def stream(
+        self,
+        create: Callable[[], Awaitable[Any]],
+        idle_timeout: float | None = None,
+    ) -> AsyncIterator[Any]:
+        """
+        스트리밍 호출용. 스트림 생성(첫 응답)까지는 call 과 같이 재시도하고,
+        이후에는 동시 요청 슬롯을 유지한 채 청크를 내보냅니다. 청크 사이 대기가 idle_timeout 을 넘으면 실패 처리합니다.
+        """
+        self._before_request()
+        self.requests += 1
+        deadline = time.monotonic() + self.timeout
+        idle_timeout = idle_timeout or self.timeout
+        await self._acquire(deadline)
+        self.in_flight += 1
+        stream = None
+        try:
+            try:
+                stream = await self._call_with_retries(create, deadline)
+                iterator = stream.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(iterator.__anext__(), idle_timeout)
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        # 스트림 생성 중 타임아웃은 _call_with_retries 에서 이미 셌으므로 청크 대기 타임아웃만 셉니다.
+                        self.timeouts += 1
+                        raise
+                    yield chunk
+            except (GeneratorExit, asyncio.CancelledError):
+                # 소비자가 중간에 그만둔 경우는 제공자 실패로 보지 않습니다.
+                self._half_open_trial = False
+                raise
+            except Exception as e:
+                self._record_error(e)
+                raise
+            self._record_success()
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            if stream is not None and hasattr(stream, "close"):
+                # 중간에 끝난 경우에도 업스트림 HTTP 응답을 닫아 커넥션을 돌려줍니다.
+                try:
+                    await stream.close()
+                except Exception:
+                    pass
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "circuit": self.circuit_state,
+        }
+
+def _make_guard(name: str, max_in_flight: int) -> ProviderGuard:
+    return ProviderGuard(
+        name,
+        max_in_flight=max_in_flight,
+        timeout=settings.LLM_TIMEOUT,
+        max_retries=settings.LLM_MAX_RETRIES,
+        breaker_threshold=settings.LLM_BREAKER_THRESHOLD,
+        breaker_reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+    )
+
+# 제공자별 보호 장치 (프로세스 전체 공유)
+clova_guard = _make_guard("clova", settings.CLOVA_MAX_IN_FLIGHT)
+gpt_guard = _make_guard("gpt", settings.GPT_MAX_IN_FLIGHT)
+
+def stats() -> dict:
+    return {"clova": clova_guard.stats(), "gpt": gpt_guard.stats()}
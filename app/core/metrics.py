@@ -0,0 +1,207 @@
+import asyncio
+import functools
+import os
+import time
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+
+# --- Prometheus 지표 ---
+# 워커마다 자기 지표만 갖습니다. 여러 워커를 한 번에 모으려면 PROMETHEUS_MULTIPROC_DIR 을 지정합니다. (prometheus_client 멀티프로세스 모드)
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SLOW_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "API 요청 처리 시간 (스트리밍 응답은 마지막 조각까지)",
+    ["method", "route", "status"], buckets=_FAST_BUCKETS,
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "요청 하나가 실행한 SQL 문 수",
+    ["route"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds", "요청 하나가 SQL 실행에 쓴 시간 합계",
+    ["route"], buckets=_FAST_BUCKETS,
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "SQL 문 실행 시간", ["engine", "statement"], buckets=_FAST_BUCKETS,
+)
+DB_COMMIT_SECONDS = Histogram(
+    "db_commit_duration_seconds", "세션 commit 시간 (flush 포함)", ["session"], buckets=_FAST_BUCKETS,
+)
+DB_ROLLBACKS = Counter("db_rollbacks_total", "세션 rollback 횟수", ["session"])
+EXTERNAL_CALL_SECONDS = Histogram(
+    "external_call_duration_seconds", "외부 API 호출 시간", ["service", "operation", "outcome"], buckets=_SLOW_BUCKETS,
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "llm_first_token_seconds", "스트리밍 LLM 호출의 첫 토큰까지 시간", ["service", "operation"], buckets=_SLOW_BUCKETS,
+)
+SCHEDULER_JOB_SECONDS = Histogram(
+    "scheduler_job_duration_seconds", "스케줄러 작업 실행 시간", ["job", "outcome"], buckets=_SLOW_BUCKETS,
+)
+SCHEDULER_JOB_LAST_SUCCESS = Gauge(
+    "scheduler_job_last_success_timestamp_seconds", "스케줄러 작업이 마지막으로 성공한 시각 (unix time)", ["job"],
+    multiprocess_mode="max",
+)
+
+# 실행 중인 요청의 [SQL 문 수, SQL 시간 합계]. 스레드풀/to_thread 로 넘어간 DB 작업에도 컨텍스트가 복사되어 함께 집계됩니다.
+_request_db: ContextVar[list | None] = ContextVar("request_db", default=None)
+
+_STATEMENTS = {"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "WITH"}
+
+def _statement_kind(statement: str) -> str:
+    head = statement.lstrip()[:8].split(None, 1)
+    kind = head[0].upper() if head else ""
+    return kind if kind in _STATEMENTS else "OTHER"
+
+# --- 외부 API 호출 ---
+class ExternalCall:
+    """
+    외부 API 호출 시간을 재는 컨텍스트 관리자입니다. (동기/비동기 코드 모두 with 로 사용)
+    예외로 끝나면 outcome="error", 중간에 취소되면 "cancelled". 그 밖의 결과는 outcome 을 직접 바꿉니다. (예: "not_modified")
+    """
+
+    __slots__ = ("service", "operation", "outcome", "_started")
+
+    def __init__(self, service: str, operation: str):
+        self.service = service
+        self.operation = operation
+        self.outcome = "ok"
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.outcome = "cancelled" if issubclass(exc_type, (GeneratorExit, asyncio.CancelledError)) else "error"
+        EXTERNAL_CALL_SECONDS.labels(self.service, self.operation, self.outcome).observe(time.perf_counter() - self._started)
+        return False
+
+def external_call(service: str, operation: str) -> ExternalCall:
+    return ExternalCall(service, operation)
+
+class FirstToken:
+    """스트리밍 응답의 첫 조각이 도착할 때 한 번만 시간을 기록합니다."""
+
+    __slots__ = ("service", "operation", "_started")
+
+    def __init__(self, service: str, operation: str):
+        self.service = service
+        self.operation = operation
+        self._started = time.perf_counter()
+
+    def mark(self):
+        if self._started is not None:
+            LLM_FIRST_TOKEN_SECONDS.labels(self.service, self.operation).observe(time.perf_counter() - self._started)
+            self._started = None
+
+# --- 스케줄러 작업 ---
+def timed_job(func=None, *, name: str | None = None, false_is_error: bool = False):
+    """
+    스케줄러 작업의 실행 시간과 결과(ok/error)를 기록합니다. 데코레이터 또는 timed_job(func, name=...) 로 사용합니다.
+    예외로 끝나면 error 입니다. 오류를 직접 처리하는 작업은 false_is_error=True 로 두고 실패 시 False 를 반환합니다.
+    """
+    if func is None:
+        return functools.partial(timed_job, name=name, false_is_error=false_is_error)
+    job = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            SCHEDULER_JOB_SECONDS.labels(job, "error").observe(time.perf_counter() - started)
+            raise
+        outcome = "error" if false_is_error and result is False else "ok"
+        SCHEDULER_JOB_SECONDS.labels(job, outcome).observe(time.perf_counter() - started)
+        if outcome == "ok":
+            SCHEDULER_JOB_LAST_SUCCESS.labels(job).set(time.time())
+        return result
+    return wrapper
+
+# --- DB ---
+def instrument_engine(engine, name: str):
+    """엔진의 모든 SQL 문 실행 시간을 기록하고, 요청 중이면 요청별 쿼리 수/시간에도 합산합니다."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.labels(name, _statement_kind(statement)).observe(elapsed)
+        counters = _request_db.get()
+        if counters is not None:
+            counters[0] += 1
+            counters[1] += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+def instrument_sessions(session_factory, name: str):
+    """sessionmaker 로 만든 세션의 commit 시간(flush 포함)과 rollback 횟수를 기록합니다."""
+
+    @event.listens_for(session_factory, "before_commit")
+    def _before_commit(session):
+        session.info["commit_started"] = time.perf_counter()
+
+    @event.listens_for(session_factory, "after_commit")
+    def _after_commit(session):
+        started = session.info.pop("commit_started", None)
+        if started is not None:
+            DB_COMMIT_SECONDS.labels(name).observe(time.perf_counter() - started)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def _after_rollback(session):
+        session.info.pop("commit_started", None)
+        DB_ROLLBACKS.labels(name).inc()
+
+# --- HTTP ---
+class MetricsMiddleware:
+    """
+    요청별 처리 시간과 DB 사용량을 라우트(경로 템플릿) 단위로 기록하는 ASGI 미들웨어입니다.
+    BaseHTTPMiddleware 를 쓰지 않으므로 스트리밍 응답을 버퍼링하지 않습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = ["500"]
+        counters = [0, 0.0]
+        token = _request_db.set(counters)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_db.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, status[0]).observe(time.perf_counter() - started)
+            HTTP_REQUEST_DB_QUERIES.labels(route).observe(counters[0])
+            HTTP_REQUEST_DB_SECONDS.labels(route).observe(counters[1])
+
+def render_latest() -> tuple[bytes, str]:
+    """/metrics 응답 본문과 Content-Type."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,29 +1,58 @@
+import asyncio
+import hashlib
+import time
+from typing import List, NamedTuple, Optional
+
+import httpx
 import requests
-from typing import List, Optional
 
 from app.models import schemas
 from app.config import settings
+from app.core import http_client
+from app.core.metrics import external_call
+
+DEEPSEARCH_API_BASE_URL = settings.DEEPSEARCH_API_BASE_URL
+MACRO_TOPICS_URL = f"{DEEPSEARCH_API_BASE_URL}/v1/global-articles/topics/trending"
+ARTICLES_URL = f"{DEEPSEARCH_API_BASE_URL}/v1/articles"
+
+def _macro_topics_params(limit: int) -> dict:
+    return {"api_key": settings.DEEPSEARCH_API_KEY, "page_size": limit, "order": "rank"}
 
-DEEPSEARCH_API_BASE_URL = "https://api-v2.deepsearch.com"
+def _theme_articles_params(theme_name: str, limit: int) -> dict:
+    return {"api_key": settings.DEEPSEARCH_API_KEY, "keyword": theme_name, "page_size": limit, "order": "published_at"}
+
+def _parse_macro_topics(data: dict) -> List[schemas.NewsArticle]:
+    articles = []
+    for topic in data.get("data", []):
+        article_data = {
+            "id": 0, # 임시값, DB에 저장되며 실제 id 할당됨
+            "title": topic.get("title_ko", topic.get("title")),
+            "url": f"https://www.deepsearch.com/contents/news/topics/{topic.get('id')}",
+            "published_at": topic.get("date", ""),
+            "click_count": 0, # 임시값
+        }
+        articles.append(schemas.NewsArticle.model_validate(article_data))
+    return articles
+
+def _parse_theme_articles(data: dict) -> List[schemas.NewsArticle]:
+    articles = []
+    for item in data.get("data", []):
+        article_data = {
+            "id": 0,
+            "title": item.get("title", ""),
+            "url": item.get("url", ""),
+            "published_at": item.get("published_at", ""),
+            "click_count": 0,
+        }
+        articles.append(schemas.NewsArticle.model_validate(article_data))
+    return articles
 
 def get_trending_macro_topics(limit: int = 10) -> Optional[List[schemas.NewsArticle]]:
-    api_url = f"{DEEPSEARCH_API_BASE_URL}/v1/global-articles/topics/trending"
-    params = {"api_key": settings.DEEPSEARCH_API_KEY, "page_size": limit, "order": "rank"}
     try:
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        articles = []
-        for topic in data.get("data", []):
-            article_data = {
-                "id": 0, # 임시값, DB에 저장되며 실제 id 할당됨
-                "title": topic.get("title_ko", topic.get("title")),
-                "url": f"https://www.deepsearch.com/contents/news/topics/{topic.get('id')}",
-                "published_at": topic.get("date", ""),
-                "click_count": 0, # 임시값
-            }
-            articles.append(schemas.NewsArticle.model_validate(article_data))
-        return articles
+        with external_call("deepsearch", "macro_topics"):
+            response = requests.get(MACRO_TOPICS_URL, params=_macro_topics_params(limit), timeout=settings.HTTP_TIMEOUT)
+            response.raise_for_status()
+        return _parse_macro_topics(response.json())
     except requests.exceptions.RequestException as e:
         print(f"Request failed for macro topics: {e}")
         return None
@@ -39,23 +68,103 @@ def get_investment_themes() -> Optional[List[str]]:
     return None # 👈 API 호출 대신 None을 반환하도록 수정
 
 def get_articles_by_theme(theme_name: str, limit: int = 10) -> Optional[List[schemas.NewsArticle]]:
-    api_url = f"{DEEPSEARCH_API_BASE_URL}/v1/articles"
-    params = {"api_key": settings.DEEPSEARCH_API_KEY, "keyword": theme_name, "page_size": limit, "order": "published_at"}
     try:
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        articles = []
-        for item in data.get("data", []):
-            article_data = {
-                "id": 0,
-                "title": item.get("title", ""),
-                "url": item.get("url", ""),
-                "published_at": item.get("published_at", ""),
-                "click_count": 0,
-            }
-            articles.append(schemas.NewsArticle.model_validate(article_data))
-        return articles
+        with external_call("deepsearch", "theme_articles"):
+            response = requests.get(ARTICLES_URL, params=_theme_articles_params(theme_name, limit), timeout=settings.HTTP_TIMEOUT)
+            response.raise_for_status()
+        return _parse_theme_articles(response.json())
     except requests.exceptions.RequestException as e:
         print(f"Request failed for theme articles: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def get_latest_trade_policy_news() -> str:
+    """경제 지표 스냅샷에 넣을 최신 무역 정책(관세) 뉴스 제목을 가져옵니다. 실패하면 'N/A'."""
+    articles = get_articles_by_theme(theme_name="관세 무역정책", limit=1)
+    if not articles:
+        return "N/A"
+    return articles[0].title
+
+# --- 비동기 조건부 수집 (스케줄러 / 테마 뉴스 캐시용) ---
+
+class FeedResult(NamedTuple):
+    """
+    출처 하나의 조회 결과.
+    status: "updated"(새 목록) / "not_modified"(304) / "unchanged"(목록이 지난번과 같음) / "error"
+    validators: 다음 조건부 요청에 쓸 값 (저장이 끝난 뒤 반영합니다. 실패한 출처는 None)
+    """
+    source: str
+    status: str
+    articles: List[schemas.NewsArticle]
+    elapsed_ms: float
+    validators: Optional[dict]
+
+def page_marker(articles: List[schemas.NewsArticle]) -> str:
+    """기사 목록의 지문(URL 목록 해시). ETag 를 주지 않는 응답도 지난번과 같은 목록이면 건너뛰는 데 씁니다."""
+    digest = hashlib.blake2b(digest_size=16)
+    for article in articles:
+        digest.update(article.url.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+async def fetch_feed(client: httpx.AsyncClient, source: str, url: str, params: dict, parse, validators: dict | None = None) -> FeedResult:
+    """
+    조건부 GET(If-None-Match / If-Modified-Since)으로 출처 하나를 조회합니다.
+    304 이거나 받은 목록이 지난번과 같으면 기사를 돌려주지 않습니다.
+    """
+    validators = validators or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    started = time.perf_counter()
+    try:
+        with external_call("deepsearch", "macro_topics" if url == MACRO_TOPICS_URL else "theme_articles") as call:
+            response = await client.get(url, params=params, headers=headers)
+            if response.status_code == 304:
+                call.outcome = "not_modified"
+            else:
+                response.raise_for_status()
+        if response.status_code == 304:
+            return FeedResult(source, "not_modified", [], (time.perf_counter() - started) * 1000, validators)
+        articles = parse(response.json())
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Request failed for {source} news: {e}")
+        return FeedResult(source, "error", [], (time.perf_counter() - started) * 1000, None)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    new_validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "marker": page_marker(articles),
+    }
+    if new_validators["marker"] == validators.get("marker"):
+        return FeedResult(source, "unchanged", [], elapsed_ms, new_validators)
+    return FeedResult(source, "updated", articles, elapsed_ms, new_validators)
+
+async def fetch_theme_feed(client: httpx.AsyncClient, theme_name: str, limit: int = 10, validators: dict | None = None) -> FeedResult:
+    """테마 기사 목록 하나를 조건부 GET 으로 조회합니다."""
+    return await fetch_feed(client, theme_name, ARTICLES_URL, _theme_articles_params(theme_name, limit), _parse_theme_articles, validators)
+
+async def fetch_news_feeds(
+    themes: List[str],
+    limit: int = 10,
+    validators: dict[str, dict] | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> List[FeedResult]:
+    """
+    거시 경제 토픽("macro")과 테마별 기사를 하나의 커넥션 풀로 동시에 조회합니다.
+    validators 는 출처별 지난번 조회 결과(ETag 등)입니다.
+    """
+    validators = validators or {}
+    own_client = client is None
+    if own_client:
+        client = http_client.create_async_client()
+    try:
+        tasks = [fetch_feed(client, "macro", MACRO_TOPICS_URL, _macro_topics_params(limit), _parse_macro_topics, validators.get("macro"))]
+        tasks += [fetch_theme_feed(client, theme, limit, validators.get(theme)) for theme in themes]
+        return await asyncio.gather(*tasks)
+    finally:
+        if own_client:
+            await client.aclose()
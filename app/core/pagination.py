@@ -0,0 +1,19 @@
+import base64
+import json
+from datetime import datetime
+
+class InvalidCursorError(ValueError):
+    """클라이언트가 보낸 커서를 해석할 수 없을 때 발생합니다."""
+
+def encode_cursor(published_at: datetime, article_id: int) -> str:
+    """키셋 페이지네이션 위치 (published_at, id) 를 불투명한 URL-safe 문자열로 만듭니다."""
+    raw = json.dumps([published_at.isoformat(), article_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published_at, article_id = json.loads(raw)
+        return datetime.fromisoformat(published_at), int(article_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("invalid cursor") from e
@@ -0,0 +1,332 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable
+
+from app.config import settings
+
+def normalize_report_id(report_id: str) -> str | None:
+    """report_id 가 UUID 형식이면 표준 문자열로, 아니면 None 을 돌려줍니다. (경로 조작/잘못된 키 방지)"""
+    try:
+        return str(uuid.UUID(report_id))
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+class ReportStore(ABC):
+    """AI 보고서 본문 저장소 인터페이스."""
+
+    @abstractmethod
+    def put(self, report_id: str, text: str):
+        """완성된 보고서를 저장합니다. (같은 ID 면 덮어쓰기, 생성 중 기록해 둔 조각은 삭제)"""
+
+    @abstractmethod
+    def append_partial(self, report_id: str, seq: int, text: str):
+        """생성 중인 보고서의 seq 번째 조각을 덧붙입니다. 완성본이 put 되기 전까지 get() 은 조각을 이어 붙여 돌려줍니다."""
+
+    @abstractmethod
+    def discard_partial(self, report_id: str):
+        """생성이 중간에 끝난 보고서의 조각을 지웁니다. (잘린 보고서가 남지 않도록)"""
+
+    @abstractmethod
+    def get(self, report_id: str) -> str | None:
+        """보고서 본문을 반환합니다. 생성 중이면 지금까지의 본문, 없으면 None. (메모리 캐시에는 완성본만 넣습니다)"""
+
+    def put_many(self, reports: Iterable[tuple[str, str]]) -> int:
+        count = 0
+        for report_id, text in reports:
+            self.put(report_id, text)
+            count += 1
+        return count
+
+    def open_writer(self, report_id: str, flush_chars: int = 1024) -> "ReportWriter":
+        """스트리밍으로 생성되는 보고서를 조금씩 기록하는 writer 를 엽니다."""
+        return ReportWriter(self, report_id, flush_chars)
+
+    def stats(self) -> dict:
+        return {}
+
+class ReportWriter:
+    """
+    도착하는 보고서 조각을 모아 flush_chars 마다 새로 온 부분만 저장소에 덧붙이고, close() 때 완성본을 한 번 저장합니다.
+    중간 저장본도 get() 으로 읽을 수 있으므로, 생성 중인 보고서에 대해서도 챗봇이 답할 수 있습니다.
+    생성이 실패하거나 중단되면 close() 대신 abort() 로 조각을 지웁니다.
+    """
+
+    def __init__(self, store: ReportStore, report_id: str, flush_chars: int):
+        self.store = store
+        self.report_id = report_id
+        self.flush_chars = flush_chars
+        self._parts: list[str] = []
+        # 아직 저장소에 덧붙이지 않은 조각은 _parts[_flushed:]
+        self._flushed = 0
+        self._unflushed = 0
+        self._seq = 0
+
+    def write(self, chunk: str):
+        self._parts.append(chunk)
+        self._unflushed += len(chunk)
+
+    @property
+    def needs_flush(self) -> bool:
+        return self._unflushed >= self.flush_chars
+
+    def flush(self):
+        if not self._unflushed:
+            return
+        self.store.append_partial(self.report_id, self._seq, "".join(self._parts[self._flushed:]))
+        self._seq += 1
+        self._flushed = len(self._parts)
+        self._unflushed = 0
+
+    def close(self):
+        self.store.put(self.report_id, "".join(self._parts))
+        self._flushed = len(self._parts)
+        self._unflushed = 0
+
+    def abort(self):
+        self.store.discard_partial(self.report_id)
+        self._parts.clear()
+        self._flushed = 0
+        self._unflushed = 0
+
+class LRUReportCache:
+    """자주 읽히는 보고서를 메모리에 보관하는 LRU 캐시."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, report_id: str) -> str | None:
+        with self._lock:
+            text = self._data.get(report_id)
+            if text is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(report_id)
+            self.hits += 1
+            return text
+
+    def set(self, report_id: str, text: str):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[report_id] = text
+            self._data.move_to_end(report_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+class SQLiteReportStore(ReportStore):
+    """
+    기본 저장소: 하나의 SQLite 파일(report_id 기본키 인덱스)에 zlib 압축 본문을 저장합니다.
+    파일 수백만 개 대신 단일 파일이라 조회/백업이 빠르고, 앞단의 LRU 가 자주 읽는 보고서를 메모리에서 응답합니다.
+    """
+
+    def __init__(self, path: str, cache_size: int = 256, compress_level: int = 6):
+        self.path = path
+        self.compress_level = compress_level
+        self.cache = LRUReportCache(cache_size)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                " report_id TEXT PRIMARY KEY,"
+                " body BLOB NOT NULL,"
+                " created_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            # 생성 중인 보고서의 조각. 완성본이 reports 에 저장되면 지웁니다.
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS report_parts ("
+                " report_id TEXT NOT NULL,"
+                " seq INTEGER NOT NULL,"
+                " body TEXT NOT NULL,"
+                " PRIMARY KEY (report_id, seq)"
+                ") WITHOUT ROWID"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # 스레드마다 자기 커넥션을 재사용합니다. (WAL 모드라 읽기는 서로 막지 않음)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _compress(self, text: str) -> bytes:
+        return zlib.compress(text.encode("utf-8"), self.compress_level)
+
+    def put(self, report_id: str, text: str):
+        report_id = normalize_report_id(report_id)
+        if report_id is None:
+            raise ValueError("report_id must be a UUID")
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports (report_id, body, created_at) VALUES (?, ?, ?)",
+                (report_id, self._compress(text), time.time()),
+            )
+            conn.execute("DELETE FROM report_parts WHERE report_id = ?", (report_id,))
+        self.cache.set(report_id, text)
+
+    def append_partial(self, report_id: str, seq: int, text: str):
+        report_id = normalize_report_id(report_id)
+        if report_id is None:
+            raise ValueError("report_id must be a UUID")
+        with self._write_lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO report_parts (report_id, seq, body) VALUES (?, ?, ?)", (report_id, seq, text))
+
+    def discard_partial(self, report_id: str):
+        report_id = normalize_report_id(report_id)
+        if report_id is None:
+            return
+        with self._write_lock, self._connect() as conn:
+            conn.execute("DELETE FROM report_parts WHERE report_id = ?", (report_id,))
+
+    def put_many(self, reports: Iterable[tuple[str, str]]) -> int:
+        rows = []
+        now = time.time()
+        for report_id, text in reports:
+            report_id = normalize_report_id(report_id)
+            if report_id is not None:
+                rows.append((report_id, self._compress(text), now))
+        with self._write_lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO reports (report_id, body, created_at) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def get(self, report_id: str) -> str | None:
+        report_id = normalize_report_id(report_id)
+        if report_id is None:
+            return None
+        text = self.cache.get(report_id)
+        if text is not None:
+            return text
+        conn = self._connect()
+        row = conn.execute("SELECT body FROM reports WHERE report_id = ?", (report_id,)).fetchone()
+        if row is None:
+            # 생성 중인 보고서: 지금까지의 조각을 이어 붙여 돌려주되 캐시하지 않습니다.
+            parts = conn.execute("SELECT body FROM report_parts WHERE report_id = ? ORDER BY seq", (report_id,)).fetchall()
+            return "".join(part[0] for part in parts) if parts else None
+        text = zlib.decompress(row[0]).decode("utf-8")
+        self.cache.set(report_id, text)
+        return text
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {"backend": "sqlite", "cache_hits": self.cache.hits, "cache_misses": self.cache.misses}
+
+class FileReportStore(ReportStore):
+    """
+    기존 방식: reports/{report_id}.txt 파일 하나에 보고서 하나. (호환/마이그레이션용)
+    생성 중인 보고서는 {report_id}.partial 파일에 이어 쓰고, 완성되면 .txt 로 저장한 뒤 지웁니다.
+    """
+
+    def __init__(self, directory: str, cache_size: int = 256):
+        self.directory = directory
+        self.cache = LRUReportCache(cache_size)
+
+    def path_for(self, report_id: str) -> str | None:
+        report_id = normalize_report_id(report_id)
+        if report_id is None:
+            return None
+        return os.path.join(self.directory, f"{report_id}.txt")
+
+    def put(self, report_id: str, text: str):
+        file_path = self.path_for(report_id)
+        if file_path is None:
+            raise ValueError("report_id must be a UUID")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        try:
+            os.remove(file_path[:-4] + ".partial")
+        except FileNotFoundError:
+            pass
+        self.cache.set(normalize_report_id(report_id), text)
+
+    def append_partial(self, report_id: str, seq: int, text: str):
+        file_path = self.path_for(report_id)
+        if file_path is None:
+            raise ValueError("report_id must be a UUID")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(file_path[:-4] + ".partial", "w" if seq == 0 else "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def discard_partial(self, report_id: str):
+        file_path = self.path_for(report_id)
+        if file_path is None:
+            return
+        try:
+            os.remove(file_path[:-4] + ".partial")
+        except FileNotFoundError:
+            pass
+
+    def get(self, report_id: str) -> str | None:
+        file_path = self.path_for(report_id)
+        if file_path is None:
+            return None
+        text = self.cache.get(normalize_report_id(report_id))
+        if text is not None:
+            return text
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            # 생성 중인 보고서는 캐시하지 않습니다.
+            try:
+                with open(file_path[:-4] + ".partial", "r", encoding="utf-8") as f:
+                    return f.read()
+            except FileNotFoundError:
+                return None
+        self.cache.set(normalize_report_id(report_id), text)
+        return text
+
+    def iter_report_files(self) -> Iterable[tuple[str, str, str]]:
+        """디렉터리의 모든 .txt 보고서를 (report_id, 실제 파일 경로, 본문) 으로 순회합니다."""
+        if not os.path.isdir(self.directory):
+            return
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.endswith(".txt"):
+                    continue
+                report_id = normalize_report_id(entry.name[:-4])
+                if report_id is None:
+                    continue
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    yield report_id, entry.path, f.read()
+
+    def iter_reports(self) -> Iterable[tuple[str, str]]:
+        """디렉터리의 모든 .txt 보고서를 (report_id, 본문) 으로 순회합니다."""
+        for report_id, _, text in self.iter_report_files():
+            yield report_id, text
+
+    def stats(self) -> dict:
+        return {"backend": "files", "cache_hits": self.cache.hits, "cache_misses": self.cache.misses}
+
+_store: ReportStore | None = None
+_store_lock = threading.Lock()
+
+def get_report_store() -> ReportStore:
+    """설정(REPORT_STORE_BACKEND)에 맞는 공용 보고서 저장소를 반환합니다. (최초 호출 시 생성)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if settings.REPORT_STORE_BACKEND == "files":
+                    _store = FileReportStore(settings.REPORTS_DIR, cache_size=settings.REPORT_CACHE_SIZE)
+                else:
+                    _store = SQLiteReportStore(settings.REPORT_STORE_PATH, cache_size=settings.REPORT_CACHE_SIZE)
+    return _store
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Hashable, NamedTuple
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.http_cache import json_response, make_etag, render_json
+
+class _Rendered(NamedTuple):
+    body: bytes
+    etag: str
+    rendered_at: float
+    version: Any
+
+class _Endpoint(NamedTuple):
+    render: Callable[..., Any]
+    ttl: float
+
+class ResponseCache:
+    """
+    자주 읽히고 가끔 바뀌는 조회 API 의 응답을 직렬화된 JSON 바이트(+ETag)로 보관합니다.
+    - 적중 시 DB 세션/조회/Pydantic 직렬화 없이 메모리에서 바로 응답합니다. (If-None-Match 가 맞으면 304)
+    - 데이터를 쓰는 쪽(crud, 스케줄러 작업)이 invalidate/rebuild 로 항목을 비우거나 다시 만듭니다.
+    - 다른 워커에서 일어난 쓰기는 알 수 없으므로 ttl 이 지나면 다시 만듭니다.
+    - 메모리 데이터로 만드는 응답은 version 을 넘기면 값이 바뀌었을 때만 다시 만듭니다.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_age: int = 5):
+        self.ttl = ttl
+        self.max_age = max_age
+        self._endpoints: dict[str, _Endpoint] = {}
+        self._entries: dict[str, dict[Hashable, _Rendered]] = {}
+        # invalidate 때마다 증가. 렌더링 도중 무효화되면 그 결과는 저장하지 않습니다.
+        self._generations: dict[str, int] = {}
+        self._inflight: dict[tuple[str, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.rebuilds = 0
+
+    def register(self, endpoint: str, render: Callable[..., Any], ttl: float | None = None):
+        """endpoint 의 응답을 만드는 함수를 등록합니다. render(*key) 는 JSON 으로 바꿀 수 있는 값을 반환합니다. (DB 조회 가능)"""
+        self._endpoints[endpoint] = _Endpoint(render, self.ttl if ttl is None else ttl)
+        self._entries.setdefault(endpoint, {})
+        self._generations.setdefault(endpoint, 0)
+
+    def _fresh(self, endpoint: str, key: Hashable, version: Any) -> _Rendered | None:
+        entry = self._entries[endpoint].get(key)
+        if entry is None or entry.version != version:
+            return None
+        if time.monotonic() - entry.rendered_at >= self._endpoints[endpoint].ttl:
+            return None
+        return entry
+
+    def _render(self, endpoint: str, key: tuple, version: Any) -> _Rendered:
+        """응답을 새로 만들어 저장합니다. (스레드에서 실행)"""
+        generation = self._generations[endpoint]
+        body = render_json(self._endpoints[endpoint].render(*key))
+        entry = _Rendered(body, make_etag(body), time.monotonic(), version)
+        with self._lock:
+            if self._generations[endpoint] == generation:
+                self._entries[endpoint][key] = entry
+        return entry
+
+    async def respond(self, request: Request, endpoint: str, key: tuple = (), version: Any = None) -> Response:
+        """캐시된 응답(없으면 만들어서)을 반환합니다. 같은 항목의 동시 miss 는 렌더링 1번을 함께 기다립니다."""
+        entry = self._fresh(endpoint, key, version)
+        if entry is not None:
+            self.hits += 1
+        else:
+            future = self._inflight.get((endpoint, key))
+            if future is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                future = asyncio.ensure_future(run_in_threadpool(self._render, endpoint, key, version))
+                self._inflight[(endpoint, key)] = future
+                future.add_done_callback(lambda _: self._inflight.pop((endpoint, key), None))
+            entry = await asyncio.shield(future)
+        response = json_response(request, entry.body, entry.etag, self.max_age)
+        if response.status_code == 304:
+            self.not_modified += 1
+        return response
+
+    def invalidate(self, endpoint: str | None = None):
+        """endpoint 하나 또는 (endpoint=None 이면) 전체 응답을 비웁니다. 어느 스레드에서나 호출할 수 있습니다."""
+        with self._lock:
+            for name in [endpoint] if endpoint is not None else list(self._entries):
+                if name in self._entries:
+                    self._generations[name] += 1
+                    self._entries[name] = {}
+                    self.invalidations += 1
+
+    def rebuild(self, endpoint: str, key: tuple = ()) -> bool:
+        """
+        endpoint 응답을 지금 다시 만들어 둡니다. (스케줄러 작업이 데이터를 바꾼 직후, 첫 요청이 DB 를 기다리지 않도록)
+        등록되지 않은 endpoint 는 비우기만 합니다.
+        """
+        self.invalidate(endpoint)
+        if endpoint not in self._endpoints:
+            return False
+        try:
+            self._render(endpoint, key, None)
+        except Exception as e:
+            print(f"응답 캐시 재생성 실패 ({endpoint}): {e}")
+            return False
+        self.rebuilds += 1
+        return True
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses + self.coalesced
+        return {
+            "entries": {name: len(entries) for name, entries in self._entries.items()},
+            "requests": requests,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / requests, 4) if requests else None,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+            "rebuilds": self.rebuilds,
+        }
+
+response_cache = ResponseCache(ttl=settings.RESPONSE_CACHE_TTL, max_age=settings.RESPONSE_CACHE_MAX_AGE)
@@ -0,0 +1,129 @@
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from app.config import settings
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+_WORD = re.compile(r"[0-9a-zA-Z]+|[가-힣]+")
+
+def tokenize(text: str) -> list[str]:
+    """
+    한국어용 간단 토크나이저. 형태소 분석기 없이 조사/어미 변화에 대응하기 위해
+    한글 단어는 글자 2-gram 으로 쪼개고(1글자 단어는 그대로), 영문/숫자는 소문자 단어로 사용합니다.
+    예) "금리인하의" → ["금리", "리인", "인하", "하의"]
+    """
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        if word[0].isascii() or len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+def split_chunks(text: str, chunk_chars: int) -> list[str]:
+    """문장 경계를 지키면서 약 chunk_chars 글자 단위로 나눕니다. (긴 문장은 그대로 한 청크)"""
+    chunks, current, size = [], [], 0
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if current and size + len(sentence) > chunk_chars:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+class BM25Index:
+    """청크 목록에 대한 BM25 역색인."""
+
+    def __init__(self, chunks: list[str], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self._lengths = []
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        for i, chunk in enumerate(chunks):
+            counts = Counter(tokenize(chunk))
+            self._lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self._postings.setdefault(term, []).append((i, tf))
+        self._avg_length = (sum(self._lengths) / len(chunks)) if chunks else 0.0
+
+    def _idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self.chunks) - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str) -> list[float]:
+        scores = [0.0] * len(self.chunks)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(term)
+            for i, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / (self._avg_length or 1))
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def top_k(self, query: str, k: int) -> list[int]:
+        """점수 상위 k 개 청크의 번호를 문서 순서대로 반환합니다. (일치하는 단어가 없으면 앞부분 k 개)"""
+        scores = self.scores(query)
+        ranked = sorted((i for i, score in enumerate(scores) if score > 0), key=lambda i: -scores[i])[:k]
+        if not ranked:
+            ranked = list(range(min(k, len(self.chunks))))
+        return sorted(ranked)
+
+class ReportRetriever:
+    """
+    보고서별 BM25 색인을 LRU 로 캐시해 두고, 질문과 관련된 청크만 골라 챗봇 프롬프트 문맥을 만듭니다.
+    보고서 본문이 바뀌면(스트리밍 생성 중 등) 본문 해시가 달라져 색인을 다시 만듭니다.
+    """
+
+    def __init__(self, chunk_chars: int = 500, top_k: int = 4, cache_size: int = 256):
+        self.chunk_chars = chunk_chars
+        self.top_k = top_k
+        self.cache_size = cache_size
+        self._indexes: OrderedDict[str, tuple[str, BM25Index]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_index(self, report_id: str, text: str) -> BM25Index:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        with self._lock:
+            cached = self._indexes.get(report_id)
+            if cached is not None and cached[0] == digest:
+                self._indexes.move_to_end(report_id)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        index = BM25Index(split_chunks(text, self.chunk_chars))
+        with self._lock:
+            self._indexes[report_id] = (digest, index)
+            self._indexes.move_to_end(report_id)
+            while len(self._indexes) > self.cache_size:
+                self._indexes.popitem(last=False)
+        return index
+
+    def build_context(self, report_id: str, text: str, question: str) -> str:
+        """질문과 관련된 상위 청크를 문서 순서대로 이어 붙여 반환합니다. 짧은 보고서는 전체를 그대로 씁니다."""
+        if len(text) <= self.chunk_chars * self.top_k:
+            return text
+        index = self._get_index(report_id, text)
+        return "\n...\n".join(index.chunks[i] for i in index.top_k(question, self.top_k))
+
+    def stats(self) -> dict:
+        return {"indexes": len(self._indexes), "hits": self.hits, "misses": self.misses}
+
+# 챗봇용 공용 검색기
+report_retriever = ReportRetriever(
+    chunk_chars=settings.CHATBOT_CHUNK_CHARS,
+    top_k=settings.CHATBOT_TOP_K,
+    cache_size=settings.CHATBOT_INDEX_CACHE_SIZE,
+)
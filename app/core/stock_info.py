@@ -1,25 +1,105 @@
-import json
-import urllib.request
+import asyncio
+from typing import AsyncIterator
 
-#종목 코드
-item_code = "373220"
-url = "https://m.stock.naver.com/api/stock/%s/integration"%(item_code)
-#urllib.request를 통해 링크의 결과를 가져옵니다.
-raw_data = urllib.request.urlopen(url).read()
-#추후, 데이터 가공을 위해 json 형식으로 변경 합니다.
-json_data = json.loads(raw_data)
+import httpx
+import requests
+
+from app.config import settings
+from app.core import http_client
+from app.core.cache import AsyncTTLCache
+from app.core.metrics import external_call
+from app.models.schemas import StockDetail
+
+NAVER_STOCK_API_BASE_URL = settings.NAVER_STOCK_API_BASE_URL
+
+# --- 시세 캐시 ---
+# 인기 종목은 짧은 시간 안에 같은 코드로 반복 조회되므로, 짧은 TTL 동안 결과를 공유합니다.
+# 동시에 들어온 같은 코드 요청은 네이버 호출 1회를 함께 기다립니다.
+quote_cache = AsyncTTLCache(ttl=settings.STOCK_QUOTE_CACHE_TTL, maxsize=4096)
+
+def _find_total_info(json_data: dict, info_code: str) -> str:
+    """totalInfos 목록에서 code 가 일치하는 항목의 값을 찾습니다."""
+    for info in json_data.get('totalInfos', []):
+        if info.get('code') == info_code:
+            return info.get('value', 'N/A')
+    return 'N/A'
+
+def parse_stock_details(stock_code: str, json_data: dict) -> StockDetail | None:
+    """네이버 /integration 응답(JSON)을 StockDetail 로 변환합니다."""
+    try:
+        stock_name = json_data['stockName']
+        deal_trends = json_data.get('dealTrendInfos') or []
+        current_price = deal_trends[0].get('closePrice', 'N/A') if deal_trends else 'N/A'
+    except (KeyError, TypeError):
+        return None
+
+    return StockDetail(
+        code=stock_code,
+        name=stock_name,
+        price=current_price,
+        market_cap=_find_total_info(json_data, 'marketValue'),
+        per=_find_total_info(json_data, 'per'),
+        pbr=_find_total_info(json_data, 'pbr'),
+    )
+
+async def fetch_stock_details(stock_code: str) -> StockDetail | None:
+    """캐시를 거치지 않고 네이버 증권 API 에서 종목 정보를 직접 가져옵니다."""
+    url = f"{NAVER_STOCK_API_BASE_URL}/{stock_code}/integration"
+    try:
+        with external_call("naver", "stock_details"):
+            response = await http_client.get_async_client().get(url)
+            response.raise_for_status()
+        return parse_stock_details(stock_code, response.json())
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"Error fetching stock details for '{stock_code}': {e}")
+        return None
+
+async def get_stock_details_from_naver(stock_code: str) -> StockDetail | None:
+    """종목 코드로 시세/시총/PER/PBR 을 조회합니다. (짧은 TTL 캐시 + 동시 요청 병합)"""
+    return await quote_cache.get_or_load(stock_code, lambda: fetch_stock_details(stock_code))
+
+async def iter_stock_details(
+    stock_codes: list[str],
+    concurrency: int = settings.STOCK_BATCH_CONCURRENCY,
+    timeout: float = settings.STOCK_BATCH_TIMEOUT,
+) -> AsyncIterator[tuple[str, StockDetail | None, str | None]]:
+    """
+    여러 종목을 동시에(최대 concurrency 개) 조회하고, 끝나는 순서대로 (코드, 상세정보, 오류) 를 내보냅니다.
+    느린 종목은 timeout 이후 오류로 처리되어 나머지 결과를 막지 않습니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(stock_code: str):
+        async with semaphore:
+            try:
+                detail = await asyncio.wait_for(get_stock_details_from_naver(stock_code), timeout)
+            except asyncio.TimeoutError:
+                return stock_code, None, "timeout"
+        if detail is None:
+            return stock_code, None, "not_found"
+        return stock_code, detail, None
+
+    tasks = [asyncio.ensure_future(fetch_one(code)) for code in stock_codes]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # 클라이언트가 중간에 연결을 끊으면 남은 조회는 취소합니다.
+        for task in tasks:
+            task.cancel()
 
 def get_stock_code_by_name(stock_name: str) -> str | None:
     """DeepSearch API를 이용해 종목명으로 종목 코드를 검색합니다."""
-    api_url = "https://api-v2.deepsearch.com/v2/companies/search"
+    api_url = f"{settings.DEEPSEARCH_API_BASE_URL}/v2/companies/search"
     params = {
         "api_key": settings.DEEPSEARCH_API_KEY,
         "keyword": stock_name,
         "page_size": 1 # 가장 정확한 결과 1개만 가져오기
     }
     try:
-        response = requests.get(api_url, params=params)
-        response.raise_for_status()
+        with external_call("deepsearch", "company_search"):
+            response = requests.get(api_url, params=params, timeout=settings.HTTP_TIMEOUT)
+            response.raise_for_status()
         data = response.json()
         companies = data.get('data', [])
         if companies:
@@ -29,8 +109,9 @@ def get_stock_code_by_name(stock_name: str) -> str | None:
     except requests.exceptions.RequestException as e:
         print(f"Error searching for stock code by name '{stock_name}': {e}")
         return None
-    
+
 def print_structure(data, indent=0):
+    """(디버깅용) 응답 JSON 의 구조를 출력합니다."""
     prefix = " " * indent
     if isinstance(data, dict):
         for key in data:
@@ -42,33 +123,3 @@ def print_structure(data, indent=0):
             print_structure(data[0], indent + 2)
     else:
         print(f"{prefix}{type(data).__name__}: {str(data)[:50]}")
-
-print_structure(json_data)
-
-
-#종목명 가져오기
-stock_name = json_data['stockName']
-print("종목명 : %s"%(stock_name))
-
-#가격 가져오기
-current_price = json_data['dealTrendInfos'][0]['closePrice']
-print("가격 : %s"%(current_price))
-
-#시총 가져오기
-for code in json_data['totalInfos']:
-    if 'marketValue' == code['code']:
-        marketSum_value = code['value']
-        print("시총 : %s"%(marketSum_value))
-
-#PER 가져오기
-for i in json_data['totalInfos']:
-    if 'per' == i['code']:
-        per_value_str = i['value']
-        print("PER : %s"%(per_value_str))
-
-
-#PBR 가져오기
-for v in json_data['totalInfos']:
-    if 'pbr' == v['code']:
-        pbr_value_str = v['value']
-        print("PBR : %s"%(pbr_value_str))
\ No newline at end of file
@@ -0,0 +1,179 @@
+import bisect
+import heapq
+import re
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+# 한글 음절 → 초성 / 자모 분해용 표 (유니코드 한글 음절 = 0xAC00 + (초성*21 + 중성)*28 + 종성)
+_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSUNG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+_CHOSUNG_SET = set(_CHOSUNG)
+_IGNORED = re.compile(r"[\s\-_.,·&()]+")
+
+def normalize(text: str) -> str:
+    """비교용 이름: 소문자, 공백/구두점 제거."""
+    return _IGNORED.sub("", text.casefold())
+
+def _is_syllable(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+def chosung(text: str) -> str:
+    """한글 음절은 초성으로 바꾸고, 그 밖의 문자는 그대로 둡니다. (예: SK하이닉스 → skㅎㅇㄴㅅ)"""
+    return "".join(_CHOSUNG[(ord(char) - 0xAC00) // 588] if _is_syllable(char) else char for char in text)
+
+def decompose(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 풀어 씁니다. 오타 허용 비교에 사용합니다."""
+    parts = []
+    for char in text:
+        if _is_syllable(char):
+            offset = ord(char) - 0xAC00
+            parts.append(_CHOSUNG[offset // 588])
+            parts.append(_JUNGSUNG[(offset % 588) // 28])
+            if offset % 28:
+                parts.append(_JONGSUNG[offset % 28])
+        else:
+            parts.append(char)
+    return "".join(parts)
+
+def _bigrams(text: str) -> set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+class Symbol(NamedTuple):
+    name: str
+    code: str
+
+class Match(NamedTuple):
+    name: str
+    code: str
+    match: str  # "exact" / "code" / "prefix" / "chosung" / "fuzzy"
+    score: float
+
+class SymbolIndex:
+    """
+    종목명 ↔ 종목 코드 메모리 색인입니다. 한 번 만든 뒤에는 읽기만 하므로 잠금 없이 공유합니다.
+    - 정확히 일치: 이름/코드 dict 조회
+    - 접두어: 정렬된 이름 목록 이분 탐색
+    - 초성: 초성 문자열 정렬 목록 이분 탐색 (예: ㅅㅅㅈㅈ, 삼성ㅈ)
+    - 오타 허용: 자모 바이그램 역색인 + Dice 유사도 (공유 바이그램 수를 NumPy bincount 로 한 번에 셈)
+    """
+
+    def __init__(self, symbols: Iterable[tuple[str, str]]):
+        self.symbols: list[Symbol] = []
+        self._by_name: dict[str, int] = {}
+        self._by_code: dict[str, int] = {}
+        for name, code in symbols:
+            name, code = str(name).strip(), str(code).strip()
+            key = normalize(name)
+            if not key or not code or key in self._by_name or code in self._by_code:
+                continue
+            self._by_name[key] = self._by_code[code] = len(self.symbols)
+            self.symbols.append(Symbol(name, code))
+
+        keys = [normalize(symbol.name) for symbol in self.symbols]
+        self._keys = keys
+        self._prefix = sorted((key, i) for i, key in enumerate(keys))
+        self._chosung = sorted((chosung(key), i) for i, key in enumerate(keys))
+        postings: dict[str, list[int]] = {}
+        gram_counts = []
+        for i, key in enumerate(keys):
+            grams = _bigrams(decompose(key))
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._gram_counts = np.array(gram_counts, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _prefix_range(self, table: list[tuple[str, int]], prefix: str) -> list[int]:
+        start = bisect.bisect_left(table, (prefix,))
+        end = bisect.bisect_left(table, (prefix + "\U0010ffff",), lo=start)
+        return [i for _, i in table[start:end]]
+
+    def exact(self, query: str) -> Symbol | None:
+        index = self._by_name.get(normalize(query))
+        if index is None:
+            index = self._by_code.get(query.strip())
+        return None if index is None else self.symbols[index]
+
+    def prefix(self, query: str) -> list[int]:
+        return self._prefix_range(self._prefix, normalize(query))
+
+    def chosung_prefix(self, query: str) -> list[int]:
+        """초성이 섞인 질의: 초성 자리는 초성만, 나머지 자리는 글자 그대로 일치해야 합니다."""
+        key = normalize(query)
+        if not any(char in _CHOSUNG_SET for char in key):
+            return []
+        matches = []
+        for i in self._prefix_range(self._chosung, chosung(key)):
+            name = self._keys[i]
+            if all(q in _CHOSUNG_SET or q == n for q, n in zip(key, name)):
+                matches.append(i)
+        return matches
+
+    def fuzzy(self, query: str, threshold: float, limit: int) -> list[tuple[int, float]]:
+        """자모 바이그램 Dice 유사도가 threshold 이상인 종목 (유사도 높은 순)."""
+        grams = _bigrams(decompose(normalize(query)))
+        lists = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not lists:
+            return []
+        common = np.bincount(np.concatenate(lists), minlength=len(self.symbols))
+        scores = 2 * common / (len(grams) + self._gram_counts)
+        hits = np.flatnonzero(scores >= threshold)
+        scored = [(int(i), float(scores[i])) for i in hits]
+        scored.sort(key=lambda item: (-item[1], len(self.symbols[item[0]].name), self.symbols[item[0]].code))
+        return scored[:limit]
+
+    def _shortest_first(self, indexes: list[int], limit: int | None = None) -> list[int]:
+        key = lambda i: (len(self.symbols[i].name), self.symbols[i].name)  # noqa: E731
+        return sorted(indexes, key=key) if limit is None else heapq.nsmallest(limit, indexes, key=key)
+
+    def resolve(self, query: str, fuzzy_threshold: float = 0.6) -> Match | None:
+        """이름(또는 코드) 하나를 종목 하나로 해석합니다. 정확히 일치 > 접두어(가장 짧은 이름) > 초성 > 오타 허용."""
+        if not normalize(query):
+            return None
+        symbol = self.exact(query)
+        if symbol is not None:
+            return Match(symbol.name, symbol.code, "exact" if normalize(symbol.name) == normalize(query) else "code", 1.0)
+        for match_type, indexes in (("prefix", self.prefix(query)), ("chosung", self.chosung_prefix(query))):
+            if indexes:
+                symbol = self.symbols[self._shortest_first(indexes, 1)[0]]
+                return Match(symbol.name, symbol.code, match_type, 1.0)
+        best = self.fuzzy(query, fuzzy_threshold, limit=1)
+        if best:
+            symbol = self.symbols[best[0][0]]
+            return Match(symbol.name, symbol.code, "fuzzy", round(best[0][1], 3))
+        return None
+
+    def suggest(self, query: str, limit: int = 10, fuzzy_threshold: float = 0.4) -> list[Match]:
+        """자동완성 후보: 정확히 일치 → 접두어 → 초성 → 오타 허용 순으로 limit 개."""
+        if not normalize(query) or limit <= 0:
+            return []
+        results: list[Match] = []
+        seen: set[str] = set()
+
+        def add(i: int, match_type: str, score: float = 1.0):
+            symbol = self.symbols[i]
+            if symbol.code not in seen:
+                seen.add(symbol.code)
+                results.append(Match(symbol.name, symbol.code, match_type, round(score, 3)))
+
+        symbol = self.exact(query)
+        if symbol is not None:
+            add(self._by_code[symbol.code], "exact" if normalize(symbol.name) == normalize(query) else "code")
+        for match_type, indexes in (("prefix", self.prefix(query)), ("chosung", self.chosung_prefix(query))):
+            for i in self._shortest_first(indexes, limit):
+                if len(results) >= limit:
+                    return results
+                add(i, match_type)
+        if len(results) < limit:
+            for i, score in self.fuzzy(query, fuzzy_threshold, limit):
+                if len(results) >= limit:
+                    break
+                add(i, "fuzzy", score)
+        return results[:limit]
+
+EMPTY_INDEX = SymbolIndex([])
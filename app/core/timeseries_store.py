@@ -0,0 +1,135 @@
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+
+class SeriesHistory:
+    """
+    하나의 시계열(관측일 오름차순). dates 는 datetime64[D], values 는 float64 배열입니다.
+    조회는 모두 NumPy 벡터 연산(searchsorted)으로 처리합니다.
+    """
+
+    def __init__(self, dates: np.ndarray, values: np.ndarray):
+        self.dates = dates.astype("datetime64[D]")
+        self.values = values.astype("float64")
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def last_date(self) -> date | None:
+        return self.dates[-1].item() if len(self.dates) else None
+
+    @property
+    def latest(self) -> float | None:
+        return float(self.values[-1]) if len(self.values) else None
+
+    def values_at(self, when: np.ndarray) -> np.ndarray:
+        """각 날짜 시점(그날 포함 직전 관측)의 값. 관측 이전 날짜는 NaN."""
+        index = np.searchsorted(self.dates, when.astype("datetime64[D]"), side="right") - 1
+        result = self.values[np.clip(index, 0, None)]
+        return np.where(index >= 0, result, np.nan)
+
+    def change_over(self, days: int) -> float | None:
+        """가장 최근 값 - days 일 전 값."""
+        if not len(self.dates):
+            return None
+        before = self.values_at(np.array([self.dates[-1] - np.timedelta64(days, "D")]))[0]
+        return None if np.isnan(before) else float(self.values[-1] - before)
+
+    def changes(self, window_days: int) -> np.ndarray:
+        """모든 관측일에 대해 (그날 값 - window_days 일 전 값) 배열."""
+        return self.values - self.values_at(self.dates - np.timedelta64(window_days, "D"))
+
+    def detect_drops(self, threshold: float, window_days: int, since: date | None = None) -> list[tuple[date, float]]:
+        """
+        window_days 일 사이 값이 threshold 이상 떨어진 구간의 시작일과 하락폭 목록. (예: 기준 금리 빅컷)
+        하나의 인하가 여러 날에 걸쳐 잡히지 않도록, 조건을 처음 만족한 날만 반환합니다.
+        """
+        changes = self.changes(window_days)
+        hit = changes <= -threshold
+        starts = hit & ~np.concatenate(([False], hit[:-1]))
+        if since is not None:
+            starts &= self.dates >= np.datetime64(since, "D")
+        return [(self.dates[i].item(), float(changes[i])) for i in np.flatnonzero(starts)]
+
+    def merge(self, dates: np.ndarray, values: np.ndarray) -> "SeriesHistory":
+        """새 관측값을 합칩니다. 같은 날짜는 새 값이 이깁니다. (수정 발표 반영)"""
+        dates = dates.astype("datetime64[D]")
+        keep = ~np.isin(self.dates, dates)
+        merged_dates = np.concatenate((self.dates[keep], dates))
+        merged_values = np.concatenate((self.values[keep], values.astype("float64")))
+        order = np.argsort(merged_dates, kind="stable")
+        return SeriesHistory(merged_dates[order], merged_values[order])
+
+EMPTY_HISTORY = SeriesHistory(np.array([], dtype="datetime64[D]"), np.array([], dtype="float64"))
+
+class TimeSeriesStore:
+    """
+    시계열별 NumPy(.npz) 파일 저장소. (directory/{series_id}.npz)
+    갱신 시 임시 파일에 쓴 뒤 교체(os.replace)하므로 읽는 쪽은 항상 완성된 파일만 봅니다.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._cache: dict[str, tuple[float, SeriesHistory]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, series_id: str) -> str:
+        if not series_id.replace("_", "").isalnum():
+            raise ValueError(f"invalid series id: {series_id}")
+        return os.path.join(self.directory, f"{series_id}.npz")
+
+    def load(self, series_id: str) -> SeriesHistory:
+        path = self._path(series_id)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return EMPTY_HISTORY
+        cached = self._cache.get(series_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with np.load(path) as data:
+            history = SeriesHistory(data["dates"], data["values"])
+        self._cache[series_id] = (mtime, history)
+        return history
+
+    def save(self, series_id: str, history: SeriesHistory):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, dates=history.dates, values=history.values)
+            os.replace(tmp_path, self._path(series_id))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._cache.pop(series_id, None)
+
+    def update_from_fred(self, series_id: str, client, overlap_days: int = 0) -> int:
+        """
+        마지막 저장일 이후의 관측값만 FRED 에서 가져와 합치고, 마지막 저장일 이후의 새 관측 수를 반환합니다.
+        (overlap_days 를 주면 마지막 저장일 - overlap_days 부터 다시 받아 수정 발표된 값도 덮어씁니다. 처음이면 전체 이력)
+        """
+        with self._lock:
+            history = self.load(series_id)
+            last_date = history.last_date
+            start = None
+            if last_date is not None:
+                start = last_date - timedelta(days=overlap_days) if overlap_days > 0 else last_date + timedelta(days=1)
+            try:
+                series = client.get_series(series_id, observation_start=start)
+            except ValueError:
+                # FRED 에 해당 구간 관측값이 없는 경우
+                return 0
+            series = series.dropna()
+            if series.empty:
+                return 0
+            dates = series.index.values.astype("datetime64[D]")
+            values = series.to_numpy(dtype="float64")
+            self.save(series_id, history.merge(dates, values))
+            if last_date is None:
+                return len(dates)
+            return int(np.count_nonzero(dates > np.datetime64(last_date, "D")))
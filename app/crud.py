@@ -1,43 +1,157 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from .models import db_models, schemas
-from datetime import datetime, timedelta
+from .core.response_cache import response_cache
+from .services.keyword_ranking import keyword_ranking
+from datetime import datetime, timedelta, timezone
+import time
+
+# SQLite 의 바인드 파라미터 개수 제한(구버전 999)을 넘지 않도록 IN 조회를 나눠서 실행합니다.
+_IN_CLAUSE_CHUNK_SIZE = 900
+
+def _insert_ignoring_duplicates(db: Session, model):
+    """unique 제약 충돌 시 무시하는 INSERT 문을 DB 종류에 맞게 만듭니다."""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    if dialect_name == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    return insert(model)
+
+def _insert_new_articles(db: Session, articles: list[schemas.NewsArticle], source: str) -> int:
+    """
+    DB 에 없는 기사만 일괄 INSERT 하고 저장된 수를 반환합니다. (커밋은 호출하는 쪽에서)
+    (기존 URL 을 한 번의 IN 조회로 걸러낸 뒤, 새 기사만 executemany 로 일괄 INSERT)
+    """
+    # 같은 배치 안에서 중복된 URL 은 처음 나온 기사만 사용
+    articles_by_url = {}
+    for article in articles:
+        if article.url and article.url not in articles_by_url:
+            articles_by_url[article.url] = article
+    if not articles_by_url:
+        return 0
+
+    urls = list(articles_by_url)
+    existing_urls = set()
+    for start in range(0, len(urls), _IN_CLAUSE_CHUNK_SIZE):
+        chunk = urls[start:start + _IN_CLAUSE_CHUNK_SIZE]
+        existing_urls.update(db.scalars(select(db_models.NewsArticle.url).where(db_models.NewsArticle.url.in_(chunk))))
+
+    # 발행 시각을 알 수 없는 기사는 수집 시각으로 정렬합니다.
+    fetched_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = [
+        {
+            "title": article.title,
+            "url": url,
+            "published_at": article.published_at or fetched_at,
+            "source": source,
+            "click_count": 0,
+        }
+        for url, article in articles_by_url.items()
+        if url not in existing_urls
+    ]
+    if not rows:
+        return 0
+
+    # 조회와 INSERT 사이에 다른 프로세스가 같은 URL 을 넣었더라도 충돌 없이 건너뜁니다.
+    result = db.connection().execute(_insert_ignoring_duplicates(db, db_models.NewsArticle), rows)
+    return result.rowcount if result.rowcount >= 0 else len(rows)
 
 def create_news_articles(db: Session, articles: list[schemas.NewsArticle], source: str):
     """
     기사 리스트를 받아 DB에 중복 없이 저장하는 함수
     """
-    new_articles_count = 0
-    for article in articles:
-        db_article = db.query(db_models.NewsArticle).filter(db_models.NewsArticle.url == article.url).first()
-        if not db_article:
-            db_article_to_add = db_models.NewsArticle(
-                title=article.title,
-                url=article.url,
-                published_at=article.published_at,
-                source=source
-            )
-            db.add(db_article_to_add)
-            new_articles_count += 1
+    count = _insert_new_articles(db, articles, source)
     db.commit()
-    return new_articles_count
+    if count:
+        _invalidate_news_responses([source])
+    return count
 
-def get_articles_by_source(db: Session, source: str, skip: int = 0, limit: int = 10):
+def create_news_articles_bulk(db: Session, batches: dict[str, list[schemas.NewsArticle]]) -> dict[str, int]:
     """
-    특정 소스의 뉴스 기사들을 최신순으로 조회하는 함수
+    여러 출처(source → 기사 리스트)의 기사를 한 트랜잭션으로 저장하는 함수. 출처별 새로 저장된 수를 반환합니다.
+    (같은 URL 이 여러 출처에 있으면 먼저 나온 출처로 저장됩니다)
     """
-    return db.query(db_models.NewsArticle).filter(db_models.NewsArticle.source == source).order_by(db_models.NewsArticle.id.desc()).offset(skip).limit(limit).all()
+    try:
+        counts = {source: _insert_new_articles(db, articles, source) for source, articles in batches.items()}
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    _invalidate_news_responses([source for source, count in counts.items() if count])
+    return counts
+
+def _invalidate_news_responses(sources: list[str]):
+    """새 기사가 저장된 출처에 해당하는 조회 API 응답 캐시를 비웁니다."""
+    if "macro" in sources:
+        response_cache.invalidate("news_macro")
+    if sources:
+        # 기사 수가 적을 때는 새 기사(클릭 0)도 인기 기사 목록에 들어갈 수 있습니다.
+        response_cache.invalidate("news_popular")
+
+def get_articles_by_source(
+    db: Session,
+    source: str,
+    limit: int = 10,
+    before: tuple[datetime, int] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    """
+    특정 소스의 뉴스 기사들을 최신순(published_at, id 내림차순)으로 조회하는 함수
+    before 에 직전 페이지 마지막 기사의 (published_at, id) 를 넘기면 그 다음 기사부터 가져옵니다. (키셋 페이지네이션)
+    since/until 로 발행 시각 범위 [since, until) 를 제한할 수 있습니다.
+    """
+    query = db.query(db_models.NewsArticle).filter(db_models.NewsArticle.source == source)
+    if since is not None:
+        query = query.filter(db_models.NewsArticle.published_at >= since)
+    if until is not None:
+        query = query.filter(db_models.NewsArticle.published_at < until)
+    if before is not None:
+        query = query.filter(tuple_(db_models.NewsArticle.published_at, db_models.NewsArticle.id) < tuple_(*before))
+    return query.order_by(db_models.NewsArticle.published_at.desc(), db_models.NewsArticle.id.desc()).limit(limit).all()
 
 def insert_search_keyword(db: Session, keyword: str):
     """
     검색 키워드를 로그 테이블에 저장하는 함수
     """
-    search_log = db_models.SearchLog(keyword=keyword)
+    # 인기 검색어 집계(메모리)와 같은 시각으로 저장합니다. (집계 재구성 시 기준 시각 비교용)
+    searched_at = time.time()
+    search_log = db_models.SearchLog(keyword=keyword, searched_at=datetime.fromtimestamp(searched_at, timezone.utc).replace(tzinfo=None))
     db.add(search_log)
     db.commit()
     db.refresh(search_log)
+    # 인기 검색어 집계(메모리)에도 바로 반영
+    keyword_ranking.record(keyword, searched_at)
     return search_log
 
+def insert_search_logs(db: Session, entries: list[tuple[str, datetime]]):
+    """
+    (검색어, 검색 시각) 목록을 한 번의 executemany INSERT 로 저장하는 함수
+    (인기 검색어 집계는 큐에 넣는 시점에 이미 반영되므로 여기서는 DB 에만 저장합니다)
+    """
+    if not entries:
+        return
+    db.connection().execute(insert(db_models.SearchLog), [
+        {"keyword": keyword, "searched_at": searched_at} for keyword, searched_at in entries
+    ])
+    db.commit()
+
+def iter_search_logs_since(db: Session, since: datetime, batch_size: int = 10_000, until: datetime | None = None):
+    """
+    since 이후(until 이 있으면 그 전까지)의 (검색어, 검색 시각) 을 배치 단위로 스트리밍하는 함수 (인기 검색어 집계 재구성용)
+    """
+    stmt = (
+        select(db_models.SearchLog.keyword, db_models.SearchLog.searched_at)
+        .where(db_models.SearchLog.searched_at >= since)
+        .execution_options(yield_per=batch_size)
+    )
+    if until is not None:
+        stmt = stmt.where(db_models.SearchLog.searched_at < until)
+    for keyword, searched_at in db.execute(stmt):
+        yield keyword, searched_at
+
 def get_top_keywords(db: Session, limit: int = 10):
     """
     최근 1일간 가장 많이 검색된 키워드 상위 N개를 반환하는 함수
@@ -62,10 +176,193 @@ def increment_article_click(db: Session, article_id: int):
         article.click_count += 1
         db.commit()
         db.refresh(article)
+        response_cache.invalidate("news_popular")
     return article
 
-def get_top_articles_by_click(db: Session, limit: int = 10):
+def article_exists(db: Session, article_id: int) -> bool:
+    """
+    기사 ID 가 존재하는지 확인하는 함수 (기본키 조회만 수행)
+    """
+    return db.scalar(select(db_models.NewsArticle.id).where(db_models.NewsArticle.id == article_id)) is not None
+
+def apply_click_deltas(db: Session, deltas: dict[int, int]):
+    """
+    기사별 누적 클릭 수를 한 번의 executemany UPDATE 로 반영하는 함수
+    (click_count = click_count + ? 형태라 동시 반영에도 유실이 없습니다)
+    """
+    if not deltas:
+        return
+    table = db_models.NewsArticle.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("article_id"))
+        .values(click_count=func.coalesce(table.c.click_count, 0) + bindparam("delta"))
+    )
+    db.connection().execute(stmt, [
+        {"article_id": article_id, "delta": delta} for article_id, delta in deltas.items()
+    ])
+    db.commit()
+    response_cache.invalidate("news_popular")
+
+def get_top_articles_by_click(db: Session, limit: int = 10, pending_clicks: dict[int, int] | None = None):
+    """
+    클릭 수 기준으로 인기 기사 상위 N개를 schemas.NewsArticle 목록으로 반환하는 함수
+    pending_clicks 에 아직 DB 에 반영되지 않은 클릭 수가 있으면 합산해서 순위를 매깁니다. (동점은 id 내림차순)
+    """
+    top_articles = db.query(db_models.NewsArticle).order_by(db_models.NewsArticle.click_count.desc(), db_models.NewsArticle.id.desc()).limit(limit).all()
+    if not pending_clicks:
+        return [schemas.NewsArticle.model_validate(article) for article in top_articles]
+
+    # 미반영 클릭이 있는 기사는 DB 상위 N 개 밖에 있어도 순위에 들어올 수 있으므로 함께 조회합니다.
+    candidates = {article.id: article for article in top_articles}
+    missing_ids = [article_id for article_id in pending_clicks if article_id not in candidates]
+    for start in range(0, len(missing_ids), _IN_CLAUSE_CHUNK_SIZE):
+        chunk = missing_ids[start:start + _IN_CLAUSE_CHUNK_SIZE]
+        for article in db.query(db_models.NewsArticle).filter(db_models.NewsArticle.id.in_(chunk)):
+            candidates[article.id] = article
+
+    merged = [
+        schemas.NewsArticle.model_validate(article).model_copy(
+            update={"click_count": (article.click_count or 0) + pending_clicks.get(article.id, 0)}
+        )
+        for article in candidates.values()
+    ]
+    merged.sort(key=lambda article: (article.click_count, article.id), reverse=True)
+    return merged[:limit]
+
+def get_cached_insight(db: Session, cache_key: str, min_created_at: datetime):
+    """
+    min_created_at 이후에 저장된 인사이트 캐시 항목을 조회하는 함수
+    """
+    return (
+        db.query(db_models.InsightCacheEntry)
+        .filter(db_models.InsightCacheEntry.cache_key == cache_key)
+        .filter(db_models.InsightCacheEntry.created_at >= min_created_at)
+        .first()
+    )
+
+def save_cached_insight(db: Session, cache_key: str, stock_name: str, quick_insight: str, report_id: str, expired_before: datetime):
+    """
+    인사이트 캐시 항목을 저장(덮어쓰기)하고, 만료된 항목을 정리하는 함수
+    """
+    db.merge(db_models.InsightCacheEntry(
+        cache_key=cache_key,
+        stock_name=stock_name,
+        quick_insight=quick_insight,
+        report_id=report_id,
+        created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+    ))
+    db.query(db_models.InsightCacheEntry).filter(db_models.InsightCacheEntry.created_at < expired_before).delete()
+    db.commit()
+
+def get_latest_indicator_version(db: Session) -> int | None:
+    """
+    가장 최근 경제지표 스냅샷의 버전만 조회하는 함수 (변경 여부 확인용, 기본키 인덱스만 읽음)
+    """
+    return db.scalar(select(func.max(db_models.IndicatorSnapshot.version)))
+
+def get_latest_indicator_snapshot(db: Session):
+    """
+    가장 최근 경제지표 스냅샷을 조회하는 함수
+    """
+    return db.query(db_models.IndicatorSnapshot).order_by(db_models.IndicatorSnapshot.version.desc()).first()
+
+def save_indicator_snapshot(db: Session, data: dict, keep: int = 100):
+    """
+    경제지표 스냅샷을 새 버전으로 저장하고, 최근 keep 개를 넘는 오래된 버전은 정리하는 함수
+    (저장과 정리가 한 트랜잭션이라 읽는 쪽은 항상 완성된 스냅샷만 봅니다)
+    """
+    snapshot = db_models.IndicatorSnapshot(data=data, created_at=datetime.now(timezone.utc).replace(tzinfo=None))
+    db.add(snapshot)
+    db.flush()
+    db.query(db_models.IndicatorSnapshot).filter(
+        db_models.IndicatorSnapshot.version <= snapshot.version - keep
+    ).delete(synchronize_session=False)
+    db.commit()
+    db.refresh(snapshot)
+    return snapshot
+
+def try_acquire_lease(db: Session, name: str, owner: str, ttl_seconds: float) -> bool:
+    """
+    리스를 획득하거나 연장하는 함수. 내가 보유 중이거나 만료된 리스만 가져올 수 있습니다.
+    (조건부 UPDATE / 충돌 무시 INSERT 한 문장씩이라 여러 프로세스가 동시에 시도해도 한 곳만 성공합니다)
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    lease = db_models.SchedulerLease
+    result = db.execute(
+        update(lease)
+        .where(lease.name == name)
+        .where((lease.owner == owner) | (lease.expires_at < now))
+        .values(owner=owner, expires_at=expires_at)
+    )
+    if result.rowcount == 0:
+        result = db.execute(
+            _insert_ignoring_duplicates(db, lease).values(name=name, owner=owner, expires_at=expires_at)
+        )
+    db.commit()
+    return result.rowcount == 1
+
+def release_lease(db: Session, name: str, owner: str):
+    """
+    내가 보유한 리스를 반납하는 함수 (다른 프로세스가 만료를 기다리지 않고 바로 가져갈 수 있음)
+    """
+    db.query(db_models.SchedulerLease).filter(
+        db_models.SchedulerLease.name == name, db_models.SchedulerLease.owner == owner
+    ).delete(synchronize_session=False)
+    db.commit()
+
+def promote_theme(db: Session, theme: str):
+    """
+    테마를 정기 수집 대상으로 승격하거나, 이미 승격된 테마의 승격 시각을 갱신하는 함수
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    promoted = db_models.PromotedTheme
+    result = db.execute(
+        update(promoted).where(promoted.theme == theme).values(promotions=promoted.promotions + 1, last_promoted_at=now)
+    )
+    if result.rowcount == 0:
+        db.execute(
+            _insert_ignoring_duplicates(db, promoted).values(theme=theme, promotions=1, promoted_at=now, last_promoted_at=now)
+        )
+    db.commit()
+
+def get_promoted_themes(db: Session, since: datetime, limit: int) -> list[str]:
+    """
+    since 이후 승격(갱신)된 테마를 가져오는 함수
+    (승격된 구간이 많은 순, 같으면 먼저 승격된 순 = 같은 구간에서 더 빨리 기준을 넘긴 테마)
+    """
+    promoted = db_models.PromotedTheme
+    return list(db.scalars(
+        select(promoted.theme)
+        .where(promoted.last_promoted_at >= since)
+        .order_by(promoted.promotions.desc(), promoted.promoted_at, promoted.theme)
+        .limit(limit)
+    ))
+
+def replace_stock_symbols(db: Session, symbols: list[tuple[str, str]]) -> int:
+    """
+    종목 목록(종목명, 종목 코드)을 한 트랜잭션으로 통째로 교체하는 함수
+    (이름/코드가 중복된 항목은 처음 나온 것만 저장)
+    """
+    names, codes, rows = set(), set(), []
+    for name, code in symbols:
+        if name and code and name not in names and code not in codes:
+            names.add(name)
+            codes.add(code)
+            rows.append({"name": name, "code": code})
+    try:
+        db.query(db_models.StockInfo).delete(synchronize_session=False)
+        if rows:
+            db.execute(insert(db_models.StockInfo), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(rows)
+
+def get_stock_symbols(db: Session) -> list[tuple[str, str]]:
     """
-    클릭 수 기준으로 인기 기사 상위 N개를 반환하는 함수
+    저장된 종목 목록(종목명, 종목 코드)을 가져오는 함수
     """
-    return db.query(db_models.NewsArticle).order_by(db_models.NewsArticle.click_count.desc()).limit(limit).all()
\ No newline at end of file
+    return [tuple(row) for row in db.execute(select(db_models.StockInfo.name, db_models.StockInfo.code).where(db_models.StockInfo.code.is_not(None)))]
@@ -1,20 +1,104 @@
 # app/database.py
-# 
-from sqlalchemy import create_engine
+#
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-# 1. 데이터베이스 접속 주소 설정 (SQLite 사용)
-# 프로젝트 루트 폴더에 sql_app.db 라는 파일로 DB가 생성됩니다.
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+from app.config import settings
 
-# 2. 데이터베이스 엔진 생성
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# 1. 데이터베이스 접속 주소 설정
+# .env 의 DATABASE_URL 을 사용합니다. (예: sqlite:///./sql_app.db, postgresql+psycopg://...)
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+def _sqlite_pragmas(readonly: bool) -> list[str]:
+    """운영용 SQLite 설정. WAL 모드라 읽기와 쓰기가 서로 막지 않습니다."""
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if readonly:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+def _is_file_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def create_db_engine(url: str, readonly: bool = False, tuned: bool = True) -> Engine:
+    """
+    DATABASE_URL 에 맞는 엔진을 만듭니다.
+    - SQLite 파일 DB: 커넥션마다 WAL/busy_timeout 등 PRAGMA 적용, 쓰기 엔진은 커넥션 수를 작게 유지
+    - 서버 DB(PostgreSQL 등): DB_POOL_* 설정으로 커넥션 풀 크기 지정
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+    if not (tuned and _is_file_sqlite(parsed)):
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    pool_size = settings.SQLITE_READER_POOL_SIZE if readonly else settings.SQLITE_WRITER_POOL_SIZE
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000},
+        pool_size=pool_size,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    pragmas = _sqlite_pragmas(readonly)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # pysqlite 의 자동 BEGIN 을 끄고 트랜잭션 시작은 아래 begin 이벤트에서 직접 처리합니다.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        # 쓰기 트랜잭션은 시작할 때 쓰기 잠금을 잡습니다. (BEGIN IMMEDIATE)
+        # 읽다가 쓰기로 올라가는 도중 다른 쓰기와 부딪혀 바로 'database is locked' 가 나는 경우를 막고,
+        # 잠금 대기는 busy_timeout 안에서 처리됩니다.
+        connection.exec_driver_sql("BEGIN" if readonly else "BEGIN IMMEDIATE")
+
+    return engine
+
+# 2. 데이터베이스 엔진 생성 (쓰기용 / 읽기 전용)
+# DATABASE_READ_URL 을 지정하면 읽기 전용 엔진은 그 주소(예: 읽기 복제본)를 사용합니다.
+def _create_read_engine(writer: Engine) -> Engine:
+    if settings.DATABASE_READ_URL:
+        return create_db_engine(settings.DATABASE_READ_URL, readonly=True, tuned=settings.SQLITE_TUNED)
+    parsed = make_url(SQLALCHEMY_DATABASE_URL)
+    if parsed.get_backend_name() == "sqlite" and not (settings.SQLITE_TUNED and _is_file_sqlite(parsed)):
+        # 튜닝하지 않는 SQLite(메모리 DB 포함)는 읽기/쓰기 엔진을 나누지 않습니다.
+        return writer
+    return create_db_engine(SQLALCHEMY_DATABASE_URL, readonly=True, tuned=settings.SQLITE_TUNED)
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL, tuned=settings.SQLITE_TUNED)
+read_engine = _create_read_engine(engine)
 
 # 3. 데이터베이스와 통신하는 세션(Session) 클래스 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 조회만 하는 API 용 세션 (쓰기 엔진의 커넥션을 차지하지 않습니다)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # 4. DB 모델의 기본이 될 Base 클래스 생성
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+def init_db():
+    """모든 테이블을 생성합니다. (이미 있는 테이블은 건너뜀) 임포트 시점이 아니라 시작/배포 단계에서 명시적으로 호출합니다."""
+    from app.models import db_models  # noqa: F401  (모델을 Base.metadata 에 등록)
+
+    Base.metadata.create_all(bind=engine)
@@ -1,28 +1,6 @@
 # app/db_models.py
-from sqlalchemy import Column, Integer, String, DateTime
-from datetime import datetime
-from .database import Base
+# 예전 import 경로 호환용입니다. ORM 모델은 app/models/db_models.py 에만 정의합니다.
+# (같은 테이블을 여기서 다시 매핑하면 Base.metadata 에 중복 정의되므로 그대로 다시 내보내기만 합니다)
+from app.models.db_models import NewsArticle, SearchLog, StockInfo
 
-class SearchLog(Base):
-    __tablename__ = "search_log"
-
-    id = Column(Integer, primary_key=True, index=True)
-    keyword = Column(String(100), nullable=False)
-    searched_at = Column(DateTime, default=datetime.utcnow)
-
-class StockInfo(Base):
-    __tablename__ = "stock_info"
-
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False, unique=True)
-    code = Column(String(20), unique=True)
-
-class NewsArticle(Base):
-    __tablename__ = "news_articles"
-
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False)
-    url = Column(String(255), nullable=False, unique=True)
-    published_at = Column(DateTime, nullable=False)
-    source = Column(String(100), nullable=False)
-    click_count = Column(Integer, default=0)
\ No newline at end of file
+__all__ = ["NewsArticle", "SearchLog", "StockInfo"]
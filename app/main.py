@@ -1,118 +1,397 @@
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.responses import FileResponse
+import asyncio
+import json
+from contextlib import aclosing, asynccontextmanager
+from datetime import datetime
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, WebSocket
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import crud
-from app.core import stock_info, insight_generator, news_fetcher
-from app.database import SessionLocal, engine, Base
-from app.services.scheduler import start_scheduler
+from app.core import stock_info, insight_generator, news_fetcher, http_client, llm_client, metrics
+from app.core.report_store import get_report_store
+from app.core.http_cache import cached_json_response
+from app.core.response_cache import response_cache
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor
+from app.core.retrieval import report_retriever
+from app.database import SessionLocal, ReadSessionLocal, engine, read_engine, init_db
+from app.services.scheduler import start_scheduler, stop_scheduler
+from app.services.indicator_store import indicator_store
+from app.services.leader_election import scheduler_lease
+from app.services.news_refresher import MAIN_THEMES, news_refresher
+from app.services.theme_news_cache import theme_news_cache
+from app.services.stock_symbols import stock_symbols
+from app.services.insight_cache import insight_cache
+from app.services.click_counter import click_counter
+from app.services.keyword_ranking import keyword_ranking
+from app.services.search_log_writer import search_log_writer
+from app.services.price_stream import price_stream
+from app.config import settings
 from app.models.schemas import (
-    NewsArticle, StockDetail, InsightResponse, TopKeyword, ChatbotQuery
+    NewsArticle, NewsFeedPage, StockDetail, InsightResponse, TopKeyword, ChatbotQuery,
+    StockBatchQuery, StockBatchItem, StockSuggestion, parse_published_at
 )
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    워커 시작/종료 처리입니다. 앱 임포트 시점에는 DB/네트워크에 접근하지 않습니다.
+    외부 API 클라이언트(httpx, OpenAI, FRED)는 처음 사용할 때 만들어집니다.
+    """
+    if settings.DB_CREATE_SCHEMA_ON_STARTUP:
+        await run_in_threadpool(init_db)
+    search_log_writer.start()
+    # 스케줄러 시작 시 DB 에서 스냅샷/종목 목록을 읽으므로 이벤트 루프 밖에서 실행합니다.
+    await run_in_threadpool(start_scheduler)
+    try:
+        yield
+    finally:
+        await price_stream.close()
+        await run_in_threadpool(stop_scheduler)
+        await run_in_threadpool(search_log_writer.stop)
+        await run_in_threadpool(click_counter.flush)
+        await http_client.close_async_client()
+        await insight_generator.close_clients()
+
+app = FastAPI(title="AI 금융 정보 서비스", lifespan=lifespan)
+
+if settings.METRICS_ENABLED:
+    # 라우트별 처리 시간 + 요청별 SQL 수/시간, SQL 문/commit 시간을 /metrics 로 내보냅니다.
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine, "writer")
+    if read_engine is not engine:
+        metrics.instrument_engine(read_engine, "reader")
+    metrics.instrument_sessions(SessionLocal, "writer")
+    metrics.instrument_sessions(ReadSessionLocal, "reader")
+
+# SSE(text/event-stream) 응답 헤더. 프록시가 버퍼링하지 않도록 합니다.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
-app = FastAPI(title="AI 금융 정보 서비스")
+def sse_event(event: str, data: dict) -> str:
+    """server-sent event 한 건을 직렬화합니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-def get_db():
-    db = SessionLocal()
+def get_read_db():
+    """조회 전용 API 용 세션 (읽기 전용 커넥션 풀 사용)."""
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
         db.close()
 
-@app.on_event("startup")
-def startup_event():
-    start_scheduler()
-
 @app.get("/", include_in_schema=False)
 def read_root():
     return FileResponse("static/index.html")
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus 수집용 지표 (텍스트 형식)."""
+    body, content_type = metrics.render_latest()
+    return Response(content=body, media_type=content_type)
+
+# --- 응답 캐시 대상 조회 API ---
+# 아래 함수들이 만든 응답은 JSON 바이트로 캐시되고, 데이터를 쓰는 쪽(crud/스케줄러)이 비웁니다.
+def with_read_db(func, *args, **kwargs):
+    db = ReadSessionLocal()
+    try:
+        return func(db, *args, **kwargs)
+    finally:
+        db.close()
+
+def render_macro_news() -> List[NewsArticle]:
+    articles = with_read_db(crud.get_articles_by_source, source="macro", limit=5)
+    return [NewsArticle.model_validate(article) for article in articles]
+
+def render_popular_news() -> List[NewsArticle]:
+    # 아직 DB 에 반영되지 않은 클릭도 합산합니다. (클릭 반영(flush) 때 캐시가 비워집니다)
+    articles = with_read_db(crud.get_top_articles_by_click, limit=5, pending_clicks=click_counter.pending_deltas())
+    return [NewsArticle.model_validate(article) for article in articles]
+
+def render_themes() -> List[str]:
+    return news_fetcher.get_investment_themes() or ["반도체", "2차전지", "인공지능", "바이오/제약"]
+
+def render_top_keywords() -> List[TopKeyword]:
+    # DB 를 GROUP BY 하지 않고 메모리에 유지 중인 상위 K 집계에서 바로 만듭니다.
+    return [TopKeyword(keyword=keyword, count=count) for keyword, count in keyword_ranking.top(limit=10)]
+
+response_cache.register("news_macro", render_macro_news)
+response_cache.register("news_popular", render_popular_news)
+response_cache.register("themes", render_themes, ttl=settings.RESPONSE_CACHE_STATIC_TTL)
+response_cache.register("keywords_top", render_top_keywords)
+
 @app.get("/api/news/macro", response_model=List[NewsArticle])
-def get_macro_news(db: Session = Depends(get_db)):
-    return crud.get_articles_by_source(db=db, source="macro", limit=5)
+async def get_macro_news(request: Request):
+    return await response_cache.respond(request, "news_macro")
 
 @app.get("/api/news/popular", response_model=List[NewsArticle])
-def get_popular_news(db: Session = Depends(get_db)):
-    return crud.get_top_articles_by_click(db=db, limit=5)
+async def get_popular_news(request: Request):
+    return await response_cache.respond(request, "news_popular")
+
+@app.get("/api/news/feed", response_model=NewsFeedPage)
+def get_news_feed(
+    request: Request,
+    source: Optional[str] = None,
+    theme: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(20, ge=1),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    소스(macro 등) 또는 테마별 뉴스 피드를 최신순으로 페이지 단위 조회합니다.
+    응답의 next_cursor 를 다음 요청의 cursor 로 넘기면 이어서 조회하며, 깊은 페이지도 첫 페이지와 같은 비용입니다.
+    ETag / Cache-Control 헤더를 붙여 클라이언트와 CDN 이 페이지를 재사용할 수 있게 합니다.
+    """
+    # 테마 기사는 테마 이름을 source 로 저장하므로 둘 중 하나만 받습니다.
+    if (source is None) == (theme is None):
+        raise HTTPException(status_code=400, detail="source 와 theme 중 하나만 지정해야 합니다.")
+    before = None
+    if cursor is not None:
+        try:
+            before = decode_cursor(cursor)
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="잘못된 cursor 입니다.")
+    limit = min(limit, settings.NEWS_FEED_MAX_LIMIT)
+
+    # 한 건 더 조회해서 다음 페이지가 있는지 판단합니다.
+    articles = crud.get_articles_by_source(
+        db, source or theme, limit=limit + 1, before=before,
+        since=parse_published_at(since), until=parse_published_at(until),
+    )
+    next_cursor = None
+    if len(articles) > limit:
+        articles = articles[:limit]
+        next_cursor = encode_cursor(articles[-1].published_at, articles[-1].id)
+    page = NewsFeedPage(items=[NewsArticle.model_validate(article) for article in articles], next_cursor=next_cursor)
+    max_age = settings.NEWS_FEED_CURSOR_MAX_AGE if cursor else settings.NEWS_FEED_MAX_AGE
+    return cached_json_response(request, page, max_age)
 
 @app.get("/api/themes", response_model=List[str])
-def get_available_themes():
-    themes = news_fetcher.get_investment_themes()
-    if not themes:
-        return ["반도체", "2차전지", "인공지능", "바이오/제약"]
-    return themes
+async def get_available_themes(request: Request):
+    return await response_cache.respond(request, "themes")
 
 @app.get("/api/news/theme/{theme_name}", response_model=List[NewsArticle])
-def get_news_by_theme(theme_name: str, db: Session = Depends(get_db)):
-    MAIN_THEMES = ["반도체", "2차전지", "인공지능"]
+async def get_news_by_theme(theme_name: str, db: Session = Depends(get_read_db)):
     if theme_name in MAIN_THEMES:
-        return crud.get_articles_by_source(db=db, source=theme_name, limit=5)
-    else:
-        articles = news_fetcher.get_articles_by_theme(theme_name=theme_name, limit=5)
-        if articles is None:
-            raise HTTPException(status_code=404, detail="해당 테마의 기사를 가져올 수 없습니다.")
-        return articles
+        return await run_in_threadpool(crud.get_articles_by_source, db=db, source=theme_name, limit=5)
+    # 그 외 테마는 DeepSearch 조회 결과를 캐시해 두고 응답합니다. (자주 요청되면 정기 수집 대상으로 승격)
+    articles = await theme_news_cache.get(theme_name)
+    if articles is None:
+        raise HTTPException(status_code=404, detail="해당 테마의 기사를 가져올 수 없습니다.")
+    return articles
 
 @app.post("/api/articles/{article_id}/click", status_code=204)
-def record_article_click(article_id: int, db: Session = Depends(get_db)):
-    article = crud.increment_article_click(db=db, article_id=article_id)
-    if not article:
+def record_article_click(article_id: int, db: Session = Depends(get_read_db)):
+    if not click_counter.article_exists(db, article_id):
         raise HTTPException(status_code=404, detail="Article not found")
+    click_counter.record(article_id)
     return
 
 @app.get("/api/keywords/top", response_model=List[TopKeyword])
-def get_top_search_keywords(db: Session = Depends(get_db)):
-    return crud.get_top_keywords(db=db, limit=10)
+async def get_top_search_keywords(request: Request):
+    # 검색이 들어와 집계 상위 목록이 바뀌었을 때만 응답을 다시 만듭니다.
+    return await response_cache.respond(request, "keywords_top", version=keyword_ranking.version)
+
+@app.get("/api/system/stats")
+def get_system_stats():
+    """내부 버퍼/캐시 상태를 확인하기 위한 운영용 API 입니다."""
+    return {
+        "search_log_writer": search_log_writer.stats(),
+        "click_counter": click_counter.stats(),
+        "keyword_ranking": keyword_ranking.stats(),
+        "quote_cache": stock_info.quote_cache.stats(),
+        "price_stream": price_stream.stats(),
+        "response_cache": response_cache.stats(),
+        "insight_cache": insight_cache.stats(),
+        "llm": llm_client.stats(),
+        "indicators": indicator_store.stats(),
+        "scheduler": {"mode": settings.SCHEDULER_MODE, "lease": scheduler_lease.stats()},
+        "news_refresh": news_refresher.stats(),
+        "theme_news_cache": theme_news_cache.stats(),
+        "stock_symbols": stock_symbols.stats(),
+        "report_store": get_report_store().stats(),
+        "chatbot_retrieval": report_retriever.stats(),
+    }
 
 @app.get("/api/stock/search/{stock_code}", response_model=StockDetail)
-def search_stock_details(stock_code: str, db: Session = Depends(get_db)):
-    details = stock_info.get_stock_details_from_naver(stock_code)
+async def search_stock_details(stock_code: str):
+    details = await stock_info.get_stock_details_from_naver(stock_code)
     if not details:
         raise HTTPException(status_code=404, detail="종목 정보를 가져올 수 없습니다.")
-    crud.insert_search_keyword(db=db, keyword=details.name)
+    # 검색 기록은 버퍼 큐에 넣고 백그라운드에서 일괄 저장합니다. (응답을 기다리게 하지 않음)
+    search_log_writer.submit(details.name)
     return details
 
+@app.websocket("/ws/stock/prices")
+async def stream_stock_prices(websocket: WebSocket, codes: Optional[str] = None):
+    """
+    실시간 시세 구독(WebSocket). 종목마다 서버의 폴러 하나가 시세를 조회하고, 바뀐 값만 모든 구독자에게 보냅니다.
+    접속 주소에 ?codes=005930,000660 을 붙이거나 접속 후 {"action": "subscribe", "codes": [...]} 를 보내 구독합니다.
+    구독 직후 'snapshot'(전체 값), 이후에는 'diff'(바뀐 필드만) 메시지를 받습니다.
+    """
+    await websocket.accept()
+    initial = [code.strip() for code in codes.split(",") if code.strip()] if codes else []
+    await price_stream.serve(websocket, initial)
+
+@app.post("/api/stock/batch")
+async def search_stock_details_batch(query: StockBatchQuery):
+    """
+    여러 종목을 한 번에 조회합니다.
+    결과는 조회가 끝나는 순서대로 한 줄에 하나씩(NDJSON) 스트리밍되므로, 느린 종목이 전체 응답을 막지 않습니다.
+    """
+    # 순서를 유지하면서 중복 코드 제거
+    stock_codes = list(dict.fromkeys(code.strip() for code in query.codes if code.strip()))
+    if not stock_codes:
+        raise HTTPException(status_code=400, detail="조회할 종목 코드가 없습니다.")
+    if len(stock_codes) > settings.STOCK_BATCH_MAX_CODES:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {settings.STOCK_BATCH_MAX_CODES}개 종목까지 조회할 수 있습니다.")
+
+    async def stream_results():
+        async for code, detail, error in stock_info.iter_stock_details(stock_codes):
+            item = StockBatchItem(code=code, detail=detail, error=error)
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @app.get("/api/insight/{stock_code}", response_model=InsightResponse)
-def get_full_ai_pipeline(stock_code: str):
-    stock = stock_info.get_stock_details_from_naver(stock_code)
+async def get_full_ai_pipeline(stock_code: str):
+    stock = await stock_info.get_stock_details_from_naver(stock_code)
     if not stock:
         raise HTTPException(status_code=404, detail="종목 정보를 찾을 수 없습니다.")
     
-    clova_conclusion, clova_reason = insight_generator.get_clova_insight(stock.name)
-    gpt_report_text = insight_generator.get_gpt_report(stock.name, clova_conclusion, clova_reason)
-    report_id = insight_generator.save_report_to_file(gpt_report_text)
-    
-    return InsightResponse(quick_insight=clova_conclusion, report_id=report_id)
+    # 같은 종목 + 같은 경제지표 스냅샷이면 캐시된 report_id 를 바로 반환합니다.
+    indicators = indicator_store.data
+    return await insight_cache.get_or_create(
+        stock.name,
+        indicators,
+        lambda: insight_generator.run_insight_pipeline(stock.name, indicators),
+    )
+
+@app.get("/api/insight/{stock_code}/stream")
+async def stream_full_ai_pipeline(stock_code: str):
+    """
+    /api/insight 의 스트리밍(SSE) 버전입니다.
+    CLOVA 1차 결론이 나오는 즉시 'insight' 이벤트를 보내고, 이어서 GPT 보고서를 'token' 이벤트로 흘려보냅니다.
+    보고서는 생성되는 대로 파일에 기록되며, 마지막에 'done' 이벤트를 보냅니다.
+    같은 입력으로 생성 중인 보고서가 있으면 새로 만들지 않고, 끝날 때까지 기다렸다가 저장된 보고서를 보냅니다.
+    """
+    stock = await stock_info.get_stock_details_from_naver(stock_code)
+    if not stock:
+        raise HTTPException(status_code=404, detail="종목 정보를 찾을 수 없습니다.")
+    indicators = indicator_store.data
+    cached = await insight_cache.lookup(stock.name, indicators)
+
+    async def stored_events(response: InsightResponse):
+        yield sse_event("insight", response.model_dump())
+        report_text = await run_in_threadpool(insight_generator.load_report, response.report_id)
+        if report_text:
+            yield sse_event("token", {"text": report_text})
+        yield sse_event("done", {"report_id": response.report_id, "cached": True})
+
+    async def events():
+        if cached is not None:
+            async for event in stored_events(cached):
+                yield event
+            return
+
+        # 생성 등록은 응답을 실제로 보내기 시작할 때 합니다. (시작도 못 한 요청이 다른 요청을 붙잡지 않도록)
+        cache_key, pending = insight_cache.join_stream(stock.name, indicators)
+        if pending is not None:
+            response = await asyncio.shield(pending)
+            if response is None:
+                yield sse_event("error", {"detail": insight_generator.GPT_ERROR_REPORT})
+                return
+            async for event in stored_events(response):
+                yield event
+            return
+
+        response = None
+        try:
+            clova_conclusion, clova_reason = await insight_generator.get_clova_insight(stock.name, indicators)
+            report_id = insight_generator.new_report_id()
+            yield sse_event("insight", {"quick_insight": clova_conclusion, "report_id": report_id})
+
+            chunks = insight_generator.stream_report_to_store(
+                insight_generator.stream_gpt_report(stock.name, clova_conclusion, clova_reason), report_id
+            )
+            try:
+                async with aclosing(chunks):
+                    async for chunk in chunks:
+                        yield sse_event("token", {"text": chunk})
+            except Exception as e:
+                print(f"GPT Report Stream Error: {e}")
+                yield sse_event("error", {"detail": insight_generator.GPT_ERROR_REPORT})
+                return
+
+            response = InsightResponse(quick_insight=clova_conclusion, report_id=report_id)
+            if clova_conclusion != insight_generator.CLOVA_ERROR_CONCLUSION:
+                await insight_cache.store(stock.name, indicators, response)
+        finally:
+            # 중간에 실패하거나 클라이언트가 끊겨도 기다리던 요청들을 풀어 줍니다.
+            insight_cache.finish_stream(cache_key, response)
+        yield sse_event("done", {"report_id": report_id, "cached": False})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 @app.post("/api/chatbot/query")
-def handle_chatbot_query(query: ChatbotQuery):
-    answer = insight_generator.query_document_chatbot(
+async def handle_chatbot_query(query: ChatbotQuery):
+    answer = await insight_generator.query_document_chatbot(
         report_id=query.report_id,
         user_question=query.user_question
     )
     return {"answer": answer}
 
+@app.post("/api/chatbot/query/stream")
+async def stream_chatbot_query(query: ChatbotQuery):
+    """/api/chatbot/query 의 스트리밍(SSE) 버전입니다. 답변 토큰을 'token' 이벤트로 바로 흘려보냅니다."""
+    document_content = await run_in_threadpool(
+        insight_generator.load_chatbot_context, query.report_id, query.user_question
+    )
+    if document_content is None:
+        raise HTTPException(status_code=404, detail=insight_generator.REPORT_NOT_FOUND_ANSWER)
+
+    async def events():
+        chunks = insight_generator.stream_document_chatbot(document_content, query.user_question)
+        try:
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    yield sse_event("token", {"text": chunk})
+        except Exception as e:
+            print(f"Chatbot Stream Error: {e}")
+            yield sse_event("error", {"detail": "답변 생성 중 오류가 발생했습니다."})
+            return
+        yield sse_event("done", {"report_id": query.report_id})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 # app/main.py 파일에 새로운 API 추가
 
 @app.get("/api/stock/search-by-name/{stock_name}", response_model=StockDetail)
-def search_stock_details_by_name(stock_name: str, db: Session = Depends(get_db)):
+async def search_stock_details_by_name(stock_name: str):
     """
     종목명으로 상세 정보를 조회하고, 검색 기록을 DB에 남깁니다.
     """
-    # 1. 종목명으로 종목 코드 찾기
-    stock_code = stock_info.get_stock_code_by_name(stock_name)
+    # 1. 종목명으로 종목 코드 찾기 (메모리 종목 색인 → 없으면 DeepSearch)
+    stock_code = await stock_symbols.resolve(stock_name)
     if not stock_code:
         raise HTTPException(status_code=404, detail=f"'{stock_name}'에 해당하는 종목을 찾을 수 없습니다.")
 
     # 2. 찾은 코드로 기존의 상세 정보 조회 함수 호출
-    details = stock_info.get_stock_details_from_naver(stock_code)
+    details = await stock_info.get_stock_details_from_naver(stock_code)
     if not details:
         raise HTTPException(status_code=404, detail="종목 정보를 가져올 수 없습니다.")
     
-    # 3. 검색 기록 남기기
-    crud.insert_search_keyword(db=db, keyword=details.name)
+    # 3. 검색 기록 남기기 (버퍼 큐에 넣고 바로 응답)
+    search_log_writer.submit(details.name)
+
+    return details
 
-    return details
\ No newline at end of file
+@app.get("/api/stock/autocomplete", response_model=List[StockSuggestion])
+def autocomplete_stock_name(q: str, limit: int = 10):
+    """
+    종목명 자동완성. 메모리 종목 색인에서 정확히 일치 → 접두어 → 초성(예: ㅅㅅㅈㅈ) → 오타 허용 순으로 찾습니다.
+    """
+    limit = max(1, min(limit, settings.STOCK_AUTOCOMPLETE_MAX_LIMIT))
+    return [StockSuggestion(name=match.name, code=match.code, match=match.match) for match in stock_symbols.suggest(q, limit=limit)]
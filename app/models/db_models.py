@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import JSON, Column, Integer, String, DateTime, Index, func
 from app.database import Base
 
 class NewsArticle(Base):
@@ -7,13 +7,64 @@ class NewsArticle(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
     url = Column(String, unique=True)
-    published_at = Column(String)
-    source = Column(String, index=True)
-    click_count = Column(Integer, default=0)
+    published_at = Column(DateTime, nullable=False)
+    source = Column(String, nullable=False)
+    click_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # 소스별 최신순 목록 / 인기 기사 목록을 인덱스 범위 스캔으로 처리합니다.
+    # (id 는 같은 시각·같은 클릭 수 사이의 순서를 고정하는 키셋 페이지네이션용)
+    __table_args__ = (
+        Index("ix_news_articles_source_published_at", "source", published_at.desc(), id.desc()),
+        Index("ix_news_articles_click_count", click_count.desc(), id.desc()),
+    )
 
 class SearchLog(Base):
     __tablename__ = "search_logs"
 
     id = Column(Integer, primary_key=True, index=True)
     keyword = Column(String, index=True)
-    searched_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    searched_at = Column(DateTime, server_default=func.now())
+
+class InsightCacheEntry(Base):
+    __tablename__ = "insight_cache"
+
+    # 종목명 + 경제지표 스냅샷의 해시 (내용 기반 키)
+    cache_key = Column(String(64), primary_key=True)
+    stock_name = Column(String, nullable=False)
+    quick_insight = Column(String, nullable=False)
+    report_id = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=False, index=True)
+
+class IndicatorSnapshot(Base):
+    __tablename__ = "indicator_snapshots"
+
+    # 저장할 때마다 1씩 증가하는 스냅샷 버전
+    version = Column(Integer, primary_key=True, autoincrement=True)
+    data = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_leases"
+
+    # 리스 이름 (예: "scheduler"), 현재 보유 프로세스, 만료 시각(UTC)
+    name = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+class PromotedTheme(Base):
+    __tablename__ = "promoted_themes"
+
+    # 요청이 많아 정기 수집 대상으로 승격된 테마. last_promoted_at 이 오래되면 수집 대상에서 빠집니다.
+    # promotions: 승격 기준을 넘긴 구간 수 (꾸준히 인기 있는 테마가 먼저 수집 대상이 됩니다)
+    theme = Column(String, primary_key=True)
+    promotions = Column(Integer, nullable=False, default=1)
+    promoted_at = Column(DateTime, nullable=False)
+    last_promoted_at = Column(DateTime, nullable=False, index=True)
+
+class StockInfo(Base):
+    __tablename__ = "stock_info"
+
+    # 종목명 ↔ 종목 코드 (KRX 상장 목록). 메모리 종목 색인의 원본입니다.
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, unique=True)
+    code = Column(String(20), unique=True)
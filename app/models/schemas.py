@@ -1,16 +1,42 @@
-from pydantic import BaseModel
+from datetime import datetime, timezone
+from pydantic import BaseModel, field_validator
 from typing import List, Optional
 
+def parse_published_at(value) -> Optional[datetime]:
+    """외부 API 의 발행 시각 문자열을 datetime 으로 바꿉니다. 시간대가 있으면 UTC 기준 naive 로 맞추고, 빈 값/형식 오류는 None."""
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
 class NewsArticle(BaseModel):
     id: int
     title: str
     url: str
-    published_at: str
+    published_at: Optional[datetime] = None
     click_count: int
 
+    @field_validator("published_at", mode="before")
+    @classmethod
+    def _parse_published_at(cls, value):
+        return parse_published_at(value)
+
     class Config:
         from_attributes = True
 
+class NewsFeedPage(BaseModel):
+    items: List[NewsArticle]
+    # 다음 페이지 요청 시 cursor 로 넘길 값 (마지막 페이지면 None)
+    next_cursor: Optional[str] = None
+
 class StockDetail(BaseModel):
     code: str
     name: str
@@ -19,6 +45,20 @@ class StockDetail(BaseModel):
     per: str
     pbr: str
 
+class StockSuggestion(BaseModel):
+    name: str
+    code: str
+    # 일치 방식: exact / code / prefix / chosung / fuzzy
+    match: str
+
+class StockBatchQuery(BaseModel):
+    codes: List[str]
+
+class StockBatchItem(BaseModel):
+    code: str
+    detail: Optional[StockDetail] = None
+    error: Optional[str] = None
+
 class TopKeyword(BaseModel):
     keyword: str
     count: int
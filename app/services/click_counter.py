@@ -0,0 +1,94 @@
+import threading
+
+from app import crud
+from app.config import settings
+from app.database import SessionLocal
+
+class ClickAggregator:
+    """
+    기사 클릭 수를 메모리에 모아 두었다가 주기적으로 한 번에 DB 에 반영하는 write-behind 카운터입니다.
+    클릭 기록은 dict 증가 연산(O(1))만 수행하므로 요청마다 DB 쓰기 잠금을 잡지 않습니다.
+    """
+
+    # 존재가 확인된 기사 ID 캐시의 최대 크기
+    MAX_KNOWN_IDS = 100_000
+
+    def __init__(self, session_factory=SessionLocal, sync_flush: bool = False):
+        self.session_factory = session_factory
+        # True 이면 클릭마다 즉시 DB 에 반영합니다. (테스트용)
+        self.sync_flush = sync_flush
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[int, int] = {}
+        # flush 중인(아직 커밋되지 않은) 클릭. 인기 기사 조회 시 함께 합산합니다.
+        self._flushing: dict[int, int] = {}
+        self._known_ids: set[int] = set()
+        self.flushed_clicks = 0
+        self.flush_count = 0
+
+    def article_exists(self, db, article_id: int) -> bool:
+        """기사 존재 여부를 확인합니다. 한 번 확인된 ID 는 메모리에서 바로 응답합니다."""
+        if article_id in self._known_ids:
+            return True
+        if not crud.article_exists(db, article_id):
+            return False
+        if len(self._known_ids) >= self.MAX_KNOWN_IDS:
+            self._known_ids.clear()
+        self._known_ids.add(article_id)
+        return True
+
+    def record(self, article_id: int):
+        """클릭 1회를 기록합니다."""
+        with self._lock:
+            self._pending[article_id] = self._pending.get(article_id, 0) + 1
+        if self.sync_flush:
+            self.flush()
+
+    def pending_deltas(self) -> dict[int, int]:
+        """아직 DB 에 반영되지 않은 기사별 클릭 수를 반환합니다."""
+        with self._lock:
+            deltas = dict(self._flushing)
+            for article_id, delta in self._pending.items():
+                deltas[article_id] = deltas.get(article_id, 0) + delta
+        return deltas
+
+    def flush(self) -> int:
+        """모아 둔 클릭 수를 한 번의 일괄 UPDATE 로 DB 에 반영하고, 반영한 클릭 수를 반환합니다."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                deltas, self._pending = self._pending, {}
+                self._flushing = deltas
+
+            db = self.session_factory()
+            try:
+                crud.apply_click_deltas(db, deltas)
+            except Exception as e:
+                # 실패한 클릭은 다음 flush 때 다시 반영되도록 되돌려 놓습니다.
+                db.rollback()
+                with self._lock:
+                    for article_id, delta in deltas.items():
+                        self._pending[article_id] = self._pending.get(article_id, 0) + delta
+                print(f"Click flush failed: {e}")
+                return 0
+            finally:
+                with self._lock:
+                    self._flushing = {}
+                db.close()
+
+            flushed = sum(deltas.values())
+            self.flushed_clicks += flushed
+            self.flush_count += 1
+            return flushed
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = sum(self._pending.values())
+        return {
+            "pending_clicks": pending,
+            "flushed_clicks": self.flushed_clicks,
+            "flush_count": self.flush_count,
+        }
+
+click_counter = ClickAggregator(sync_flush=settings.CLICK_SYNC_FLUSH)
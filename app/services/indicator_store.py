@@ -0,0 +1,87 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from app import crud
+from app.config import settings
+from app.database import ReadSessionLocal, SessionLocal
+
+class Snapshot(NamedTuple):
+    version: int | None
+    data: dict
+    created_at: datetime | None
+
+EMPTY_SNAPSHOT = Snapshot(version=None, data={}, created_at=None)
+
+class IndicatorStore:
+    """
+    경제지표를 DB 에 버전별 스냅샷으로 저장하고, 프로세스마다 최신 스냅샷을 메모리에 들고 있는 저장소입니다.
+    - 읽기: 메모리의 현재 스냅샷 참조만 반환 (잠금 없음). 반환된 data 는 수정하지 않습니다.
+    - 갱신: 새 버전을 DB 에 저장한 뒤 메모리 스냅샷을 통째로 교체합니다.
+    - 다른 워커가 저장한 버전은 refresh_if_changed() 가 버전 번호만 비교해서 가져옵니다.
+    """
+
+    def __init__(self, session_factory=SessionLocal, read_session_factory=ReadSessionLocal, keep: int = 100):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.keep = keep
+        self._current = EMPTY_SNAPSHOT
+        self._publish_lock = threading.Lock()
+        self.reloads = 0
+        self.publishes = 0
+
+    @property
+    def current(self) -> Snapshot:
+        return self._current
+
+    @property
+    def data(self) -> dict:
+        return self._current.data
+
+    def is_stale(self, max_age: float) -> bool:
+        created_at = self._current.created_at
+        if created_at is None:
+            return True
+        return datetime.now(timezone.utc).replace(tzinfo=None) - created_at > timedelta(seconds=max_age)
+
+    def refresh_if_changed(self) -> bool:
+        """DB 의 최신 버전이 메모리와 다르면 스냅샷을 다시 읽습니다. 바뀌었으면 True."""
+        db = self.read_session_factory()
+        try:
+            latest_version = crud.get_latest_indicator_version(db)
+            if latest_version is None or latest_version == self._current.version:
+                return False
+            row = crud.get_latest_indicator_snapshot(db)
+            if row is None:
+                return False
+            self._current = Snapshot(row.version, dict(row.data), row.created_at)
+            self.reloads += 1
+            return True
+        finally:
+            db.close()
+
+    def publish(self, updates: dict) -> Snapshot:
+        """현재 스냅샷에 updates 를 합친 새 버전을 저장하고 메모리 스냅샷을 교체합니다."""
+        with self._publish_lock:
+            # 다른 워커가 먼저 저장한 값 위에 합치도록 최신 버전을 먼저 가져옵니다.
+            self.refresh_if_changed()
+            data = {**self._current.data, **updates}
+            db = self.session_factory()
+            try:
+                row = crud.save_indicator_snapshot(db, data, keep=self.keep)
+                snapshot = Snapshot(row.version, dict(row.data), row.created_at)
+            finally:
+                db.close()
+            self._current = snapshot
+            self.publishes += 1
+            return snapshot
+
+    def stats(self) -> dict:
+        return {
+            "version": self._current.version,
+            "created_at": self._current.created_at.isoformat() if self._current.created_at else None,
+            "reloads": self.reloads,
+            "publishes": self.publishes,
+        }
+
+indicator_store = IndicatorStore(keep=settings.INDICATOR_SNAPSHOT_KEEP)
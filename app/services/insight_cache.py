@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from fastapi.concurrency import run_in_threadpool
+
+from app import crud
+from app.config import settings
+from app.core.cache import AsyncTTLCache
+from app.database import ReadSessionLocal, SessionLocal
+from app.models.schemas import InsightResponse
+
+def insight_fingerprint(stock_name: str, indicators: dict) -> str:
+    """종목명 + 경제지표 스냅샷으로 만든 내용 기반 캐시 키 (sha256)."""
+    payload = json.dumps(
+        {"stock_name": stock_name, "indicators": indicators},
+        ensure_ascii=False, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class InsightCache:
+    """
+    AI 인사이트 결과 캐시입니다.
+    - 메모리: LRU + TTL, 같은 키의 동시 miss 는 파이프라인 1회 실행을 함께 기다립니다.
+    - DB(insight_cache 테이블): 재시작 후에도 같은 입력이면 기존 report_id 를 바로 돌려줍니다.
+    - 스트리밍 API: 같은 입력으로 생성 중인 보고서가 있으면 새로 만들지 않고 그 결과를 함께 기다립니다. (join_stream)
+    """
+
+    def __init__(self, session_factory=SessionLocal, read_session_factory=ReadSessionLocal, ttl: float = 86400, maxsize: int = 1024):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.ttl = ttl
+        self._memory = AsyncTTLCache(ttl=ttl, maxsize=maxsize)
+        # 캐시 키 → 생성 중인 스트리밍 보고서의 결과 (실패하면 None)
+        self._streams: dict[str, asyncio.Future] = {}
+        self.persistent_hits = 0
+        self.pipeline_runs = 0
+        self.coalesced_streams = 0
+
+    async def get_or_create(
+        self,
+        stock_name: str,
+        indicators: dict,
+        pipeline: Callable[[], Awaitable[tuple[InsightResponse, bool]]],
+    ) -> InsightResponse:
+        """캐시된 인사이트가 있으면 바로 반환하고, 없으면 pipeline 을 실행해 결과를 저장합니다."""
+        cache_key = insight_fingerprint(stock_name, indicators)
+
+        async def load() -> tuple[InsightResponse, bool]:
+            cached = await run_in_threadpool(self._load_persisted, cache_key)
+            if cached is not None:
+                self.persistent_hits += 1
+                return cached, True
+            self.pipeline_runs += 1
+            response, cacheable = await pipeline()
+            if cacheable:
+                await run_in_threadpool(self._persist, cache_key, stock_name, response)
+            return response, cacheable
+
+        response, _ = await self._memory.get_or_load(cache_key, load, should_cache=lambda result: result[1])
+        return response
+
+    async def lookup(self, stock_name: str, indicators: dict) -> InsightResponse | None:
+        """파이프라인을 실행하지 않고 캐시(메모리 → DB)만 조회합니다. (스트리밍 API 용)"""
+        cache_key = insight_fingerprint(stock_name, indicators)
+        cached = self._memory.get(cache_key)
+        if cached is not None:
+            self._memory.hits += 1
+            return cached[0]
+        response = await run_in_threadpool(self._load_persisted, cache_key)
+        if response is not None:
+            self.persistent_hits += 1
+            self._memory.set(cache_key, (response, True))
+        return response
+
+    async def store(self, stock_name: str, indicators: dict, response: InsightResponse):
+        """다른 경로(스트리밍 API)에서 만든 인사이트 결과를 캐시에 저장합니다."""
+        cache_key = insight_fingerprint(stock_name, indicators)
+        self._memory.set(cache_key, (response, True))
+        await run_in_threadpool(self._persist, cache_key, stock_name, response)
+
+    def join_stream(self, stock_name: str, indicators: dict) -> tuple[str, asyncio.Future | None]:
+        """
+        (캐시 키, 진행 중인 생성의 Future) 를 반환합니다.
+        같은 입력으로 생성 중인 스트림이 없으면 Future 는 None 이고, 호출한 쪽이 생성을 맡아 끝나면 finish_stream 을 호출해야 합니다.
+        """
+        cache_key = insight_fingerprint(stock_name, indicators)
+        future = self._streams.get(cache_key)
+        if future is not None:
+            self.coalesced_streams += 1
+            return cache_key, future
+        self._streams[cache_key] = asyncio.get_running_loop().create_future()
+        return cache_key, None
+
+    def finish_stream(self, cache_key: str, response: InsightResponse | None):
+        """join_stream 으로 맡은 생성이 끝났음을 알리고, 기다리던 요청들에 결과(실패 시 None)를 넘깁니다."""
+        future = self._streams.pop(cache_key, None)
+        if future is not None and not future.done():
+            future.set_result(response)
+
+    def _load_persisted(self, cache_key: str) -> InsightResponse | None:
+        db = self.read_session_factory()
+        try:
+            entry = crud.get_cached_insight(db, cache_key, datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.ttl))
+            if entry is None:
+                return None
+            return InsightResponse(quick_insight=entry.quick_insight, report_id=entry.report_id)
+        finally:
+            db.close()
+
+    def _persist(self, cache_key: str, stock_name: str, response: InsightResponse):
+        db = self.session_factory()
+        try:
+            crud.save_cached_insight(
+                db, cache_key, stock_name, response.quick_insight, response.report_id,
+                expired_before=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=self.ttl),
+            )
+        except Exception as e:
+            db.rollback()
+            print(f"Insight cache persist failed: {e}")
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        return {
+            **self._memory.stats(),
+            "persistent_hits": self.persistent_hits,
+            "pipeline_runs": self.pipeline_runs,
+            "coalesced_streams": self.coalesced_streams,
+        }
+
+insight_cache = InsightCache(ttl=settings.INSIGHT_CACHE_TTL, maxsize=settings.INSIGHT_CACHE_MAX_ENTRIES)
@@ -0,0 +1,172 @@
+import heapq
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Iterable
+
+from app.config import settings
+
+class SlidingWindowTopK:
+    """
+    최근 window_seconds 동안의 검색어 빈도를 시간 버킷 단위로 집계하고, 상위 K 개를 항상 유지하는 구조입니다.
+    - 검색어 기록: 보통 O(1) (상위 K 안 위치를 색인으로 찾고, 순위가 바뀐 만큼만 자리를 옮깁니다. 최악 O(K))
+    - 상위 검색어 조회: O(limit)
+    - 버킷 만료 시에만 전체 집계에서 상위 K 를 다시 계산합니다.
+    """
+
+    def __init__(self, window_seconds: int = 86400, bucket_seconds: int = 300, k: int = 50):
+        self.window_seconds = window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.k = k
+        self._lock = threading.Lock()
+        # 상위 K 목록이 바뀔 때마다 증가합니다. (응답 캐시가 DB 조회 없이 최신 여부를 판단하는 데 사용)
+        self.version = 0
+        # begin_rebuild 시각 이후에 record 된 (검색어, 시각). rebuild 가 교체할 때 새 집계에 다시 더합니다. (rebuild 중이 아니면 None)
+        self._replay: list[tuple[str, float]] | None = None
+        self._replay_since = 0.0
+        self._reset()
+
+    def _reset(self):
+        # (버킷 시작 시각, {검색어: 횟수}) 를 오래된 순서로 보관
+        self._buckets: deque[tuple[int, dict[str, int]]] = deque()
+        self._totals: dict[str, int] = {}
+        # 상위 K 개 (검색어, 횟수) 를 횟수 내림차순으로 유지하고, 검색어 → _top 안 위치 색인을 함께 둡니다.
+        self._top: list[tuple[str, int]] = []
+        self._top_index: dict[str, int] = {}
+
+    def _bucket_start(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def _expire(self, now: float):
+        cutoff = self._bucket_start(now) - self.window_seconds + self.bucket_seconds
+        expired = False
+        while self._buckets and self._buckets[0][0] < cutoff:
+            _, counts = self._buckets.popleft()
+            for keyword, count in counts.items():
+                remaining = self._totals[keyword] - count
+                if remaining > 0:
+                    self._totals[keyword] = remaining
+                else:
+                    del self._totals[keyword]
+            expired = True
+        if expired:
+            self._recompute_top()
+
+    def _recompute_top(self):
+        self._set_top(heapq.nlargest(self.k, self._totals.items(), key=lambda item: item[1]))
+
+    def _set_top(self, top: list[tuple[str, int]]):
+        self._top = top
+        self._top_index = {keyword: index for index, (keyword, _) in enumerate(top)}
+        self.version += 1
+
+    def _add(self, keyword: str, timestamp: float, count: int = 1):
+        bucket_start = self._bucket_start(timestamp)
+        if not self._buckets or self._buckets[-1][0] < bucket_start:
+            self._buckets.append((bucket_start, {}))
+        # 시각이 약간 늦게 도착한 기록은 가장 최근 버킷에 합산합니다.
+        counts = self._buckets[-1][1]
+        counts[keyword] = counts.get(keyword, 0) + count
+        total = self._totals.get(keyword, 0) + count
+        self._totals[keyword] = total
+        self._update_top(keyword, total)
+
+    def _update_top(self, keyword: str, total: int):
+        top, positions = self._top, self._top_index
+        index = positions.get(keyword)
+        if index is not None:
+            top[index] = (keyword, total)
+        elif len(top) < self.k:
+            index = len(top)
+            top.append((keyword, total))
+            positions[keyword] = index
+        elif total > top[-1][1]:
+            index = len(top) - 1
+            del positions[top[index][0]]
+            top[index] = (keyword, total)
+            positions[keyword] = index
+        else:
+            return
+        self.version += 1
+        # 횟수가 늘었으므로 앞쪽으로만 이동하면 됩니다.
+        while index > 0 and top[index - 1][1] < total:
+            top[index - 1], top[index] = top[index], top[index - 1]
+            positions[top[index][0]] = index
+            index -= 1
+        positions[keyword] = index
+
+    def record(self, keyword: str, timestamp: float | None = None):
+        """검색어 1회를 기록합니다."""
+        now = time.time()
+        timestamp = now if timestamp is None else min(timestamp, now)
+        with self._lock:
+            self._expire(now)
+            self._add(keyword, timestamp)
+            if self._replay is not None and timestamp >= self._replay_since:
+                self._replay.append((keyword, timestamp))
+
+    def top(self, limit: int = 10) -> list[tuple[str, int]]:
+        """최근 윈도우 동안 가장 많이 검색된 (검색어, 횟수) 상위 limit 개를 반환합니다."""
+        with self._lock:
+            self._expire(time.time())
+            return list(self._top[:limit])
+
+    def begin_rebuild(self) -> datetime:
+        """
+        rebuild 할 로그를 읽기 전에 호출합니다. 반환한 시각(UTC 기준 naive datetime) 전의 로그만 rebuild 에 넘기면,
+        그 뒤에 record 된 검색어는 rebuild 가 교체할 때 다시 더하므로 빠지거나 두 번 세지 않습니다.
+        """
+        with self._lock:
+            self._replay_since = time.time()
+            self._replay = []
+        return datetime.fromtimestamp(self._replay_since, timezone.utc).replace(tzinfo=None)
+
+    def rebuild(self, logs: Iterable[tuple[str, datetime]]):
+        """
+        DB 의 검색 로그 (검색어, 검색 시각) 로 집계를 새로 만들고 원자적으로 교체합니다.
+        검색 시각은 UTC 기준 naive datetime (SQLite CURRENT_TIMESTAMP) 으로 간주합니다.
+        """
+        now = time.time()
+        cutoff = self._bucket_start(now) - self.window_seconds + self.bucket_seconds
+        buckets: dict[int, dict[str, int]] = {}
+        totals: dict[str, int] = {}
+        try:
+            for keyword, searched_at in logs:
+                if searched_at is None:
+                    continue
+                if searched_at.tzinfo is None:
+                    searched_at = searched_at.replace(tzinfo=timezone.utc)
+                bucket_start = self._bucket_start(min(searched_at.timestamp(), now))
+                if bucket_start < cutoff:
+                    continue
+                counts = buckets.setdefault(bucket_start, {})
+                counts[keyword] = counts.get(keyword, 0) + 1
+                totals[keyword] = totals.get(keyword, 0) + 1
+        except BaseException:
+            # 로그를 읽다 실패하면 기존 집계를 그대로 두고 다시 더할 기록만 버립니다.
+            with self._lock:
+                self._replay = None
+            raise
+        top = heapq.nlargest(self.k, totals.items(), key=lambda item: item[1])
+        with self._lock:
+            self._buckets = deque(sorted(buckets.items()))
+            self._totals = totals
+            self._set_top(top)
+            replay, self._replay = self._replay or [], None
+            for keyword, timestamp in replay:
+                self._add(keyword, timestamp)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "buckets": len(self._buckets),
+                "distinct_keywords": len(self._totals),
+                "total_searches": sum(self._totals.values()),
+            }
+
+keyword_ranking = SlidingWindowTopK(
+    window_seconds=settings.KEYWORD_RANKING_WINDOW_SECONDS,
+    bucket_seconds=settings.KEYWORD_RANKING_BUCKET_SECONDS,
+    k=settings.KEYWORD_RANKING_TOP_K,
+)
@@ -0,0 +1,107 @@
+import functools
+import os
+import socket
+import threading
+import time
+import uuid
+
+from app import crud
+from app.config import settings
+from app.database import SessionLocal
+
+def make_owner_id() -> str:
+    """리스 보유자 식별자 (호스트:PID:랜덤). 같은 PID 가 재사용되어도 겹치지 않습니다."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class LeaderLease:
+    """
+    DB 의 scheduler_leases 행 하나를 리스로 사용하는 리더 선출입니다.
+    - 모든 워커가 renew() 를 주기적으로 호출합니다. 리스가 비었거나 만료됐으면 가져오고, 내 것이면 연장합니다.
+    - 리더가 죽으면 연장이 멈추고, TTL 이 지난 뒤 다른 워커의 renew() 가 리스를 넘겨받습니다.
+    - is_leader 는 마지막으로 성공한 연장 시점 기준으로 판단합니다. (DB 장애로 연장하지 못하면 스스로 물러남)
+    """
+
+    def __init__(self, name: str = "scheduler", ttl: float = 30.0, session_factory=SessionLocal, owner: str | None = None):
+        self.name = name
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self.owner = owner or make_owner_id()
+        # 내가 가진 리스가 유효하다고 볼 수 있는 마지막 시각 (monotonic)
+        self._valid_until = 0.0
+        self._lock = threading.Lock()
+        self._on_elected = []
+        self.elections = 0
+        self.renew_failures = 0
+
+    @property
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._valid_until
+
+    def on_elected(self, callback):
+        """리더가 될 때마다 호출할 함수를 등록합니다. (예: 밀린 작업 즉시 실행)"""
+        self._on_elected.append(callback)
+
+    def renew(self) -> bool:
+        """리스 획득/연장을 시도하고 리더 여부를 반환합니다."""
+        with self._lock:
+            was_leader = self.is_leader
+            # DB 왕복 전에 시각을 재서, 리스 만료를 실제보다 늦게 판단하지 않도록 합니다.
+            started = time.monotonic()
+            db = self.session_factory()
+            try:
+                acquired = crud.try_acquire_lease(db, self.name, self.owner, self.ttl)
+            except Exception as e:
+                print(f"리더 리스 갱신 실패 ({self.name}): {e}")
+                self.renew_failures += 1
+                acquired = False
+            finally:
+                db.close()
+
+            if acquired:
+                self._valid_until = started + self.ttl
+            else:
+                self._valid_until = 0.0
+            if acquired and not was_leader:
+                self.elections += 1
+                print(f"스케줄러 리더로 선출되었습니다. ({self.name}, {self.owner})")
+            elif was_leader and not acquired:
+                print(f"스케줄러 리더 리스를 잃었습니다. ({self.name}, {self.owner})")
+
+        if acquired and not was_leader:
+            for callback in self._on_elected:
+                callback()
+        return acquired
+
+    def release(self):
+        """리스를 반납합니다. (정상 종료 시 다른 워커가 TTL 을 기다리지 않고 바로 넘겨받음)"""
+        with self._lock:
+            if not self.is_leader:
+                return
+            self._valid_until = 0.0
+            db = self.session_factory()
+            try:
+                crud.release_lease(db, self.name, self.owner)
+            except Exception as e:
+                print(f"리더 리스 반납 실패 ({self.name}): {e}")
+            finally:
+                db.close()
+
+    def leader_only(self, func):
+        """리더일 때만 func 를 실행하도록 감쌉니다. 리더가 아니면 건너뜁니다."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.is_leader:
+                return None
+            return func(*args, **kwargs)
+        return wrapper
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "owner": self.owner,
+            "is_leader": self.is_leader,
+            "elections": self.elections,
+            "renew_failures": self.renew_failures,
+        }
+
+scheduler_lease = LeaderLease(ttl=settings.LEADER_LEASE_TTL)
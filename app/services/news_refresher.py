@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from app import crud
+from app.core import http_client, news_fetcher
+from app.config import settings
+from app.database import ReadSessionLocal, SessionLocal
+
+# 스케줄러가 주기적으로 수집하는 주요 테마
+MAIN_THEMES = ["반도체", "2차전지", "인공지능"]
+
+class NewsRefresher:
+    """
+    거시 경제 뉴스와 주요 테마 뉴스를 한 번에 갱신합니다.
+    - 모든 출처를 하나의 커넥션 풀로 동시에 조회합니다. (느린 출처 하나가 나머지를 막지 않음)
+      전용 이벤트 루프와 HTTP 클라이언트를 실행 사이에도 유지하므로 다음 실행도 keep-alive 커넥션을 재사용합니다.
+    - 출처별 ETag/Last-Modified/기사 목록 지문을 기억해 두고, 바뀌지 않은 출처는 저장하지 않습니다.
+    - 새 기사는 모든 출처를 합쳐 한 트랜잭션으로 저장합니다.
+    - 주요 테마 외에, 요청이 많아 승격된 테마(promoted_themes)도 함께 수집합니다.
+    """
+
+    def __init__(self, session_factory=SessionLocal, read_session_factory=ReadSessionLocal, themes: list[str] = MAIN_THEMES, limit: int = 10):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.themes = list(themes)
+        self.limit = limit
+        # 출처별 조건부 요청 값. 저장이 성공한 뒤에만 갱신합니다. (실패하면 다음 실행에서 다시 받음)
+        self._validators: dict[str, dict] = {}
+        self._run_lock = threading.Lock()
+        # httpx.AsyncClient 는 처음 사용한 이벤트 루프에 묶이므로 루프도 함께 유지합니다. (close() 에서 정리)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        self.runs = 0
+        self.saved = 0
+        self.statuses: dict[str, int] = {}
+        self.last_run: dict | None = None
+
+    def run(self) -> dict:
+        """한 번 갱신하고 실행 측정값을 반환합니다. (스케줄러 스레드에서 호출)"""
+        with self._run_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(self._run_with_shared_client())
+
+    async def _run_with_shared_client(self) -> dict:
+        if self._client is None or self._client.is_closed:
+            self._client = http_client.create_async_client()
+        return await self.run_async(self._client)
+
+    def close(self):
+        """유지 중인 HTTP 커넥션과 이벤트 루프를 닫습니다. (앱 종료 시 호출)"""
+        with self._run_lock:
+            if self._loop is None:
+                return
+            if self._client is not None:
+                self._loop.run_until_complete(self._client.aclose())
+                self._client = None
+            self._loop.run_until_complete(self._loop.shutdown_default_executor())
+            self._loop.close()
+            self._loop = None
+
+    def promoted_themes(self) -> list[str]:
+        """최근 THEME_PROMOTE_IDLE 초 안에 승격된 테마 (주요 테마 제외)."""
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=settings.THEME_PROMOTE_IDLE)
+        db = self.read_session_factory()
+        try:
+            promoted = crud.get_promoted_themes(db, since, limit=settings.THEME_PROMOTE_MAX)
+        finally:
+            db.close()
+        return [theme for theme in promoted if theme not in self.themes]
+
+    async def run_async(self, client=None) -> dict:
+        started = time.perf_counter()
+        themes = self.themes + await asyncio.to_thread(self.promoted_themes)
+        themes_ms = (time.perf_counter() - started) * 1000
+        fetch_started = time.perf_counter()
+        results = await news_fetcher.fetch_news_feeds(themes, self.limit, self._validators, client=client)
+        fetch_ms = (time.perf_counter() - fetch_started) * 1000
+
+        batches = {result.source: result.articles for result in results if result.status == "updated"}
+        counts: dict[str, int] = {}
+        db_started = time.perf_counter()
+        if batches:
+            db = self.session_factory()
+            try:
+                counts = await asyncio.to_thread(crud.create_news_articles_bulk, db, batches)
+            finally:
+                db.close()
+        db_ms = (time.perf_counter() - db_started) * 1000
+
+        for result in results:
+            if result.validators is not None:
+                self._validators[result.source] = result.validators
+            self.statuses[result.status] = self.statuses.get(result.status, 0) + 1
+
+        metrics = {
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            "themes_ms": round(themes_ms, 2),
+            "fetch_ms": round(fetch_ms, 2),
+            "db_ms": round(db_ms, 2),
+            "saved": sum(counts.values()),
+            "sources": {
+                result.source: {
+                    "status": result.status,
+                    "elapsed_ms": round(result.elapsed_ms, 2),
+                    "fetched": len(result.articles),
+                    "saved": counts.get(result.source, 0),
+                }
+                for result in results
+            },
+        }
+        self.runs += 1
+        self.saved += metrics["saved"]
+        self.last_run = metrics
+        return metrics
+
+    def stats(self) -> dict:
+        return {"runs": self.runs, "saved": self.saved, "statuses": dict(self.statuses), "last_run": self.last_run}
+
+news_refresher = NewsRefresher()
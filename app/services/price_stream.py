@@ -0,0 +1,264 @@
+import asyncio
+import json
+import time
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from app.config import settings
+from app.core import stock_info
+
+class _Subscriber:
+    """
+    WebSocket 연결 하나의 구독 상태입니다.
+    보낼 메시지를 큐에 쌓지 않고 종목별로 합쳐 둡니다. (conflation)
+    - 느린 클라이언트가 밀려 있는 동안 같은 종목의 변경분이 여러 번 오면 하나로 합칩니다.
+    - 그래서 메모리는 구독 종목 수만큼만 쓰고, 클라이언트는 항상 최신 값을 받습니다.
+    - 오류 메시지도 같은 경로(send loop)로 보냅니다. 소켓에 쓰는 곳은 send loop 하나뿐입니다.
+    """
+
+    # 보내지 못하고 쌓인 오류 메시지 상한 (읽지 않는 클라이언트가 잘못된 메시지를 계속 보내도 메모리가 늘지 않도록)
+    max_pending_errors = 16
+
+    def __init__(self):
+        self.codes: set[str] = set()
+        # 종목 코드 → (메시지 종류, 필드). snapshot 위에 합쳐진 diff 는 snapshot 으로 남습니다.
+        self._pending: dict[str, tuple[str, dict]] = {}
+        self._errors: list[dict] = []
+        self._ready = asyncio.Event()
+
+    def push(self, code: str, kind: str, fields: dict) -> bool:
+        """보낼 변경분을 추가합니다. 아직 보내지 못한 같은 종목의 변경분과 합쳐졌으면 True."""
+        pending = self._pending.get(code)
+        self._ready.set()
+        if pending is None:
+            self._pending[code] = (kind, dict(fields))
+            return False
+        pending[1].update(fields)
+        if kind == "snapshot":
+            self._pending[code] = ("snapshot", pending[1])
+        return True
+
+    def push_error(self, message: dict):
+        if len(self._errors) < self.max_pending_errors:
+            self._errors.append(message)
+        self._ready.set()
+
+    def discard(self, code: str):
+        self._pending.pop(code, None)
+
+    async def next_batch(self) -> tuple[list[dict], dict[str, tuple[str, dict]]]:
+        """(오류 메시지 목록, 종목별 변경분) 을 기다렸다가 가져갑니다."""
+        await self._ready.wait()
+        self._ready.clear()
+        errors, self._errors = self._errors, []
+        batch, self._pending = self._pending, {}
+        return errors, batch
+
+class PriceStreamHub:
+    """
+    실시간 시세 구독(WebSocket)을 관리합니다.
+    - 구독자가 있는 종목마다 폴러(asyncio 태스크) 하나만 네이버 시세를 interval 주기로 조회합니다.
+      업스트림 호출 수는 연결 수가 아니라 구독 중인 서로 다른 종목 수에 비례합니다.
+    - 조회 결과는 REST 조회용 시세 캐시(quote_cache)에도 넣어 /api/stock/search 가 함께 씁니다.
+    - 처음 구독하면 현재 값 전체(snapshot)를, 이후에는 바뀐 필드만(diff) 모든 구독자에게 보냅니다.
+    - 전송이 send_timeout 안에 끝나지 않는 클라이언트는 연결을 끊습니다. 밀린 변경분은 종목별로 합쳐지므로 쌓이지 않습니다.
+    - 구독자가 모두 떠난 종목은 idle_timeout 동안 폴러를 유지했다가 멈춥니다. (바로 다시 구독하는 경우 대비)
+    """
+
+    def __init__(
+        self,
+        interval: float = 2.0,
+        idle_timeout: float = 30.0,
+        max_codes_per_client: int = 50,
+        max_codes: int = 1000,
+        send_timeout: float = 10.0,
+    ):
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.max_codes_per_client = max_codes_per_client
+        self.max_codes = max_codes
+        self.send_timeout = send_timeout
+        self._subscribers: dict[str, set[_Subscriber]] = {}
+        self._pollers: dict[str, asyncio.Task] = {}
+        self._latest: dict[str, dict] = {}
+        self._idle_since: dict[str, float] = {}
+        self.connections = 0
+        self.polls = 0
+        self.poll_errors = 0
+        self.messages_sent = 0
+        self.conflated = 0
+        self.slow_disconnects = 0
+        self.idle_stops = 0
+
+    # --- 구독 관리 ---
+    def subscribe(self, subscriber: _Subscriber, codes: list[str]) -> list[str]:
+        """codes 를 구독합니다. 한도를 넘어 구독하지 못한 코드 목록을 반환합니다."""
+        rejected = []
+        for code in codes:
+            if code in subscriber.codes:
+                continue
+            if len(subscriber.codes) >= self.max_codes_per_client or (code not in self._pollers and len(self._pollers) >= self.max_codes):
+                rejected.append(code)
+                continue
+            subscriber.codes.add(code)
+            self._subscribers.setdefault(code, set()).add(subscriber)
+            self._idle_since.pop(code, None)
+            if code in self._latest:
+                subscriber.push(code, "snapshot", self._latest[code])
+            if code not in self._pollers:
+                self._pollers[code] = asyncio.create_task(self._poll(code))
+        return rejected
+
+    def unsubscribe(self, subscriber: _Subscriber, codes: list[str]):
+        for code in codes:
+            if code not in subscriber.codes:
+                continue
+            subscriber.codes.discard(code)
+            subscriber.discard(code)
+            subscribers = self._subscribers.get(code)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[code]
+                    self._idle_since[code] = time.monotonic()
+
+    # --- 종목별 폴러 ---
+    async def _poll(self, code: str):
+        try:
+            while True:
+                idle_since = self._idle_since.get(code)
+                if idle_since is not None and time.monotonic() - idle_since >= self.idle_timeout:
+                    self.idle_stops += 1
+                    return
+                started = time.monotonic()
+                if code in self._subscribers:
+                    await self._poll_once(code)
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            self._pollers.pop(code, None)
+            self._latest.pop(code, None)
+            self._idle_since.pop(code, None)
+
+    async def _poll_once(self, code: str):
+        self.polls += 1
+        detail = await stock_info.fetch_stock_details(code)
+        if detail is None:
+            # 조회 실패 시 마지막 값을 유지하고 다음 주기에 다시 시도합니다.
+            self.poll_errors += 1
+            return
+        stock_info.quote_cache.set(code, detail)
+        current = detail.model_dump()
+        previous = self._latest.get(code)
+        self._latest[code] = current
+        if previous is None:
+            kind, fields = "snapshot", current
+        else:
+            kind, fields = "diff", {key: value for key, value in current.items() if previous.get(key) != value}
+            if not fields:
+                return
+        for subscriber in self._subscribers.get(code, ()):
+            if subscriber.push(code, kind, fields):
+                self.conflated += 1
+
+    # --- WebSocket 연결 ---
+    async def serve(self, websocket: WebSocket, codes: list[str]):
+        """
+        accept 된 WebSocket 연결 하나를 처리합니다. 연결이 끊길 때까지 반환하지 않습니다.
+        클라이언트 메시지: {"action": "subscribe" | "unsubscribe", "codes": ["005930", ...]}
+        서버 메시지: {"type": "snapshot" | "diff", "code": ..., "data": {...}}, {"type": "error", "detail": ..., "codes": [...]}
+        """
+        subscriber = _Subscriber()
+        self.connections += 1
+        sender = asyncio.create_task(self._send_loop(websocket, subscriber))
+        try:
+            self._handle(subscriber, "subscribe", codes)
+            receiver = asyncio.create_task(self._receive_loop(websocket, subscriber))
+            # 어느 한쪽이 끝나면(클라이언트 종료 / 느린 클라이언트 끊기) 연결을 정리합니다.
+            await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            receiver.cancel()
+        finally:
+            sender.cancel()
+            self.unsubscribe(subscriber, list(subscriber.codes))
+            self.connections -= 1
+
+    async def _receive_loop(self, websocket: WebSocket, subscriber: _Subscriber):
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                    action, codes = message["action"], message["codes"]
+                except (ValueError, KeyError, TypeError):
+                    self._send_error(subscriber, "메시지 형식은 {\"action\": \"subscribe\"|\"unsubscribe\", \"codes\": [...]} 입니다.")
+                    continue
+                self._handle(subscriber, action, codes)
+        except WebSocketDisconnect:
+            pass
+
+    def _handle(self, subscriber: _Subscriber, action: str, codes):
+        if not isinstance(codes, list) or not all(isinstance(code, str) and code.isalnum() and len(code) <= 12 for code in codes):
+            self._send_error(subscriber, "codes 는 종목 코드 문자열 목록이어야 합니다.")
+            return
+        if action == "subscribe":
+            rejected = self.subscribe(subscriber, list(dict.fromkeys(codes)))
+            if rejected:
+                self._send_error(subscriber, "구독 가능한 종목 수를 넘었습니다.", rejected)
+        elif action == "unsubscribe":
+            self.unsubscribe(subscriber, codes)
+        else:
+            self._send_error(subscriber, f"알 수 없는 action 입니다: {action}")
+
+    def _send_error(self, subscriber: _Subscriber, detail: str, codes: list[str] | None = None):
+        # 직접 보내지 않고 send loop 에 넘깁니다. (전송이 막힌 클라이언트는 send_timeout 으로 끊김)
+        message = {"type": "error", "detail": detail}
+        if codes:
+            message["codes"] = codes
+        subscriber.push_error(message)
+
+    async def _send_loop(self, websocket: WebSocket, subscriber: _Subscriber):
+        try:
+            while True:
+                errors, batch = await subscriber.next_batch()
+                for message in errors:
+                    await asyncio.wait_for(websocket.send_json(message), self.send_timeout)
+                for code, (kind, fields) in batch.items():
+                    await asyncio.wait_for(websocket.send_json({"type": kind, "code": code, "data": fields}), self.send_timeout)
+                    self.messages_sent += 1
+        except asyncio.TimeoutError:
+            # 소켓 버퍼가 차서 전송이 막힌 클라이언트 (1013: 잠시 후 다시 시도)
+            self.slow_disconnects += 1
+            try:
+                await asyncio.wait_for(websocket.close(code=1013), 1.0)
+            except Exception:
+                pass
+        except Exception:
+            # 이미 끊긴 연결에 보내려 한 경우. 정리는 serve 에서 합니다.
+            pass
+
+    async def close(self):
+        """앱 종료 시 모든 폴러를 멈춥니다."""
+        pollers = list(self._pollers.values())
+        for task in pollers:
+            task.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "codes": len(self._pollers),
+            "subscribed_codes": len(self._subscribers),
+            "subscriptions": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "polls": self.polls,
+            "poll_errors": self.poll_errors,
+            "messages_sent": self.messages_sent,
+            "conflated": self.conflated,
+            "slow_disconnects": self.slow_disconnects,
+            "idle_stops": self.idle_stops,
+        }
+
+price_stream = PriceStreamHub(
+    interval=settings.PRICE_STREAM_INTERVAL,
+    idle_timeout=settings.PRICE_STREAM_IDLE_TIMEOUT,
+    max_codes_per_client=settings.PRICE_STREAM_MAX_CODES_PER_CLIENT,
+    max_codes=settings.PRICE_STREAM_MAX_CODES,
+    send_timeout=settings.PRICE_STREAM_SEND_TIMEOUT,
+)
@@ -1,74 +1,140 @@
+from datetime import datetime, timedelta, timezone
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.core import news_fetcher
 from app.core import economic_indicator_fetcher # 👈 1. 경제 지표 fetcher import
-from app.database import SessionLocal
+from app.core.metrics import timed_job
+from app.core.response_cache import response_cache
+from app.database import SessionLocal, ReadSessionLocal
 from app import crud
-
-# --- 캐시 영역 ---
-# 2. 최신 경제 지표를 저장할 전역 변수(캐시) 생성
-indicator_cache = {}
+from app.config import settings
+from app.services.click_counter import click_counter
+from app.services.keyword_ranking import keyword_ranking
+from app.services.indicator_store import indicator_store
+from app.services.leader_election import scheduler_lease
+from app.services.news_refresher import news_refresher
+from app.services.search_log_writer import search_log_writer
+from app.services.stock_symbols import stock_symbols
 
 # --- 스케줄러 작업 정의 ---
-MAIN_THEMES = ["반도체", "2차전지", "인공지능"]
-
-def update_macro_news_job():
-    """거시 경제 뉴스를 DB에 업데이트하는 스케줄링 작업 (10분마다)."""
-    print("스케줄러 실행: 거시 경제 뉴스 DB 저장을 시작합니다.")
-    db = SessionLocal()
-    try:
-        latest_news = news_fetcher.get_trending_macro_topics(limit=10)
-        if latest_news:
-            count = crud.create_news_articles(db=db, articles=latest_news, source="macro")
-            print(f"성공: {count}개의 새로운 거시 경제 뉴스를 DB에 저장했습니다.")
-        else:
-            print("가져온 뉴스가 없습니다.")
-    finally:
-        db.close()
-
-def update_themed_news_job():
-    """주요 테마 뉴스를 DB에 업데이트하는 스케줄링 작업 (10분마다)."""
-    print("스케줄러 실행: 테마별 뉴스 DB 저장을 시작합니다.")
-    db = SessionLocal()
-    try:
-        for theme in MAIN_THEMES:
-            latest_news = news_fetcher.get_articles_by_theme(theme_name=theme, limit=10)
-            if latest_news:
-                count = crud.create_news_articles(db=db, articles=latest_news, source=theme)
-                print(f"성공: 테마 '{theme}'의 새로운 뉴스 {count}개를 DB에 저장했습니다.")
-    finally:
-        db.close()
+# 작업마다 실행 시간/결과가 /metrics 에 기록됩니다.
+@timed_job
+def refresh_news_job():
+    """거시 경제 뉴스와 주요 테마 뉴스를 동시에 가져와 한 번에 DB에 저장하는 스케줄링 작업 (10분마다)."""
+    print("스케줄러 실행: 거시 경제/테마별 뉴스 DB 저장을 시작합니다.")
+    metrics = news_refresher.run()
+    if metrics["saved"]:
+        # 저장 시 비워진 뉴스 응답을 바로 다시 만들어 둡니다. (첫 요청이 DB 조회를 기다리지 않도록)
+        response_cache.rebuild("news_macro")
+        response_cache.rebuild("news_popular")
+    statuses = ", ".join(f"{source}={item['status']}" for source, item in metrics["sources"].items())
+    print(f"성공: 새로운 뉴스 {metrics['saved']}개 저장 ({metrics['total_ms']}ms, 조회 {metrics['fetch_ms']}ms, 저장 {metrics['db_ms']}ms; {statuses})")
 
 # 👇 3. 매일 경제 지표를 업데이트하는 새로운 작업 함수 추가
+@timed_job(false_is_error=True)
 def update_economic_indicators_job():
-    """매일 한 번 최신 경제 지표를 FRED와 DeepSearch에서 가져와 캐시에 저장합니다."""
+    """매일 한 번 최신 경제 지표를 FRED와 DeepSearch에서 가져와 새 스냅샷으로 저장합니다."""
     print("스케줄러 실행: 일일 경제 지표 업데이트를 시작합니다.")
     us_indicators = economic_indicator_fetcher.get_us_economic_indicators()
     trade_news = news_fetcher.get_latest_trade_policy_news()
 
     if us_indicators:
-        indicator_cache.update(us_indicators)
-        indicator_cache['latest_trade_policy'] = trade_news
-        print(f"성공: 경제 지표 업데이트 완료. 데이터: {indicator_cache}")
+        snapshot = indicator_store.publish({**us_indicators, "latest_trade_policy": trade_news})
+        print(f"성공: 경제 지표 업데이트 완료. 버전 {snapshot.version}, 데이터: {snapshot.data}")
     else:
         print("실패: 경제 지표 업데이트 실패.")
+        return False
+
+@timed_job(false_is_error=True)
+def refresh_stock_symbols_job():
+    """매일 한 번 KRX 상장 종목 목록을 받아 DB 와 메모리 종목 색인을 교체합니다."""
+    print("스케줄러 실행: 종목 목록 갱신을 시작합니다.")
+    try:
+        stock_symbols.refresh_from_source()
+    except Exception as e:
+        print(f"실패: 종목 목록 갱신 실패: {e}")
+        return False
+
+@timed_job
+def rebuild_keyword_ranking_job():
+    """DB 의 검색 로그로 메모리 인기 검색어 집계를 다시 만들어 DB 와 맞춥니다. (시작 시 + 주기적)"""
+    db = ReadSessionLocal()
+    try:
+        # search_logs.searched_at 은 UTC 기준으로 저장됩니다. (SQLite CURRENT_TIMESTAMP)
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=keyword_ranking.window_seconds)
+        # until 이후의 검색은 메모리 기록에서 다시 더하므로, 그 전 로그만 읽습니다.
+        # 큐에 남아 있는 검색 로그를 먼저 저장해야 until 전 로그가 빠지지 않습니다.
+        until = keyword_ranking.begin_rebuild()
+        search_log_writer.flush()
+        keyword_ranking.rebuild(crud.iter_search_logs_since(db, since, until=until))
+        print(f"성공: 인기 검색어 집계 재구성 완료. {keyword_ranking.stats()}")
+    finally:
+        db.close()
 
 # --- 스케줄러 시작 함수 ---
+_scheduler = None
+
+def _leader_job(func):
+    """SCHEDULER_MODE 가 "leader" 이면 리더 프로세스에서만 실행되도록 감쌉니다."""
+    if settings.SCHEDULER_MODE == "leader":
+        return scheduler_lease.leader_only(func)
+    return func
+
+def _run_collect_jobs_now():
+    """뉴스/경제지표 수집 작업을 즉시 1회 실행합니다. (앱 시작 시, 또는 리더로 새로 선출됐을 때)"""
+    # 경제 지표는 저장된 스냅샷이 없거나 오래된 경우에만 다시 가져옵니다.
+    if indicator_store.is_stale(settings.INDICATOR_MAX_AGE):
+        _scheduler.add_job(_leader_job(update_economic_indicators_job))
+    _scheduler.add_job(_leader_job(refresh_news_job))
+    # 종목 목록이 아직 한 번도 저장되지 않았으면 바로 받아 옵니다.
+    if not len(stock_symbols.index):
+        _scheduler.add_job(_leader_job(refresh_stock_symbols_job))
+
 def start_scheduler():
     """스케줄러를 시작하고 모든 작업을 등록합니다."""
+    global _scheduler
     scheduler = BackgroundScheduler(daemon=True)
+    _scheduler = scheduler
     
-    # 작업 1: 거시경제 뉴스 업데이트 (10분 주기)
-    scheduler.add_job(update_macro_news_job, 'interval', seconds=600, id="macro_job")
-    
-    # 작업 2: 테마별 뉴스 업데이트 (10분 주기, 10초 딜레이)
-    scheduler.add_job(update_themed_news_job, 'interval', seconds=610, id="theme_job")
+    # 작업 1: 거시경제 + 테마별 뉴스 업데이트 (10분 주기, 모든 출처를 동시에 조회)
+    scheduler.add_job(_leader_job(refresh_news_job), 'interval', seconds=600, id="news_job")
     
-    # 👇 4. 작업 3: 경제 지표 업데이트 (매일 아침 8시)
-    scheduler.add_job(update_economic_indicators_job, 'cron', hour=8, id="indicator_job")
-    
-    # 앱 시작 시 모든 작업 즉시 1회 실행
-    scheduler.add_job(update_economic_indicators_job)
-    scheduler.add_job(update_macro_news_job)
-    scheduler.add_job(update_themed_news_job)
-    
-    scheduler.start()
\ No newline at end of file
+    # 👇 4. 작업 2: 경제 지표 업데이트 (매일 아침 8시)
+    scheduler.add_job(_leader_job(update_economic_indicators_job), 'cron', hour=8, id="indicator_job")
+
+    # 작업 3: 모아 둔 기사 클릭 수를 DB 에 일괄 반영
+    scheduler.add_job(timed_job(click_counter.flush, name="click_flush_job"), 'interval', seconds=settings.CLICK_FLUSH_INTERVAL, id="click_flush_job")
+
+    # 작업 4: 인기 검색어 메모리 집계를 DB 기준으로 재동기화
+    scheduler.add_job(rebuild_keyword_ranking_job, 'interval', seconds=settings.KEYWORD_RANKING_RECONCILE_INTERVAL, id="keyword_ranking_job")
+
+    # 작업 5: 다른 워커가 저장한 경제지표 스냅샷 반영 (버전 번호만 비교)
+    scheduler.add_job(timed_job(indicator_store.refresh_if_changed, name="indicator_refresh_job"), 'interval', seconds=settings.INDICATOR_REFRESH_INTERVAL, id="indicator_refresh_job")
+
+    # 작업 6: 종목 목록 갱신 (매일) / 다른 워커가 갱신한 종목 목록을 메모리 색인에 반영
+    scheduler.add_job(_leader_job(refresh_stock_symbols_job), 'cron', hour=settings.STOCK_SYMBOLS_REFRESH_HOUR, id="stock_symbols_job")
+    scheduler.add_job(timed_job(stock_symbols.load_from_db, name="stock_symbols_reload_job"), 'interval', seconds=settings.STOCK_SYMBOLS_RELOAD_INTERVAL, id="stock_symbols_reload_job")
+
+    # 마지막으로 저장된 경제지표 스냅샷과 종목 목록을 바로 메모리에 올립니다. (외부 API 호출 없이)
+    indicator_store.refresh_if_changed()
+    stock_symbols.load_from_db()
+
+    # 앱 시작 시 인기 검색어 집계는 프로세스마다 즉시 1회 재구성
+    scheduler.add_job(rebuild_keyword_ranking_job)
+
+    if settings.SCHEDULER_MODE == "leader":
+        # 작업 7: 리더 리스 획득/연장. 리더가 된 워커만 수집 작업을 즉시 1회 실행합니다. (장애 조치 포함)
+        scheduler_lease.on_elected(_run_collect_jobs_now)
+        scheduler.add_job(timed_job(scheduler_lease.renew, name="leader_lease_job"), 'interval', seconds=settings.LEADER_LEASE_RENEW_INTERVAL, id="leader_lease_job")
+        scheduler.start()
+        scheduler_lease.renew()
+    else:
+        _run_collect_jobs_now()
+        scheduler.start()
+
+def stop_scheduler():
+    """스케줄러를 멈추고, 리더였다면 리스를 반납합니다."""
+    if _scheduler is not None and _scheduler.running:
+        _scheduler.shutdown(wait=False)
+    news_refresher.close()
+    if settings.SCHEDULER_MODE == "leader":
+        scheduler_lease.release()
@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+from app import crud
+from app.config import settings
+from app.database import SessionLocal
+from app.services.keyword_ranking import keyword_ranking
+
+class SearchLogWriter:
+    """
+    검색 로그를 요청 경로에서 바로 저장하지 않고, 크기 제한이 있는 큐에 넣은 뒤
+    백그라운드 스레드가 일정 개수/시간마다 한 번에 INSERT 하는 버퍼 기록기입니다.
+    큐가 가득 차면 새 로그는 버리고 dropped 카운터만 올립니다. (요청은 절대 막지 않음)
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        max_queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[tuple[str, datetime]] = queue.Queue(maxsize=max_queue_size)
+        self._stop_event = threading.Event()
+        self._write_lock = threading.Lock()
+        self._dropped_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        # flush() 가 그 전에 큐에 들어간 로그(백그라운드 스레드가 모으는 중인 배치 포함)의 저장을 기다리는 데 씁니다.
+        self._done = threading.Condition()
+        self._queued = 0
+        self._finished = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def submit(self, keyword: str) -> bool:
+        """검색 로그 1건을 큐에 넣습니다. 큐가 가득 차 버려졌으면 False 를 반환합니다."""
+        # search_logs.searched_at 과 같은 기준(UTC)으로 요청 시점을 기록합니다.
+        now = time.time()
+        searched_at = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None)
+        # 인기 검색어 집계는 DB 저장과 상관없이 바로 반영합니다. (집계 재구성 시 로그와 같은 시각으로 비교)
+        keyword_ranking.record(keyword, now)
+        try:
+            self._queue.put_nowait((keyword, searched_at))
+            with self._done:
+                self._queued += 1
+            return True
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            return False
+
+    def start(self):
+        """백그라운드 기록 스레드를 시작합니다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="search-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """스레드를 멈추고 큐에 남은 로그를 모두 저장합니다. (앱 종료 시 호출)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def flush(self, timeout: float = 10.0) -> int:
+        """
+        큐에 쌓인 로그를 지금 바로 모두 저장하고, 저장한 개수를 반환합니다.
+        백그라운드 스레드가 이미 꺼내 모으고 있던 로그도 저장될 때까지 (최대 timeout 초) 기다립니다.
+        """
+        with self._done:
+            target = self._queued
+        total = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                break
+            total += self._write(batch)
+        with self._done:
+            self._done.wait_for(lambda: self._finished >= target, timeout)
+        return total
+
+    def _drain(self, limit: int) -> list[tuple[str, datetime]]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            # batch_size 만큼 모이거나 flush_interval 이 지나면 저장합니다.
+            while len(batch) < self.batch_size and not self._stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+                batch.extend(self._drain(self.batch_size - len(batch)))
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[tuple[str, datetime]]) -> int:
+        with self._write_lock:
+            db = self.session_factory()
+            try:
+                crud.insert_search_logs(db, batch)
+                self.written += len(batch)
+                self.batches += 1
+                return len(batch)
+            except Exception as e:
+                db.rollback()
+                self.failed += len(batch)
+                print(f"Search log batch insert failed ({len(batch)} rows): {e}")
+                return 0
+            finally:
+                db.close()
+                with self._done:
+                    self._finished += len(batch)
+                    self._done.notify_all()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+search_log_writer = SearchLogWriter(
+    max_queue_size=settings.SEARCH_LOG_QUEUE_SIZE,
+    batch_size=settings.SEARCH_LOG_BATCH_SIZE,
+    flush_interval=settings.SEARCH_LOG_FLUSH_INTERVAL,
+)
@@ -0,0 +1,136 @@
+import csv
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from fastapi.concurrency import run_in_threadpool
+
+from app import crud
+from app.config import settings
+from app.core import stock_info
+from app.core.symbol_index import EMPTY_INDEX, Match, SymbolIndex, normalize
+from app.database import ReadSessionLocal, SessionLocal
+
+def load_symbols_from_fdr() -> list[tuple[str, str]]:
+    """FinanceDataReader 로 KRX 상장 종목 목록(종목명, 종목 코드)을 받습니다."""
+    import FinanceDataReader as fdr
+
+    listing = fdr.StockListing("KRX")
+    return list(zip(listing["Name"].astype(str), listing["Code"].astype(str)))
+
+def load_symbols_from_csv(path: str) -> list[tuple[str, str]]:
+    """Code/Name 열(FinanceDataReader 저장 형식, 소문자도 허용)이 있는 CSV 에서 종목 목록을 읽습니다."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        return [
+            (row.get("Name") or row.get("name") or "", (row.get("Code") or row.get("code") or "").zfill(6))
+            for row in reader
+        ]
+
+class StockSymbolDirectory:
+    """
+    종목명 → 종목 코드 해석기입니다.
+    - stock_info 테이블의 종목 목록으로 메모리 색인(SymbolIndex)을 만들어 두고 요청은 색인에서 바로 응답합니다.
+    - 색인에 없는 이름만 DeepSearch 로 찾고, 찾은 결과는 별칭으로 기억합니다.
+    - 종목 목록은 FinanceDataReader(또는 CSV)에서 받아 DB 에 통째로 교체 저장합니다. (리더 워커의 정기 작업)
+    """
+
+    def __init__(self, session_factory=SessionLocal, read_session_factory=ReadSessionLocal, alias_cache_size: int = 4096):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.alias_cache_size = alias_cache_size
+        self._index = EMPTY_INDEX
+        self._aliases: OrderedDict[str, str] = OrderedDict()
+        self._refresh_lock = threading.Lock()
+        self.loaded_at: datetime | None = None
+        self.build_ms = 0.0
+        self.matches: dict[str, int] = {}
+        self.remote_lookups = 0
+        self.remote_misses = 0
+
+    @property
+    def index(self) -> SymbolIndex:
+        return self._index
+
+    def load_from_db(self) -> int:
+        """DB 의 종목 목록으로 색인을 새로 만들어 교체합니다. 종목 수를 반환합니다."""
+        db = self.read_session_factory()
+        try:
+            symbols = crud.get_stock_symbols(db)
+        finally:
+            db.close()
+        started = time.perf_counter()
+        index = SymbolIndex(symbols)
+        self.build_ms = round((time.perf_counter() - started) * 1000, 2)
+        self._index = index
+        self.loaded_at = datetime.now(timezone.utc)
+        return len(index)
+
+    def refresh_from_source(self, source: str | None = None) -> int:
+        """원본(FinanceDataReader/CSV)에서 종목 목록을 받아 DB 를 교체하고 색인을 다시 만듭니다."""
+        source = source or settings.STOCK_SYMBOLS_SOURCE
+        with self._refresh_lock:
+            if source == "csv":
+                symbols = load_symbols_from_csv(settings.STOCK_SYMBOLS_CSV)
+            else:
+                symbols = load_symbols_from_fdr()
+            if not symbols:
+                print("종목 목록을 받지 못해 기존 목록을 유지합니다.")
+                return len(self._index)
+            db = self.session_factory()
+            try:
+                saved = crud.replace_stock_symbols(db, symbols)
+            finally:
+                db.close()
+            self.load_from_db()
+            print(f"성공: 종목 목록 {saved}개 저장, 색인 {len(self._index)}개 ({source})")
+            return saved
+
+    def lookup(self, name: str) -> Match | None:
+        """색인(과 기억해 둔 별칭)에서만 찾습니다."""
+        match = self._index.resolve(name)
+        if match is None:
+            code = self._aliases.get(normalize(name))
+            if code is not None:
+                self._aliases.move_to_end(normalize(name))
+                match = Match(name, code, "alias", 1.0)
+        if match is not None:
+            self.matches[match.match] = self.matches.get(match.match, 0) + 1
+        return match
+
+    def remember(self, name: str, code: str):
+        key = normalize(name)
+        self._aliases[key] = code
+        self._aliases.move_to_end(key)
+        while len(self._aliases) > self.alias_cache_size:
+            self._aliases.popitem(last=False)
+
+    async def resolve(self, name: str) -> str | None:
+        """종목명을 종목 코드로 바꿉니다. 색인에 없으면 DeepSearch 를 조회합니다. (찾지 못하면 None)"""
+        match = self.lookup(name)
+        if match is not None:
+            return match.code
+        self.remote_lookups += 1
+        code = await run_in_threadpool(stock_info.get_stock_code_by_name, name)
+        if code:
+            self.remember(name, code)
+        else:
+            self.remote_misses += 1
+        return code
+
+    def suggest(self, query: str, limit: int = 10) -> list[Match]:
+        return self._index.suggest(query, limit=limit)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._index),
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+            "build_ms": self.build_ms,
+            "matches": dict(self.matches),
+            "aliases": len(self._aliases),
+            "remote_lookups": self.remote_lookups,
+            "remote_misses": self.remote_misses,
+        }
+
+stock_symbols = StockSymbolDirectory(alias_cache_size=settings.STOCK_SYMBOLS_ALIAS_CACHE_SIZE)
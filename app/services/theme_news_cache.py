@@ -0,0 +1,199 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+from app import crud
+from app.config import settings
+from app.core import http_client, news_fetcher
+from app.database import SessionLocal
+from app.models import schemas
+
+class _Entry(NamedTuple):
+    articles: List[schemas.NewsArticle]
+    fetched_at: float
+    validators: Optional[dict]
+
+class ThemeNewsCache:
+    """
+    주요 테마가 아닌 테마의 뉴스를 DeepSearch 에서 읽어 오는 read-through 캐시입니다.
+    - 신선(ttl 이내): 캐시에서 바로 응답
+    - 오래됨(ttl ~ ttl + stale_ttl): 옛 값을 바로 응답하고 백그라운드에서 조건부 요청으로 갱신 (stale-while-revalidate)
+    - 만료/없음: 조회를 기다린 뒤 응답. 같은 테마의 동시 요청은 조회 1번을 함께 기다립니다.
+    - 조회에 실패하면 남아 있는 옛 값으로 응답합니다. 테마 수는 maxsize 로 제한됩니다. (LRU)
+    - promote_window 초 안에 promote_threshold 번 요청된 테마는 정기 수집 대상(promoted_themes)으로 승격합니다.
+      기사가 하나 이상 나온 요청만 셉니다. (없는 테마/조회 실패로 승격되지 않도록)
+      요청 수와 승격 목록도 maxsize 개로 제한하고, 승격 목록은 promote_idle 초가 지나면 지웁니다.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        ttl: float = 300.0,
+        stale_ttl: float = 1800.0,
+        maxsize: int = 256,
+        limit: int = 5,
+        promote_threshold: int = 20,
+        promote_window: float = 3600.0,
+        promote_idle: float = 86400.0,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self.limit = limit
+        self.promote_threshold = promote_threshold
+        self.promote_window = promote_window
+        self.promote_idle = promote_idle
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        # 현재 승격 판단 구간의 테마별 요청 수 (LRU, 최대 maxsize 개)
+        self._window_started = time.monotonic()
+        self._request_counts: OrderedDict[str, int] = OrderedDict()
+        # 이 프로세스에서 승격한 테마 → 승격 시각 (최대 maxsize 개, promote_idle 초 뒤 만료)
+        self.promoted: OrderedDict[str, float] = OrderedDict()
+        self._background: set[asyncio.Future] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.errors = 0
+        self.stale_on_error = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, theme: str) -> Optional[List[schemas.NewsArticle]]:
+        """테마 기사 목록을 반환합니다. 캐시에도 없고 조회에도 실패하면 None."""
+        entry = self._entries.get(theme)
+        if entry is not None:
+            self._entries.move_to_end(theme)
+            age = time.monotonic() - entry.fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                self._record_request(theme, entry.articles)
+                return entry.articles
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if theme not in self._inflight:
+                    self.revalidations += 1
+                    self._start_load(theme)
+                self._record_request(theme, entry.articles)
+                return entry.articles
+
+        task = self._inflight.get(theme)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start_load(theme)
+        # 기다리던 요청 하나가 취소되어도 공유 중인 조회는 계속 진행되도록 shield 로 감쌉니다.
+        articles = await asyncio.shield(task)
+        self._record_request(theme, articles)
+        return articles
+
+    def _start_load(self, theme: str) -> asyncio.Task:
+        task = asyncio.ensure_future(self._load(theme))
+        self._inflight[theme] = task
+        return task
+
+    async def _load(self, theme: str) -> Optional[List[schemas.NewsArticle]]:
+        try:
+            entry = self._entries.get(theme)
+            result = await news_fetcher.fetch_theme_feed(
+                http_client.get_async_client(), theme, self.limit, entry.validators if entry else None,
+            )
+            if result.status == "error":
+                self.errors += 1
+                if entry is None:
+                    return None
+                # 옛 값을 계속 쓰되, 다음 요청에서 다시 조회하도록 시각은 갱신하지 않습니다.
+                self.stale_on_error += 1
+                return entry.articles
+            if result.status == "updated" or entry is None:
+                articles = result.articles
+            else:
+                self.not_modified += 1
+                articles = entry.articles
+            self._set(theme, _Entry(articles, time.monotonic(), result.validators))
+            return articles
+        finally:
+            self._inflight.pop(theme, None)
+
+    def _set(self, theme: str, entry: _Entry):
+        self._entries[theme] = entry
+        self._entries.move_to_end(theme)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, theme: str | None = None):
+        """테마 하나 또는 (theme=None 이면) 전체 항목을 삭제합니다."""
+        if theme is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(theme, None)
+
+    def _record_request(self, theme: str, articles: Optional[List[schemas.NewsArticle]]):
+        if not articles:
+            return
+        now = time.monotonic()
+        if now - self._window_started >= self.promote_window:
+            self._window_started = now
+            self._request_counts.clear()
+        count = self._request_counts.get(theme, 0) + 1
+        self._request_counts[theme] = count
+        self._request_counts.move_to_end(theme)
+        while len(self._request_counts) > self.maxsize:
+            self._request_counts.popitem(last=False)
+        # 구간마다 한 번만 승격(갱신)합니다. 승격된 테마가 계속 인기 있으면 승격 시각이 갱신되어 수집 대상에 남습니다.
+        if count == self.promote_threshold:
+            task = asyncio.ensure_future(asyncio.to_thread(self._promote, theme))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    def _promote(self, theme: str):
+        db = self.session_factory()
+        try:
+            crud.promote_theme(db, theme)
+        except Exception as e:
+            print(f"테마 승격 실패 ({theme}): {e}")
+            return
+        finally:
+            db.close()
+        now = time.monotonic()
+        while self.promoted and now - next(iter(self.promoted.values())) >= self.promote_idle:
+            self.promoted.popitem(last=False)
+        if theme not in self.promoted:
+            print(f"인기 테마 '{theme}' 를 정기 수집 대상에 추가했습니다.")
+        self.promoted[theme] = now
+        self.promoted.move_to_end(theme)
+        while len(self.promoted) > self.maxsize:
+            self.promoted.popitem(last=False)
+
+    def stats(self) -> dict:
+        requests = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "requests": requests,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.stale_hits) / requests, 4) if requests else None,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+            "stale_on_error": self.stale_on_error,
+            "promoted": sorted(self.promoted),
+        }
+
+theme_news_cache = ThemeNewsCache(
+    ttl=settings.THEME_CACHE_TTL,
+    stale_ttl=settings.THEME_CACHE_STALE_TTL,
+    maxsize=settings.THEME_CACHE_MAXSIZE,
+    promote_threshold=settings.THEME_PROMOTE_THRESHOLD,
+    promote_window=settings.THEME_PROMOTE_WINDOW,
+    promote_idle=settings.THEME_PROMOTE_IDLE,
+)
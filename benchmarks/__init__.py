@@ -0,0 +1,10 @@
+# 로컬 스텁 서버를 이용한 오프라인 벤치마크 모음입니다.
+# 실행 예: python -m benchmarks.bench_stock_quote
+import os
+
+# 벤치마크는 실제 외부 API 를 호출하지 않으므로, 필수 설정값에 더미 값을 채워 둡니다.
+# (이미 .env 나 환경 변수로 지정된 값은 그대로 사용합니다.)
+for _key in ("DEEPSEARCH_API_KEY", "NCP_API_KEY", "OPENAI_API_KEY", "FRED_API_KEY"):
+    os.environ.setdefault(_key, "benchmark-dummy-key")
+os.environ.setdefault("NCP_APIGW_URL", "http://127.0.0.1:9/v1")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench_app.db")
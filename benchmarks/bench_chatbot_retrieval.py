@@ -0,0 +1,139 @@
+"""
+문서 챗봇 벤치마크: 보고서 전체를 프롬프트에 넣는 기존 방식 vs BM25 상위 청크만 넣는 검색 방식.
+
+OpenAI 호환 스텁(HyperCLOVA X 대체)이 프롬프트 길이에 비례한 처리 지연을 흉내 내므로 네트워크 없이 실행됩니다.
+주제별 섹션으로 된 긴 합성 보고서를 임시 보고서 저장소에 넣고, 주제를 묻는 질문마다
+프롬프트 크기 / 전체 응답 시간 / 정답 섹션이 문맥에 포함됐는지(recall)를 측정합니다.
+실행: python -m benchmarks.bench_chatbot_retrieval --reports 5 --report-chars 20000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.fakes import FakeOpenAIServer
+from benchmarks.harness import latency_summary
+
+TOPICS = {
+    "금리": "미국 기준 금리는 {n}bp 인하 가능성이 거론되며 채권 금리가 하락했습니다.",
+    "환율": "원달러 환율은 {n}원 부근에서 등락하며 수출주에 우호적인 환경입니다.",
+    "반도체": "반도체 업황은 HBM 수요 증가로 재고가 {n}주 수준까지 줄었습니다.",
+    "관세": "관세 협상에서 우방국 대상 관세율이 {n}%로 조정될 가능성이 있습니다.",
+    "유가": "국제 유가는 배럴당 {n}달러로 정유 업종의 마진이 개선되었습니다.",
+    "고용": "미국 비농업 고용은 {n}만 명 증가해 시장 예상을 웃돌았습니다.",
+    "부동산": "국내 부동산 PF 부실 규모는 {n}조 원으로 건설주에 부담입니다.",
+    "배당": "배당 성향은 {n}% 수준으로 주주 환원 정책이 강화되고 있습니다.",
+}
+FILLER = [
+    "시장 참여자들은 향후 발표될 지표를 주시하고 있습니다.",
+    "단기적으로는 변동성이 확대될 수 있어 분할 매수 전략이 유효합니다.",
+    "과거 유사한 국면에서도 비슷한 흐름이 관찰되었습니다.",
+    "투자자는 리스크 관리에 유의해야 합니다.",
+]
+QUESTIONS = {
+    "금리": "금리 인하 가능성은 어느 정도인가요?",
+    "환율": "원달러 환율 수준은 어떤가요?",
+    "반도체": "반도체 재고는 얼마나 줄었나요?",
+    "관세": "우방국 관세율은 어떻게 조정되나요?",
+    "유가": "국제 유가는 얼마인가요?",
+    "고용": "비농업 고용은 몇 명 증가했나요?",
+    "부동산": "부동산 PF 부실 규모는?",
+    "배당": "배당 성향은 몇 퍼센트인가요?",
+}
+
+def synthetic_report(rng: random.Random, target_chars: int) -> tuple[str, dict[str, str]]:
+    """주제별 섹션으로 된 보고서와, 주제마다 정답 문장을 반환합니다."""
+    facts = {topic: template.format(n=rng.randint(10, 999)) for topic, template in TOPICS.items()}
+    section_chars = target_chars // len(TOPICS)
+    sections = []
+    for topic, fact in facts.items():
+        sentences = [f"{topic} 동향입니다."]
+        fact_at = rng.randint(1, 5)
+        while sum(len(s) + 1 for s in sentences) < section_chars:
+            if len(sentences) == fact_at:
+                sentences.append(fact)
+            sentences.append(rng.choice(FILLER))
+        if fact not in sentences:
+            sentences.append(fact)
+        sections.append(" ".join(sentences))
+    return "\n".join(sections), facts
+
+async def run_mode(insight_generator, llm: FakeOpenAIServer, cases, retrieval: bool) -> dict:
+    from app.config import settings
+
+    settings.CHATBOT_RETRIEVAL_ENABLED = retrieval
+    latencies, recalled = [], 0
+    llm.prompt_chars.clear()
+    for report_id, question, fact in cases:
+        started = time.perf_counter()
+        await insight_generator.query_document_chatbot(report_id, question)
+        latencies.append(time.perf_counter() - started)
+        context = await asyncio.to_thread(insight_generator.load_chatbot_context, report_id, question)
+        recalled += fact in context
+    return {
+        "prompt_chars_mean": round(statistics.fmean(llm.prompt_chars)),
+        "prompt_chars_max": max(llm.prompt_chars),
+        "latency": latency_summary(latencies),
+        "recall": round(recalled / len(cases), 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=5)
+    parser.add_argument("--report-chars", type=int, default=20_000)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="LLM 기본 지연(초)")
+    parser.add_argument("--prefill", type=float, default=0.05, help="프롬프트 1,000자당 추가 지연(초)")
+    args = parser.parse_args()
+
+    llm = FakeOpenAIServer(latency=args.llm_latency, prefill_delay_per_1k_chars=args.prefill, report_tokens=20).start()
+    tmp_dir = tempfile.TemporaryDirectory()
+    os.environ["NCP_APIGW_URL"] = llm.api_base_url
+    os.environ["REPORT_STORE_PATH"] = os.path.join(tmp_dir.name, "reports.db")
+
+    from app.core import insight_generator
+    from app.core.retrieval import report_retriever
+
+    rng = random.Random(7)
+    cases = []
+    for _ in range(args.reports):
+        text, facts = synthetic_report(rng, args.report_chars)
+        report_id = insight_generator.save_report(text)
+        for topic, question in QUESTIONS.items():
+            cases.append((report_id, question, facts[topic]))
+
+    # 색인 생성(콜드) / 캐시 조회(웜) 비용
+    report_id, question, _ = cases[0]
+    text = insight_generator.load_report(report_id)
+    started = time.perf_counter()
+    report_retriever.build_context(report_id, text, question)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    report_retriever.build_context(report_id, text, question)
+    warm = time.perf_counter() - started
+
+    async def run_all():
+        try:
+            return {
+                "full_report": await run_mode(insight_generator, llm, cases, retrieval=False),
+                "bm25_top_k": await run_mode(insight_generator, llm, cases, retrieval=True),
+            }
+        finally:
+            await insight_generator.close_clients()
+
+    try:
+        result = asyncio.run(run_all())
+    finally:
+        llm.stop()
+        tmp_dir.cleanup()
+
+    result["questions"] = len(cases)
+    result["index_build_ms"] = {"cold": round(cold * 1000, 2), "cached": round(warm * 1000, 3)}
+    result["retriever"] = report_retriever.stats()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+워커 콜드 스타트 벤치마크: `import app.main` 시간과 워커당 메모리(RSS).
+
+매 측정마다 새 파이썬 프로세스를 띄워 app.main 을 임포트합니다.
+자식 프로세스는 소켓 연결을 모두 막고(시도만 기록) 업스트림 주소도 닫힌 로컬 포트로 돌려 두므로
+네트워크 없이 실행되며, 임포트 중 외부 연결을 시도하면 실패로 표시합니다.
+확인 항목
+- 임포트 시간 / 임포트 직후 RSS, 임포트 중 연결 시도 수, DB 파일 생성 여부
+- 무거운 패키지(openai, fredapi, pandas)가 임포트 시점에 올라오지 않는지
+- 지연 생성으로 미뤄진 비용: 스키마 생성(init_db), LLM/FRED 클라이언트 첫 사용 시 시간과 RSS 증가
+실행: python -m benchmarks.bench_cold_start --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = r"""
+import json, os, socket, sys, time
+
+attempts = []
+def _blocked(*args, **kwargs):
+    attempts.append(repr(args[1:2] or args[:1]))
+    raise OSError("network disabled by bench_cold_start")
+socket.socket.connect = _blocked
+socket.socket.connect_ex = _blocked
+socket.create_connection = _blocked
+socket.getaddrinfo = _blocked
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+def timed(func):
+    started = time.perf_counter()
+    func()
+    return round((time.perf_counter() - started) * 1000, 1)
+
+base_rss = rss_mb()
+started = time.perf_counter()
+import app.main
+result = {
+    "import_ms": round((time.perf_counter() - started) * 1000, 1),
+    "rss_mb": round(rss_mb(), 1),
+    "interpreter_rss_mb": round(base_rss, 1),
+    "connect_attempts": list(attempts),
+    "db_created": os.path.exists(os.environ["BENCH_DB_PATH"]),
+    "heavy_modules": sorted(name for name in ("openai", "fredapi", "pandas") if name in sys.modules),
+}
+
+from app.core import economic_indicator_fetcher, insight_generator
+from app.database import init_db
+
+result["init_db_ms"] = timed(init_db)
+before = rss_mb()
+result["llm_clients_ms"] = timed(lambda: (insight_generator.get_clova_client(), insight_generator.get_gpt_client()))
+result["fred_client_ms"] = timed(economic_indicator_fetcher.get_fred_client)
+result["lazy_rss_mb"] = round(rss_mb() - before, 1)
+result["connect_attempts_total"] = len(attempts)
+print(json.dumps(result))
+"""
+
+def run_child(tmp_dir: str, index: int) -> dict:
+    db_path = os.path.join(tmp_dir, f"cold_{index}.db")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "BENCH_DB_PATH": db_path,
+        "FRED_STORE_DIR": os.path.join(tmp_dir, "fred"),
+        # 혹시 연결을 시도하더라도 외부로 나가지 않도록 닫힌 로컬 포트로 돌립니다.
+        "DEEPSEARCH_API_BASE_URL": "http://127.0.0.1:9",
+        "NAVER_STOCK_API_BASE_URL": "http://127.0.0.1:9",
+        "FRED_API_BASE_URL": "http://127.0.0.1:9/fred",
+        "OPENAI_BASE_URL": "http://127.0.0.1:9/v1",
+        "NCP_APIGW_URL": "http://127.0.0.1:9/v1",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, timeout=120,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 첫 실행은 .pyc 생성 등으로 느리므로 버립니다.
+        run_child(tmp_dir, -1)
+        runs = [run_child(tmp_dir, i) for i in range(args.runs)]
+
+    def median(key: str) -> float:
+        return round(statistics.median(run[key] for run in runs), 1)
+
+    result = {
+        "runs": args.runs,
+        "import_ms": {"median": median("import_ms"), "max": max(run["import_ms"] for run in runs)},
+        "rss_mb_after_import": median("rss_mb"),
+        "interpreter_rss_mb": median("interpreter_rss_mb"),
+        "connect_attempts_during_import": sorted({attempt for run in runs for attempt in run["connect_attempts"]}),
+        "db_created_at_import": any(run["db_created"] for run in runs),
+        "heavy_modules_at_import": runs[0]["heavy_modules"],
+        "deferred": {
+            "init_db_ms": median("init_db_ms"),
+            "llm_clients_first_use_ms": median("llm_clients_ms"),
+            "fred_client_first_use_ms": median("fred_client_ms"),
+            "rss_mb_added_on_first_use": median("lazy_rss_mb"),
+        },
+        "connect_attempts_total": max(run["connect_attempts_total"] for run in runs),
+    }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    assert not result["connect_attempts_during_import"], "app.main 임포트 중 네트워크 연결 시도"
+    assert not result["db_created_at_import"], "app.main 임포트 중 DB 파일 생성"
+    assert not result["heavy_modules_at_import"], "무거운 패키지가 임포트 시점에 로드됨"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+DB 동시성 벤치마크: 기존 엔진(SQLite 기본 설정, 단일 풀) vs 운영용 SQLite 프로필
+(WAL, synchronous=NORMAL, busy_timeout, mmap, 읽기/쓰기 풀 분리).
+
+임시 SQLite 파일에 기사를 채운 뒤, 여러 스레드가 동시에
+클릭 반영(기사 click_count UPDATE), 검색 로그 INSERT, 뉴스 피드 키셋 조회를 섞어서 실행합니다.
+실행: python -m benchmarks.bench_db_concurrency --seconds 10
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import Base, create_db_engine
+from app.models import db_models, schemas  # noqa: F401  (테이블 정의 로딩)
+from benchmarks.harness import latency_summary
+
+SOURCES = ["macro", "반도체", "2차전지", "인공지능"]
+
+def seed(url: str, rows: int):
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    rng = random.Random(3)
+    start = datetime(2025, 1, 1)
+    with Session() as db:
+        for source in SOURCES:
+            crud.create_news_articles(db, [
+                schemas.NewsArticle(
+                    id=0, title=f"{source} 기사 {i}", url=f"https://example.com/{source}/{i}",
+                    published_at=start + timedelta(seconds=rng.randrange(365 * 86400)), click_count=0,
+                )
+                for i in range(rows // len(SOURCES))
+            ], source)
+    engine.dispose()
+
+def run_profile(url: str, tuned: bool, args) -> dict:
+    if tuned:
+        write_factory = sessionmaker(bind=create_db_engine(url, tuned=True))
+        read_factory = sessionmaker(bind=create_db_engine(url, readonly=True, tuned=True))
+    else:
+        # 기존 app/database.py 와 같은 설정
+        write_factory = read_factory = sessionmaker(bind=create_engine(url, connect_args={"check_same_thread": False}))
+
+    latencies = {"click": [], "search_log": [], "feed": []}
+    errors = {name: 0 for name in latencies}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.seconds
+
+    def worker(kind: str, seed_value: int):
+        rng = random.Random(seed_value)
+        samples, failed = [], 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            db = (read_factory if kind == "feed" else write_factory)()
+            try:
+                if kind == "click":
+                    crud.apply_click_deltas(db, {rng.randint(1, args.rows): 1})
+                elif kind == "search_log":
+                    crud.insert_search_logs(db, [(f"종목{rng.randint(1, 500)}", datetime.now(timezone.utc).replace(tzinfo=None))])
+                else:
+                    page = crud.get_articles_by_source(db, rng.choice(SOURCES), limit=20)
+                    for _ in range(rng.randint(0, 5)):
+                        if len(page) < 20:
+                            break
+                        page = crud.get_articles_by_source(
+                            db, page[-1].source, limit=20, before=(page[-1].published_at, page[-1].id)
+                        )
+                samples.append(time.perf_counter() - started)
+            except OperationalError:
+                db.rollback()
+                failed += 1
+            finally:
+                db.close()
+        with lock:
+            latencies[kind].extend(samples)
+            errors[kind] += failed
+
+    threads = [
+        threading.Thread(target=worker, args=(kind, i * 100 + n))
+        for i, (kind, count) in enumerate((("click", args.click_threads), ("search_log", args.log_threads), ("feed", args.feed_threads)))
+        for n in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {
+        kind: {"ops_per_s": round(len(samples) / args.seconds, 1), "errors": errors[kind], **latency_summary(samples)}
+        for kind, samples in latencies.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--click-threads", type=int, default=4)
+    parser.add_argument("--log-threads", type=int, default=4)
+    parser.add_argument("--feed-threads", type=int, default=8)
+    args = parser.parse_args()
+
+    result = {"rows": args.rows, "seconds": args.seconds}
+    for name, tuned in (("default", False), ("tuned", True)):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            url = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+            seed(url, args.rows)
+            result[name] = run_profile(url, tuned, args)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
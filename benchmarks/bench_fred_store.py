@@ -0,0 +1,119 @@
+"""
+FRED 시계열 벤치마크/검증: 매번 전체 이력을 받는 기존 방식 vs 로컬 시계열 저장소 증분 갱신.
+
+로컬 FRED 스텁(FOMC 결정 이력을 본뜬 재현 데이터)을 fredapi 로 호출하므로 네트워크 없이 실행됩니다.
+하루씩 날짜를 넘기며 지표를 갱신해 전송된 관측 수/소요 시간을 비교하고,
+금리 변화·빅컷 탐지 결과가 기대값과 같은지 확인합니다.
+실행: python -m benchmarks.bench_fred_store --days 30
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+
+from benchmarks.fakes import FakeFredServer
+from benchmarks.harness import latency_summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30, help="하루씩 넘기며 갱신할 횟수")
+    parser.add_argument("--latency", type=float, default=0.0, help="FRED 요청당 지연(초)")
+    args = parser.parse_args()
+
+    server = FakeFredServer(until=date(2025, 6, 30), latency=args.latency).start()
+    tmp_dir = tempfile.TemporaryDirectory()
+    os.environ["FRED_API_BASE_URL"] = server.fred_api_base_url
+    os.environ["FRED_STORE_DIR"] = tmp_dir.name
+
+    from app.core import economic_indicator_fetcher as fetcher
+    from app.core.timeseries_store import SeriesHistory
+
+    def legacy_indicators():
+        # 기존 구현: 전체 이력을 받아 마지막 값만 사용
+        rate = fetcher.get_fred_client().get_series("DFF").iloc[-1]
+        gdp = fetcher.get_fred_client().get_series("A191RL1Q225SBEA").iloc[-1]
+        return {"current_us_interest_rate": f"{rate:.2f}%", "current_us_gdp_growth": f"{gdp:.2f}%"}
+
+    result = {}
+    try:
+        # 첫 실행: 저장소가 비어 있으므로 전체 이력을 받습니다.
+        started = time.perf_counter()
+        indicators = fetcher.get_us_economic_indicators()
+        result["initial_sync_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        result["initial_sync_observations"] = sum(count for _, _, count in server.observations_served)
+
+        # 기대값 확인: 0.4%p 이상 인하(2020-03 두 차례, 2024-09-19 빅컷)는 잡히고, 25bp 인하는 잡히지 않아야 합니다.
+        assert indicators["current_us_interest_rate"] == "4.33%", indicators
+        assert indicators["current_us_gdp_growth"] == "-0.50%", indicators
+        assert indicators["us_interest_rate_change_1y"] == "-1.00%p", indicators
+        rates = fetcher.series_store.load("DFF")
+        cuts = rates.detect_drops(threshold=0.4, window_days=7)
+        assert [(day.isoformat(), round(change, 2)) for day, change in cuts] == [
+            ("2020-03-04", -0.45), ("2020-03-16", -1.02), ("2024-09-19", -0.5),
+        ], cuts
+        result["indicators"] = indicators
+
+        legacy_samples, legacy_observations = [], []
+        store_samples, store_observations = [], []
+        for _ in range(args.days):
+            server.advance(1)
+            served_before = len(server.observations_served)
+            started = time.perf_counter()
+            legacy = legacy_indicators()
+            legacy_samples.append(time.perf_counter() - started)
+            legacy_observations.append(sum(count for _, _, count in server.observations_served[served_before:]))
+
+            served_before = len(server.observations_served)
+            started = time.perf_counter()
+            incremental = fetcher.get_us_economic_indicators()
+            store_samples.append(time.perf_counter() - started)
+            store_observations.append(sum(count for _, _, count in server.observations_served[served_before:]))
+            assert incremental["current_us_interest_rate"] == legacy["current_us_interest_rate"]
+
+        assert fetcher.series_store.load("DFF").last_date == server.until
+        # 새 관측이 없으면 0, 하루 지나면 일별 시계열(DFF)만 1 건
+        assert fetcher.update_fred_series() == {"DFF": 0, "A191RL1Q225SBEA": 0}
+        server.advance(1)
+        assert fetcher.update_fred_series()["DFF"] == 1
+        result["daily_update"] = {
+            "legacy_full_history": {
+                "observations_per_update": round(float(np.mean(legacy_observations)), 1),
+                **latency_summary(legacy_samples),
+            },
+            "incremental_store": {
+                "observations_per_update": round(float(np.mean(store_observations)), 1),
+                **latency_summary(store_samples),
+            },
+        }
+
+        # 벡터화 조회 비용 (50년치 일별 시계열 규모)
+        days = 365 * 50
+        history = SeriesHistory(
+            np.arange(np.datetime64("1975-01-01"), np.datetime64("1975-01-01") + days),
+            np.round(np.cumsum(np.random.default_rng(0).normal(0, 0.02, days)) + 5, 2),
+        )
+        timings = {}
+        for name, query in (
+            ("change_over_30d", lambda: history.change_over(30)),
+            ("changes_all_7d", lambda: history.changes(7)),
+            ("detect_drops", lambda: history.detect_drops(threshold=0.4, window_days=7)),
+        ):
+            samples = []
+            for _ in range(20):
+                started = time.perf_counter()
+                query()
+                samples.append(time.perf_counter() - started)
+            timings[name] = latency_summary(samples)
+        result["vectorized_queries_18k_obs"] = timings
+    finally:
+        server.stop()
+        tmp_dir.cleanup()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
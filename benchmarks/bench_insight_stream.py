@@ -0,0 +1,103 @@
+"""
+AI 인사이트/챗봇 첫 바이트 도착 시간(TTFB) 벤치마크: 기존 일괄 응답 API vs SSE 스트리밍 API.
+같은 종목 SSE 요청이 동시에 여러 개 오면 보고서를 한 번만 생성하는지도 확인합니다.
+
+로컬 네이버 스텁과 OpenAI 호환 스트리밍 스텁(HyperCLOVA X/GPT 대체)을 띄워 네트워크 없이 실행됩니다.
+실행: python -m benchmarks.bench_insight_stream --runs 5
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from benchmarks.fakes import FakeNaverStockServer, FakeOpenAIServer
+from benchmarks.harness import latency_summary, serve_app
+
+def measure(client: httpx.Client, method: str, url: str, **kwargs) -> tuple[float, float, str]:
+    """(첫 바이트까지 시간, 전체 응답 시간, 본문) 을 측정합니다."""
+    started = time.perf_counter()
+    first_byte = None
+    body = []
+    with client.stream(method, url, **kwargs) as response:
+        response.raise_for_status()
+        for chunk in response.iter_text():
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            body.append(chunk)
+    return first_byte or 0.0, time.perf_counter() - started, "".join(body)
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines.get("data", "{}"))))
+    return events
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="LLM 응답 시작까지 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="토큰 간 지연(초)")
+    parser.add_argument("--report-tokens", type=int, default=100)
+    parser.add_argument("--concurrent", type=int, default=8, help="같은 종목으로 동시에 보내는 SSE 요청 수")
+    args = parser.parse_args()
+
+    naver = FakeNaverStockServer().start()
+    llm = FakeOpenAIServer(latency=args.llm_latency, token_delay=args.token_delay, report_tokens=args.report_tokens).start()
+    os.environ["NAVER_STOCK_API_BASE_URL"] = naver.stock_api_base_url
+    os.environ["NCP_APIGW_URL"] = llm.api_base_url
+    os.environ["OPENAI_BASE_URL"] = llm.api_base_url
+    # 반복 실행 시 캐시가 끼어들지 않도록 매번 새 종목 코드를 사용합니다.
+    os.environ["INSIGHT_CACHE_TTL"] = "1"
+
+    results = {name: {"ttfb": [], "total": []} for name in ("insight_blocking", "insight_sse", "chatbot_blocking", "chatbot_sse")}
+    try:
+        with serve_app() as base_url, httpx.Client(base_url=base_url, timeout=60) as client:
+            for run in range(args.runs):
+                ttfb, total, body = measure(client, "GET", f"/api/insight/{200000 + run:06d}")
+                results["insight_blocking"]["ttfb"].append(ttfb)
+                results["insight_blocking"]["total"].append(total)
+                report_id = json.loads(body)["report_id"]
+
+                ttfb, total, body = measure(client, "GET", f"/api/insight/{300000 + run:06d}/stream")
+                results["insight_sse"]["ttfb"].append(ttfb)
+                results["insight_sse"]["total"].append(total)
+                events = parse_sse(body)
+                assert events[0][0] == "insight" and events[-1][0] == "done", events[-1]
+
+                question = {"report_id": report_id, "user_question": "금리 인하의 영향은?"}
+                ttfb, total, _ = measure(client, "POST", "/api/chatbot/query", json=question)
+                results["chatbot_blocking"]["ttfb"].append(ttfb)
+                results["chatbot_blocking"]["total"].append(total)
+
+                ttfb, total, _ = measure(client, "POST", "/api/chatbot/query/stream", json=question)
+                results["chatbot_sse"]["ttfb"].append(ttfb)
+                results["chatbot_sse"]["total"].append(total)
+
+            # 같은 종목 SSE 동시 요청: 보고서 생성(CLOVA + GPT 호출 2회)은 한 번만
+            llm_calls_before = len(llm.prompt_chars)
+            with ThreadPoolExecutor(args.concurrent) as pool:
+                bodies = list(pool.map(lambda _: measure(client, "GET", "/api/insight/400000/stream")[2], range(args.concurrent)))
+            done = [parse_sse(body)[-1] for body in bodies]
+            assert all(event == "done" for event, _ in done), done
+            assert len({data["report_id"] for _, data in done}) == 1, done
+            llm_calls = len(llm.prompt_chars) - llm_calls_before
+            assert llm_calls == 2, llm_calls
+            coalesced = {"requests": args.concurrent, "llm_calls": llm_calls, "report_ids": 1}
+    finally:
+        naver.stop()
+        llm.stop()
+
+    summary = {
+        name: {"ttfb": latency_summary(samples["ttfb"]), "total": latency_summary(samples["total"])}
+        for name, samples in results.items()
+    }
+    summary["insight_sse_coalesced"] = coalesced
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
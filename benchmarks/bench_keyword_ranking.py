@@ -0,0 +1,98 @@
+"""
+인기 검색어 벤치마크: search_logs GROUP BY 쿼리 vs 메모리 슬라이딩 윈도우 상위 K 집계.
+
+임시 SQLite 파일에 최근 24시간에 걸친 합성 검색 로그를 넣고 비교합니다.
+실행: python -m benchmarks.bench_keyword_ranking --rows 1000000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import Base
+from app.models import db_models
+from app.services.keyword_ranking import SlidingWindowTopK
+
+def timed_calls(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def describe(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "calls": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 4),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keywords", type=int, default=5_000, help="서로 다른 검색어 수 (Zipf 분포)")
+    args = parser.parse_args()
+
+    random.seed(0)
+    keywords = [f"종목{i}" for i in range(args.keywords)]
+    weights = [1 / (rank + 1) for rank in range(args.keywords)]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            batch = []
+            for keyword in random.choices(keywords, weights=weights, k=args.rows):
+                batch.append({"keyword": keyword, "searched_at": now - timedelta(seconds=random.randint(0, 86_000))})
+                if len(batch) == 50_000:
+                    conn.execute(insert(db_models.SearchLog), batch)
+                    batch = []
+            if batch:
+                conn.execute(insert(db_models.SearchLog), batch)
+        load_seconds = time.perf_counter() - started
+
+        db = Session()
+        try:
+            sql_samples = timed_calls(lambda: crud.get_top_keywords(db, limit=10), repeat=5)
+            sql_top = [(keyword, count) for keyword, count in crud.get_top_keywords(db, limit=10)]
+
+            ranking = SlidingWindowTopK()
+            since = now - timedelta(days=1)
+            started = time.perf_counter()
+            ranking.rebuild(crud.iter_search_logs_since(db, since))
+            rebuild_seconds = time.perf_counter() - started
+            memory_top = ranking.top(limit=10)
+        finally:
+            db.close()
+            engine.dispose()
+
+    memory_samples = timed_calls(lambda: ranking.top(limit=10), repeat=10_000)
+    record_samples = timed_calls(lambda: ranking.record(random.choice(keywords)), repeat=10_000)
+
+    results = {
+        "rows": args.rows,
+        "load_seconds": round(load_seconds, 2),
+        "sql_group_by_top10": describe(sql_samples),
+        "memory_rebuild_seconds": round(rebuild_seconds, 2),
+        "memory_top10": describe(memory_samples),
+        "memory_record": describe(record_samples),
+        "sql_and_memory_top10_match": sql_top == memory_top,
+    }
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
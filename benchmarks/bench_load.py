@@ -0,0 +1,408 @@
+"""
+전체 API 부하 테스트: 모든 FastAPI 라우트를 동시 요청으로 호출하고 처리량/지연/DB 잠금 경합을 JSON 으로 남깁니다.
+
+test_NaverAPI.py, test_insert.py 와 달리 외부 서비스를 호출하지 않습니다.
+- 업스트림(네이버 시세, DeepSearch, FRED, OpenAI 호환 LLM)은 로컬 스텁이며 지연과 오류 비율을 지정할 수 있습니다.
+- 앱은 별도 프로세스의 uvicorn 으로 띄웁니다. lifespan 과 스케줄러를 켠 운영과 같은 구성이며 DB 는 임시 SQLite 파일입니다.
+- 부하 생성기는 closed-loop 방식입니다. --concurrency 개의 클라이언트가 응답을 받는 즉시 다음 요청을 보냅니다.
+
+시나리오는 라우트별 단독 부하와, 실제 트래픽 비율을 흉내 낸 혼합 부하(mixed)입니다.
+시나리오마다 다음을 기록합니다.
+- RPS, p50/p95/p99 지연, 상태 코드별 건수
+- DB 잠금 경합: 서버 /metrics 의 시나리오 전후 차이
+  - 쓰기 트랜잭션 시작(BEGIN IMMEDIATE) 대기 시간
+  - commit 시간
+  - rollback 수
+  - 요청당 SQL 시간
+결과 JSON 에는 커밋 해시와 실행 조건이 들어 있습니다. --compare 로 이전 결과와 비교할 수 있습니다.
+
+실행:
+  python -m benchmarks.bench_load --concurrency 32 --seconds 5 --mixed-seconds 30 --output load.json
+  python -m benchmarks.bench_load --compare load.json --error-rate 0.05 --upstream-latency 0.1
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+THEMES = ["반도체", "2차전지", "인공지능"]
+ADHOC_THEMES = ["조선", "방산", "원전"]
+STOCK_NAMES = ["삼성전자", "SK하이닉스", "LG에너지솔루션", "현대차", "기아", "NAVER", "카카오", "셀트리온", "POSCO홀딩스", "삼성SDI"]
+
+# 이름: (메서드, 라우트 경로, 요청 생성 함수(rng, ctx) -> (경로, JSON 본문), 혼합 부하 가중치)
+def _get(path: str):
+    return lambda rng, ctx: (path, None)
+
+def _code(rng, ctx) -> str:
+    return rng.choice(ctx["codes"])
+
+REQUESTS = {
+    "root": ("GET", "/", _get("/"), 0.5),
+    "news_macro": ("GET", "/api/news/macro", _get("/api/news/macro"), 15),
+    "news_popular": ("GET", "/api/news/popular", _get("/api/news/popular"), 10),
+    "news_feed": ("GET", "/api/news/feed", lambda rng, ctx: (
+        f"/api/news/feed?source=macro&limit={rng.choice([10, 20, 50])}" if rng.random() < 0.6
+        else f"/api/news/feed?theme={rng.choice(THEMES)}&limit=20",
+        None,
+    ), 15),
+    "themes": ("GET", "/api/themes", _get("/api/themes"), 5),
+    "news_theme": ("GET", "/api/news/theme/{theme_name}", lambda rng, ctx: (
+        f"/api/news/theme/{rng.choice(THEMES if rng.random() < 0.7 else ADHOC_THEMES)}", None,
+    ), 8),
+    "article_click": ("POST", "/api/articles/{article_id}/click", lambda rng, ctx: (
+        f"/api/articles/{rng.randint(1, ctx['articles'])}/click", None,
+    ), 10),
+    "keywords_top": ("GET", "/api/keywords/top", _get("/api/keywords/top"), 8),
+    "system_stats": ("GET", "/api/system/stats", _get("/api/system/stats"), 0.5),
+    "metrics": ("GET", "/metrics", _get("/metrics"), 0.5),
+    "stock_search": ("GET", "/api/stock/search/{stock_code}", lambda rng, ctx: (f"/api/stock/search/{_code(rng, ctx)}", None), 10),
+    "stock_batch": ("POST", "/api/stock/batch", lambda rng, ctx: (
+        "/api/stock/batch", {"codes": rng.sample(ctx["codes"], 5)},
+    ), 2),
+    "stock_search_by_name": ("GET", "/api/stock/search-by-name/{stock_name}", lambda rng, ctx: (
+        f"/api/stock/search-by-name/{rng.choice(ctx['names'])}", None,
+    ), 5),
+    "autocomplete": ("GET", "/api/stock/autocomplete", lambda rng, ctx: (
+        f"/api/stock/autocomplete?q={(name := rng.choice(ctx['names']))[:rng.randint(1, len(name))]}", None,
+    ), 10),
+    "insight": ("GET", "/api/insight/{stock_code}", lambda rng, ctx: (f"/api/insight/{rng.choice(ctx['insight_codes'])}", None), 1),
+    "insight_stream": ("GET", "/api/insight/{stock_code}/stream", lambda rng, ctx: (
+        f"/api/insight/{rng.choice(ctx['insight_codes'])}/stream", None,
+    ), 1),
+    "chatbot": ("POST", "/api/chatbot/query", lambda rng, ctx: (
+        "/api/chatbot/query", {"report_id": rng.choice(ctx["report_ids"]), "user_question": "금리 인하가 실적에 미치는 영향은?"},
+    ), 0.5),
+    "chatbot_stream": ("POST", "/api/chatbot/query/stream", lambda rng, ctx: (
+        "/api/chatbot/query/stream", {"report_id": rng.choice(ctx["report_ids"]), "user_question": "환율 리스크는?"},
+    ), 0.5),
+}
+
+def uncovered_routes() -> list[str]:
+    """앱에 등록됐지만 REQUESTS 에 없는 라우트. (새 API 를 추가하면 여기에도 추가해야 합니다)"""
+    from fastapi.routing import APIRoute
+
+    from app.main import app
+
+    covered = {(method, path) for method, path, _, _ in REQUESTS.values()}
+    return sorted(
+        f"{method} {route.path}"
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods if method not in ("HEAD", "OPTIONS") and (method, route.path) not in covered
+    )
+
+# --- /metrics 차이 ---
+def scrape(text: str) -> dict[tuple, float]:
+    from prometheus_client.parser import text_string_to_metric_families
+
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+        if not sample.name.endswith("_created")
+    }
+
+def diff(before: dict, after: dict) -> dict:
+    return {key: value - before.get(key, 0.0) for key, value in after.items()}
+
+def _select(samples: dict, name: str, labels: dict) -> list[tuple[dict, float]]:
+    return [
+        (dict(key_labels), value) for (sample_name, key_labels), value in samples.items()
+        if sample_name == name and all(dict(key_labels).get(k) == v for k, v in labels.items())
+    ]
+
+def histogram_summary(samples: dict, name: str, **labels) -> dict:
+    """히스토그램 차이를 건수/평균과 버킷 경계 기준 p50/p95/p99(이하) 로 요약합니다."""
+    count = sum(value for _, value in _select(samples, name + "_count", labels))
+    if not count:
+        return {"count": 0}
+    total = sum(value for _, value in _select(samples, name + "_sum", labels))
+    buckets: Counter = Counter()
+    for key_labels, value in _select(samples, name + "_bucket", labels):
+        buckets[float(key_labels["le"])] += value
+
+    def upper_bound(q: float) -> float | None:
+        for le, cumulative in sorted(buckets.items()):
+            if cumulative >= q * count:
+                return None if le == float("inf") else round(le * 1000, 2)
+        return None
+
+    return {
+        "count": int(count),
+        "mean_ms": round(total / count * 1000, 3),
+        "p50_ms_le": upper_bound(0.5),
+        "p95_ms_le": upper_bound(0.95),
+        "p99_ms_le": upper_bound(0.99),
+        "over_10ms": int(count - buckets.get(0.01, 0.0)),
+    }
+
+def lock_contention(samples: dict) -> dict:
+    writer_begin = histogram_summary(samples, "db_query_duration_seconds", engine="writer", statement="BEGIN")
+    request_db = histogram_summary(samples, "http_request_db_seconds")
+    return {
+        # SQLite 쓰기 트랜잭션은 BEGIN IMMEDIATE 로 시작하므로 이 시간이 곧 쓰기 잠금 대기 시간입니다.
+        "writer_begin_wait": writer_begin,
+        "writer_commit": histogram_summary(samples, "db_commit_duration_seconds", session="writer"),
+        "rollbacks": int(sum(value for _, value in _select(samples, "db_rollbacks_total", {}))),
+        "db_ms_per_request": request_db.get("mean_ms", 0.0),
+    }
+
+# --- 부하 생성 ---
+async def run_scenario(args, base_url: str, ctx: dict, names: list[str], seconds: float, seed: int) -> dict:
+    import httpx
+
+    weights = [REQUESTS[name][3] for name in names]
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    statuses: dict[str, Counter] = {name: Counter() for name in names}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        before = scrape((await client.get("/metrics")).text)
+        started = time.perf_counter()
+        deadline = started + seconds
+
+        async def worker(index: int):
+            rng = random.Random(seed * 1000 + index)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0] if len(names) > 1 else names[0]
+                method, _, build, _ = REQUESTS[name]
+                path, body = build(rng, ctx)
+                sent = time.perf_counter()
+                try:
+                    # 스트리밍(NDJSON/SSE) 응답은 마지막 조각까지 받은 시점으로 잽니다.
+                    async with client.stream(method, path, json=body) as response:
+                        async for _ in response.aiter_raw():
+                            pass
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                latencies[name].append(time.perf_counter() - sent)
+                statuses[name][status] += 1
+
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        after = scrape((await client.get("/metrics")).text)
+
+    from benchmarks.harness import latency_summary
+
+    def summarize(samples: list[float], codes: Counter) -> dict:
+        requests = sum(codes.values())
+        errors = sum(count for code, count in codes.items() if not code.isdigit() or int(code) >= 500)
+        return {
+            "requests": requests,
+            "rps": round(requests / elapsed, 1),
+            **{key: value for key, value in latency_summary(samples).items() if key != "count"},
+            "error_rate": round(errors / requests, 4) if requests else None,
+            "status": dict(sorted(codes.items())),
+        }
+
+    all_statuses = sum(statuses.values(), Counter())
+    result = {
+        "seconds": round(elapsed, 2),
+        **summarize([s for name in names for s in latencies[name]], all_statuses),
+        "db_lock_contention": lock_contention(diff(before, after)),
+    }
+    if len(names) > 1:
+        result["routes"] = {name: summarize(latencies[name], statuses[name]) for name in names if statuses[name]}
+    return result
+
+def compare(current: dict, baseline: dict) -> dict:
+    """시나리오별 RPS/p95/p99/오류율 변화. (양수 % = 증가)"""
+
+    def change(new, old):
+        return round((new - old) / old * 100, 1) if old else None
+
+    params, old_params = current["meta"]["params"], baseline.get("meta", {}).get("params", {})
+    result = {
+        "baseline_commit": baseline.get("meta", {}).get("commit"),
+        # 실행 조건이 다르면 수치를 그대로 비교할 수 없습니다.
+        "params_differ": sorted(key for key in params if params[key] != old_params.get(key)),
+    }
+    for name, scenario in current["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if old:
+            result[name] = {
+                "rps_pct": change(scenario["rps"], old["rps"]),
+                "p95_pct": change(scenario["p95_ms"], old["p95_ms"]),
+                "p99_pct": change(scenario["p99_ms"], old["p99_ms"]),
+                "error_rate": [old["error_rate"], scenario["error_rate"]],
+                "writer_begin_wait_mean_ms": [
+                    old["db_lock_contention"]["writer_begin_wait"].get("mean_ms"),
+                    scenario["db_lock_contention"]["writer_begin_wait"].get("mean_ms"),
+                ],
+            }
+    return result
+
+# --- 준비 ---
+def seed_database(articles: int):
+    from sqlalchemy import insert
+
+    from app.database import engine, init_db
+    from app.models import db_models
+
+    init_db()
+    base = datetime(2025, 1, 1)
+    sources = ["macro", *THEMES]
+    with engine.begin() as conn:
+        conn.execute(insert(db_models.NewsArticle), [
+            {
+                "title": f"{sources[i % len(sources)]} 기사 {i}", "url": f"https://example.com/seed/{i}",
+                "published_at": base + timedelta(minutes=i), "source": sources[i % len(sources)], "click_count": (i * 7919) % 500,
+            }
+            for i in range(articles)
+        ])
+    engine.dispose()
+
+def write_symbols_csv(path: str, codes: list[str]):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Code", "Name"])
+        writer.writerows((code, STOCK_NAMES[i] if i < len(STOCK_NAMES) else f"테스트종목{code}") for i, code in enumerate(codes))
+
+async def prepare_reports(base_url: str, codes: list[str]) -> list[str]:
+    """챗봇 시나리오에서 쓸 보고서를 미리 만듭니다."""
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        responses = await asyncio.gather(*(client.get(f"/api/insight/{code}") for code in codes))
+    report_ids = [response.json()["report_id"] for response in responses if response.status_code == 200]
+    if not report_ids:
+        raise RuntimeError("챗봇 시나리오용 보고서를 만들지 못했습니다.")
+    return report_ids
+
+def git_commit() -> str | None:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 클라이언트 수")
+    parser.add_argument("--seconds", type=float, default=5.0, help="라우트별 단독 부하 시간 (0 이면 생략)")
+    parser.add_argument("--mixed-seconds", type=float, default=30.0, help="혼합 부하 시간 (0 이면 생략)")
+    parser.add_argument("--routes", help="단독 부하를 줄 요청 이름 (쉼표 구분, 기본: 전체). 이름: " + ", ".join(REQUESTS))
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--articles", type=int, default=20000, help="미리 넣어 둘 기사 수")
+    parser.add_argument("--codes", type=int, default=300, help="조회할 종목 코드 수 (시세 캐시 적중률에 영향)")
+    parser.add_argument("--upstream-latency", type=float, default=0.03, help="네이버/DeepSearch/FRED 스텁 응답 지연(초)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="LLM 스텁 첫 응답 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="LLM 스텁 토큰 간격(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="업스트림 스텁 오류(503) 비율")
+    parser.add_argument("--error-upstreams", default="naver,deepsearch,fred,llm", help="오류를 넣을 스텁 (쉼표 구분)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--server-log", help="서버 로그 저장 경로 (기본: 버림)")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_path = os.path.join(tmp_dir.name, "load.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    missing = uncovered_routes()
+    if missing and not args.routes:
+        raise SystemExit(f"부하 시나리오가 없는 라우트: {missing}")
+    routes = args.routes.split(",") if args.routes else list(REQUESTS)
+    unknown = [name for name in routes if name not in REQUESTS]
+    if unknown:
+        raise SystemExit(f"알 수 없는 요청 이름: {unknown}")
+
+    from benchmarks.fakes import FakeDeepSearchServer, FakeFredServer, FakeNaverStockServer, FakeOpenAIServer
+    from benchmarks.harness import serve_app_process
+
+    rng = random.Random(7)
+    codes = sorted({f"{rng.randrange(1, 999999):06d}" for _ in range(args.codes * 2)})[:args.codes]
+    error_upstreams = set(args.error_upstreams.split(","))
+
+    def error_rate(name: str) -> float:
+        return args.error_rate if name in error_upstreams else 0.0
+
+    naver = FakeNaverStockServer(latency=args.upstream_latency, error_rate=error_rate("naver"))
+    deepsearch = FakeDeepSearchServer(
+        [*THEMES, *ADHOC_THEMES, "관세 무역정책"], per_source=20,
+        companies={STOCK_NAMES[i] if i < len(STOCK_NAMES) else f"테스트종목{code}": code for i, code in enumerate(codes)},
+        latency=args.upstream_latency, error_rate=error_rate("deepsearch"),
+    )
+    fred = FakeFredServer(latency=args.upstream_latency, error_rate=error_rate("fred"))
+    llm = FakeOpenAIServer(latency=args.llm_latency, token_delay=args.token_delay, report_tokens=40, error_rate=error_rate("llm"))
+    fakes = [naver.start(), deepsearch.start(), fred.start(), llm.start()]
+
+    csv_path = os.path.join(tmp_dir.name, "stock_symbols.csv")
+    write_symbols_csv(csv_path, codes)
+    seed_database(args.articles)
+    env = {
+        "DATABASE_URL": os.environ["DATABASE_URL"],
+        "NAVER_STOCK_API_BASE_URL": naver.stock_api_base_url,
+        "DEEPSEARCH_API_BASE_URL": deepsearch.deepsearch_api_base_url,
+        "FRED_API_BASE_URL": fred.fred_api_base_url,
+        "FRED_STORE_DIR": os.path.join(tmp_dir.name, "fred"),
+        "NCP_APIGW_URL": llm.api_base_url,
+        "OPENAI_BASE_URL": llm.api_base_url,
+        "STOCK_SYMBOLS_SOURCE": "csv",
+        "STOCK_SYMBOLS_CSV": csv_path,
+        "REPORTS_DIR": os.path.join(tmp_dir.name, "reports"),
+        "REPORT_STORE_PATH": os.path.join(tmp_dir.name, "reports", "reports.db"),
+        "METRICS_ENABLED": "true",
+    }
+    if args.workers > 1:
+        # 워커 여러 개의 지표를 /metrics 하나로 모읍니다.
+        env["PROMETHEUS_MULTIPROC_DIR"] = os.path.join(tmp_dir.name, "prometheus")
+        os.makedirs(env["PROMETHEUS_MULTIPROC_DIR"])
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": "sqlite",
+            "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "server_log")},
+        },
+        "scenarios": {},
+    }
+    try:
+        with serve_app_process(env, workers=args.workers, log_path=args.server_log) as base_url:
+            insight_codes = codes[:10]
+            ctx = {
+                "codes": codes,
+                "names": STOCK_NAMES + [f"테스트종목{code}" for code in codes[len(STOCK_NAMES):]],
+                "articles": args.articles,
+                "insight_codes": insight_codes,
+                "report_ids": asyncio.run(prepare_reports(base_url, insight_codes[:3])),
+            }
+            if args.seconds > 0:
+                for index, name in enumerate(routes):
+                    report["scenarios"][name] = asyncio.run(run_scenario(args, base_url, ctx, [name], args.seconds, index))
+                    print(f"{name}: {report['scenarios'][name]['rps']} rps, p95 {report['scenarios'][name]['p95_ms']} ms", file=sys.stderr)
+            if args.mixed_seconds > 0:
+                report["scenarios"]["mixed"] = asyncio.run(run_scenario(args, base_url, ctx, routes, args.mixed_seconds, len(routes)))
+        report["upstreams"] = {
+            type(fake).__name__: {"hits": fake.hits, "errors": fake.errors} for fake in fakes
+        }
+    finally:
+        for fake in fakes:
+            fake.stop()
+        tmp_dir.cleanup()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+if __name__ == "__main__":
+    main()
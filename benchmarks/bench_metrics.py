@@ -0,0 +1,213 @@
+"""
+/metrics 계측 벤치마크/검증.
+
+로컬 스텁(네이버 시세, DeepSearch, FRED, OpenAI 호환)과 임시 SQLite DB 를 쓰고
+앱은 프로세스 안(ASGI)에서 호출하므로 네트워크 없이 실행됩니다.
+확인 항목
+- 라우트별 요청 시간 히스토그램, 요청별 SQL 수/시간, SQL 문/commit 시간
+- 외부 호출 시간: naver / deepsearch(304 포함) / fred / clova / gpt (+ 스트리밍 첫 토큰)
+- 스케줄러 작업 실행 시간과 결과
+- 계측 오버헤드: METRICS_ENABLED=false/true 로 각각 새 프로세스에서 같은 요청을 보내 요청당 시간 비교
+실행: python -m benchmarks.bench_metrics --requests 3000
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+OVERHEAD_CHILD = r"""
+import asyncio, json, os, sys, time
+from datetime import datetime, timedelta
+import httpx
+from sqlalchemy import insert
+from app.database import engine, init_db
+from app.main import app
+from app.models import db_models
+from benchmarks.harness import latency_summary
+
+init_db()
+with engine.begin() as conn:
+    conn.execute(insert(db_models.NewsArticle), [
+        {"title": f"기사 {i}", "url": f"https://example.com/{i}", "published_at": datetime(2024, 1, 1) + timedelta(minutes=i),
+         "source": "macro", "click_count": i % 100}
+        for i in range(2000)
+    ])
+
+async def run(count):
+    result = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in (("cached_keywords", "/api/keywords/top"), ("db_feed", "/api/news/feed?source=macro&limit=20")):
+            for _ in range(200):
+                await client.get(path)
+            samples = []
+            for _ in range(count):
+                started = time.perf_counter()
+                response = await client.get(path)
+                samples.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            result[name] = latency_summary(samples)
+    return result
+
+print(json.dumps(asyncio.run(run(int(sys.argv[1])))))
+"""
+
+def overhead(requests: int, tmp_dir: str) -> dict:
+    """계측 끔/켬 각각 새 프로세스에서 같은 요청을 보내 평균 요청 시간을 비교합니다."""
+    result = {}
+    for enabled in ("false", "true"):
+        env = {
+            **os.environ,
+            "METRICS_ENABLED": enabled,
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp_dir, f'overhead_{enabled}.db')}",
+        }
+        output = subprocess.run(
+            [sys.executable, "-c", OVERHEAD_CHILD, str(requests)], env=env, capture_output=True, text=True, timeout=600,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+        if output.returncode != 0:
+            raise RuntimeError(output.stderr)
+        result["enabled" if enabled == "true" else "disabled"] = json.loads(output.stdout.strip().splitlines()[-1])
+    result["added_mean_us"] = {
+        name: round((result["enabled"][name]["mean_ms"] - result["disabled"][name]["mean_ms"]) * 1000, 1)
+        for name in result["enabled"]
+    }
+    return result
+
+def samples_of(text: str, metric: str, **labels) -> float:
+    """노출 형식 텍스트에서 이름과 라벨이 맞는 값들의 합."""
+    total = 0.0
+    for line in text.splitlines():
+        if not line.startswith(metric + "{") and not line.startswith(metric + " "):
+            continue
+        name_labels, value = line.rsplit(" ", 1)
+        if all(f'{key}="{val}"' in name_labels for key, val in labels.items()):
+            total += float(value)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000, help="오버헤드 측정 요청 수 (경로별)")
+    args = parser.parse_args()
+
+    from benchmarks.fakes import FakeDeepSearchServer, FakeFredServer, FakeNaverStockServer, FakeOpenAIServer
+    from benchmarks.harness import latency_summary
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    naver = FakeNaverStockServer(latency=0.01).start()
+    deepsearch = FakeDeepSearchServer(["테마A", "관세 무역정책"], per_source=5, latency=0.01, companies={"삼성전자": "005930"}).start()
+    fred = FakeFredServer(latency=0.01).start()
+    llm = FakeOpenAIServer(latency=0.02, token_delay=0.001, report_tokens=20).start()
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp_dir.name, 'metrics.db')}",
+        "NAVER_STOCK_API_BASE_URL": naver.stock_api_base_url,
+        "DEEPSEARCH_API_BASE_URL": deepsearch.deepsearch_api_base_url,
+        "FRED_API_BASE_URL": fred.fred_api_base_url,
+        "FRED_STORE_DIR": os.path.join(tmp_dir.name, "fred"),
+        "NCP_APIGW_URL": llm.api_base_url,
+        "OPENAI_BASE_URL": llm.api_base_url,
+        "METRICS_ENABLED": "true",
+    })
+
+    import httpx
+    from sqlalchemy import insert
+
+    from app.core import metrics
+    from app.database import engine, init_db
+    from app.main import app
+    from app.models import db_models
+    from app.services import scheduler
+
+    result = {}
+    try:
+        init_db()
+        with engine.begin() as conn:
+            conn.execute(insert(db_models.NewsArticle), [
+                {"title": f"기사 {i}", "url": f"https://example.com/{i}", "published_at": datetime(2024, 1, 1) + timedelta(minutes=i),
+                 "source": "macro", "click_count": i}
+                for i in range(500)
+            ])
+
+        # 스케줄러 작업 (경제지표: FRED + DeepSearch 동기 호출, 뉴스: DeepSearch 비동기 조건부 호출 2회 → 두 번째는 304)
+        scheduler.update_economic_indicators_job()
+        scheduler.refresh_news_job()
+        scheduler.refresh_news_job()
+
+        async def exercise() -> tuple[str, dict]:
+            timings = {}
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30) as client:
+                calls = [
+                    ("GET", "/api/stock/search/005930", None),
+                    ("GET", "/api/news/feed?source=macro&limit=10", None),
+                    ("GET", "/api/news/theme/테마A", None),
+                    ("GET", "/api/news/macro", None),
+                    ("POST", "/api/articles/1/click", None),
+                    ("GET", "/api/insight/005930", None),
+                    ("GET", "/api/no-such-route", None),
+                ]
+                for method, path, body in calls:
+                    started = time.perf_counter()
+                    response = await client.request(method, path, json=body)
+                    timings[path] = {"status": response.status_code, "ms": round((time.perf_counter() - started) * 1000, 2)}
+                report_id = (await client.get("/api/insight/005930")).json()["report_id"]
+                async with client.stream("POST", "/api/chatbot/query/stream", json={"report_id": report_id, "user_question": "금리 영향은?"}) as response:
+                    async for _ in response.aiter_text():
+                        pass
+                exposition = await client.get("/metrics")
+                assert exposition.status_code == 200 and exposition.headers["content-type"].startswith("text/plain")
+                return exposition.text, timings
+
+        text, timings = asyncio.run(exercise())
+        checks = {
+            "route_histogram": samples_of(text, "http_request_duration_seconds_count", route="/api/stock/search/{stock_code}", status="200"),
+            "unmatched_route": samples_of(text, "http_request_duration_seconds_count", route="unmatched", status="404"),
+            "feed_db_queries": samples_of(text, "http_request_db_queries_sum", route="/api/news/feed"),
+            "click_db_queries": samples_of(text, "http_request_db_queries_sum", route="/api/articles/{article_id}/click"),
+            "db_select": samples_of(text, "db_query_duration_seconds_count", statement="SELECT"),
+            "db_commit": samples_of(text, "db_commit_duration_seconds_count"),
+            "naver": samples_of(text, "external_call_duration_seconds_count", service="naver", outcome="ok"),
+            "deepsearch_updated": samples_of(text, "external_call_duration_seconds_count", service="deepsearch", outcome="ok"),
+            "deepsearch_304": samples_of(text, "external_call_duration_seconds_count", service="deepsearch", outcome="not_modified"),
+            "fred": samples_of(text, "external_call_duration_seconds_count", service="fred"),
+            "clova": samples_of(text, "external_call_duration_seconds_count", service="clova", outcome="ok"),
+            "gpt": samples_of(text, "external_call_duration_seconds_count", service="gpt", outcome="ok"),
+            "llm_first_token": samples_of(text, "llm_first_token_seconds_count", service="clova"),
+            "job_news": samples_of(text, "scheduler_job_duration_seconds_count", job="refresh_news_job", outcome="ok"),
+            "job_indicators": samples_of(text, "scheduler_job_duration_seconds_count", job="update_economic_indicators_job", outcome="ok"),
+        }
+        missing = [name for name, value in checks.items() if not value]
+        assert not missing, (missing, checks)
+        result["requests"] = timings
+        result["series_checked"] = checks
+        result["exposition_bytes"] = len(text)
+
+        # 계측 단위 비용 (히스토그램 1회 기록 / 외부 호출 타이머 1회)
+        count = 200_000
+        started = time.perf_counter()
+        for _ in range(count):
+            metrics.DB_QUERY_SECONDS.labels("bench", "SELECT").observe(0.001)
+        observe_ns = (time.perf_counter() - started) / count * 1e9
+        started = time.perf_counter()
+        for _ in range(count):
+            with metrics.external_call("bench", "noop"):
+                pass
+        timer_ns = (time.perf_counter() - started) / count * 1e9
+        result["unit_cost_ns"] = {"histogram_observe": round(observe_ns), "external_call_timer": round(timer_ns)}
+    finally:
+        for server in (naver, deepsearch, fred, llm):
+            server.stop()
+
+    try:
+        result["overhead"] = overhead(args.requests, tmp_dir.name)
+    finally:
+        tmp_dir.cleanup()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+뉴스 갱신 벤치마크/검증: 기존 순차 수집(requests.get, 테마마다 커밋) vs 비동기 동시 수집(NewsRefresher).
+
+로컬 DeepSearch 스텁(ETag/304 지원, 키워드별 지연 주입)으로 네트워크 없이 실행합니다.
+확인 항목
+- 첫 갱신: 두 방식이 같은 기사 수를 저장하고, 동시 수집은 가장 느린 출처 한 번 만큼만 걸리는지
+- 변경 없음: 모든 출처가 304 로 끝나고 DB 에 아무것도 쓰지 않는지 (실행 사이에 같은 커넥션 풀을 재사용하는지)
+- 한 테마에만 새 기사: 그 테마만 저장되는지 / ETag 없는 응답은 기사 목록 지문으로 건너뛰는지
+- 한 출처 실패: 나머지는 저장되고, 실패한 출처는 다음 실행에서 다시 받는지
+실행: python -m benchmarks.bench_news_refresh --latency 0.1 --slow-latency 0.5
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.1, help="DeepSearch 요청당 기본 지연(초)")
+    parser.add_argument("--slow-latency", type=float, default=0.5, help="느린 테마 하나에 추가되는 지연(초)")
+    args = parser.parse_args()
+
+    from benchmarks.fakes import FakeDeepSearchServer
+
+    themes = ["반도체", "2차전지", "인공지능"]
+    server = FakeDeepSearchServer(themes, latency=args.latency, keyword_latency={"2차전지": args.slow_latency}).start()
+    tmp_dir = tempfile.TemporaryDirectory()
+    os.environ["DEEPSEARCH_API_BASE_URL"] = server.deepsearch_api_base_url
+
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import sessionmaker
+
+    from app import crud
+    from app.core import news_fetcher
+    from app.database import Base
+    from app.models import db_models
+    from app.services.news_refresher import NewsRefresher
+
+    def new_database(name: str):
+        engine = create_engine(f"sqlite:///{os.path.join(tmp_dir.name, name)}")
+        Base.metadata.create_all(bind=engine)
+        return sessionmaker(bind=engine)
+
+    def article_count(Session) -> int:
+        with Session() as db:
+            return db.scalar(select(func.count()).select_from(db_models.NewsArticle))
+
+    def legacy_refresh(Session) -> int:
+        """기존 update_macro_news_job + update_themed_news_job (출처를 하나씩 조회하고 출처마다 커밋)."""
+        saved = 0
+        db = Session()
+        try:
+            latest_news = news_fetcher.get_trending_macro_topics(limit=10)
+            if latest_news:
+                saved += crud.create_news_articles(db=db, articles=latest_news, source="macro")
+            for theme in themes:
+                latest_news = news_fetcher.get_articles_by_theme(theme_name=theme, limit=10)
+                if latest_news:
+                    saved += crud.create_news_articles(db=db, articles=latest_news, source=theme)
+        finally:
+            db.close()
+        return saved
+
+    def statuses(metrics: dict) -> dict:
+        return {source: item["status"] for source, item in metrics["sources"].items()}
+
+    result = {}
+    try:
+        # 1) 첫 갱신: 같은 기사 수, 동시 수집은 (가장 느린 출처) 만큼만 걸려야 합니다.
+        legacy_db = new_database("legacy.db")
+        started = time.perf_counter()
+        legacy_saved = legacy_refresh(legacy_db)
+        legacy_ms = (time.perf_counter() - started) * 1000
+        legacy_requests = server.hits
+
+        refresher_db = new_database("refresher.db")
+        refresher = NewsRefresher(session_factory=refresher_db, read_session_factory=refresher_db, themes=themes)
+        server.reset_hits()
+        first = refresher.run()
+        assert first["saved"] == legacy_saved == 40, (first, legacy_saved)
+        assert article_count(refresher_db) == article_count(legacy_db)
+        assert first["fetch_ms"] < (args.latency + args.slow_latency) * 1000 + 300, first
+        result["first_refresh"] = {
+            "legacy_sequential": {"total_ms": round(legacy_ms, 2), "requests": legacy_requests, "saved": legacy_saved},
+            "async_concurrent": {key: first[key] for key in ("total_ms", "fetch_ms", "db_ms", "saved")} | {"requests": server.hits},
+        }
+
+        # 2) 변경 없음: 모든 출처가 304, 저장 없음
+        server.reset_hits()
+        started = time.perf_counter()
+        legacy_refresh(legacy_db)
+        legacy_ms = (time.perf_counter() - started) * 1000
+        client = refresher._client
+        unchanged = refresher.run()
+        # 실행 사이에도 같은 HTTP 클라이언트(커넥션 풀)를 씁니다.
+        assert refresher._client is client and not client.is_closed
+        assert set(statuses(unchanged).values()) == {"not_modified"}, unchanged
+        assert unchanged["saved"] == 0 and server.not_modified == 4
+        result["no_change_refresh"] = {
+            "legacy_sequential_ms": round(legacy_ms, 2),
+            "async_concurrent": {key: unchanged[key] for key in ("total_ms", "fetch_ms", "db_ms", "saved")},
+            "statuses": statuses(unchanged),
+        }
+
+        # 3) 한 테마에만 새 기사 3건
+        server.publish("반도체", 3)
+        partial = refresher.run()
+        assert statuses(partial) == {"macro": "not_modified", "반도체": "updated", "2차전지": "not_modified", "인공지능": "not_modified"}, partial
+        assert partial["saved"] == 3 and partial["sources"]["반도체"]["saved"] == 3, partial
+        result["one_theme_changed"] = {"saved": partial["saved"], "statuses": statuses(partial)}
+
+        # 4) ETag 를 주지 않는 업스트림: 기사 목록 지문이 같으면 저장을 건너뜁니다.
+        server.etag = False
+        refresher._validators = {source: {"marker": item["marker"]} for source, item in refresher._validators.items()}
+        no_etag = refresher.run()
+        assert set(statuses(no_etag).values()) == {"unchanged"} and no_etag["db_ms"] < 1, no_etag
+        server.etag = True
+        result["without_etag"] = {"statuses": statuses(no_etag), "db_ms": no_etag["db_ms"]}
+
+        # 5) 한 출처 실패 (503): 나머지는 저장, 실패한 출처는 다음 실행에서 다시 받아야 합니다.
+        for keyword in [None, *themes]:
+            server.publish(keyword, 1)
+        server.fail_next(1)
+        failed = refresher.run()
+        failed_sources = [source for source, status in statuses(failed).items() if status == "error"]
+        assert len(failed_sources) == 1 and failed["saved"] == 3, failed
+        retried = refresher.run()
+        assert statuses(retried)[failed_sources[0]] == "updated" and retried["saved"] == 1, retried
+        result["one_source_failed"] = {"failed": failed_sources[0], "saved": failed["saved"], "saved_on_retry": retried["saved"]}
+        result["stats"] = {key: value for key, value in refresher.stats().items() if key != "last_run"}
+        refresher.close()
+        assert client.is_closed
+    finally:
+        server.stop()
+        tmp_dir.cleanup()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+news_articles 스키마 벤치마크: 기존 스키마(published_at 문자열, source 단일 인덱스, OFFSET 페이지네이션)
+vs 새 스키마(published_at DATETIME, (source, published_at DESC) / (click_count DESC) 복합 인덱스, 키셋 페이지네이션).
+
+임시 디렉터리에 같은 합성 기사 N 행을 담은 SQLite DB 두 개를 만들고 뉴스 조회 쿼리 지연 시간과 쿼리 플랜을 비교합니다.
+실행: python -m benchmarks.bench_news_schema --rows 5000000
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.database import Base
+from app.models import db_models  # noqa: F401  (테이블 정의 로딩)
+from benchmarks.harness import latency_summary
+
+SOURCES = ["macro", "반도체", "2차전지", "인공지능", "바이오/제약"]
+LEGACY_DDL = [
+    "CREATE TABLE news_articles (id INTEGER NOT NULL, title VARCHAR, url VARCHAR, published_at VARCHAR,"
+    " source VARCHAR, click_count INTEGER, PRIMARY KEY (id), UNIQUE (url))",
+    "CREATE INDEX ix_news_articles_id ON news_articles (id)",
+    "CREATE INDEX ix_news_articles_title ON news_articles (title)",
+    "CREATE INDEX ix_news_articles_source ON news_articles (source)",
+]
+LEGACY_PAGE = "SELECT * FROM news_articles WHERE source = :source ORDER BY id DESC LIMIT :limit OFFSET :offset"
+LEGACY_BY_DATE = "SELECT * FROM news_articles WHERE source = :source ORDER BY published_at DESC LIMIT :limit OFFSET :offset"
+LEGACY_POPULAR = "SELECT * FROM news_articles ORDER BY click_count DESC LIMIT :limit"
+
+def synthetic_rows(count: int, seed: int = 1):
+    """(id, title, url, published_at, source, click_count) 를 만듭니다. 발행 시각은 수집 순서와 무관하게 섞여 있습니다."""
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    span = 2 * 365 * 86400
+    for i in range(1, count + 1):
+        published_at = start + timedelta(seconds=rng.randrange(span))
+        clicks = int(rng.paretovariate(1.5)) - 1
+        yield i, f"합성 기사 {i}", f"https://example.com/news/{i}", published_at, rng.choice(SOURCES), clicks
+
+def build_db(path: str, rows: int, legacy: bool) -> float:
+    started = time.perf_counter()
+    if legacy:
+        conn = sqlite3.connect(path)
+        for ddl in LEGACY_DDL:
+            conn.execute(ddl)
+        conn.close()
+    else:
+        Base.metadata.create_all(bind=create_engine(f"sqlite:///{path}"))
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    # legacy: API 가 주던 ISO 문자열 그대로 / 새 스키마: SQLAlchemy DateTime 저장 형식
+    fmt = "%Y-%m-%dT%H:%M:%S" if legacy else "%Y-%m-%d %H:%M:%S.%f"
+    batch = []
+    for row in synthetic_rows(rows):
+        batch.append((*row[:3], row[3].strftime(fmt), *row[4:]))
+        if len(batch) >= 50_000:
+            conn.executemany("INSERT INTO news_articles VALUES (?, ?, ?, ?, ?, ?)", batch)
+            batch.clear()
+    if batch:
+        conn.executemany("INSERT INTO news_articles VALUES (?, ?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return time.perf_counter() - started
+
+def timed(func, repeat: int) -> tuple[dict, object]:
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    return latency_summary(samples), result
+
+def query_plan(session, sql: str, params: dict) -> str:
+    return " / ".join(row[-1] for row in session.execute(text("EXPLAIN QUERY PLAN " + sql), params))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=2_000, help="깊은 페이지 번호 (OFFSET = 번호 × page-size)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--legacy-repeat", type=int, default=3, help="기존 스키마의 전체 정렬 쿼리 반복 횟수")
+    args = parser.parse_args()
+
+    source = "macro"
+    limit = args.page_size
+    deep_offset = args.deep_page * limit
+    result = {"rows": args.rows, "page_size": limit, "deep_offset": deep_offset}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, "legacy.db")
+        new_path = os.path.join(tmp_dir, "new.db")
+        result["build_s"] = {
+            "legacy": round(build_db(legacy_path, args.rows, legacy=True), 1),
+            "new": round(build_db(new_path, args.rows, legacy=False), 1),
+        }
+
+        legacy = sessionmaker(bind=create_engine(f"sqlite:///{legacy_path}"))()
+        new = sessionmaker(bind=create_engine(f"sqlite:///{new_path}"))()
+        try:
+            params = {"source": source, "limit": limit, "offset": 0}
+            deep_params = {**params, "offset": deep_offset}
+            # 키셋 커서: 깊은 페이지 직전 기사의 (published_at, id)
+            anchor = crud.get_articles_by_source(new, source, limit=deep_offset)[-1]
+            cursor = (anchor.published_at, anchor.id)
+
+            cases = {
+                "first_page": (
+                    lambda: legacy.execute(text(LEGACY_PAGE), params).all(),
+                    lambda: crud.get_articles_by_source(new, source, limit=limit),
+                    args.repeat,
+                ),
+                "first_page_by_published_at": (
+                    lambda: legacy.execute(text(LEGACY_BY_DATE), params).all(),
+                    lambda: crud.get_articles_by_source(new, source, limit=limit),
+                    args.legacy_repeat,
+                ),
+                "deep_page": (
+                    lambda: legacy.execute(text(LEGACY_BY_DATE), deep_params).all(),
+                    lambda: crud.get_articles_by_source(new, source, limit=limit, before=cursor),
+                    args.legacy_repeat,
+                ),
+                "popular_top5": (
+                    lambda: legacy.execute(text(LEGACY_POPULAR), {"limit": 5}).all(),
+                    lambda: crud.get_top_articles_by_click(new, limit=5),
+                    args.legacy_repeat,
+                ),
+            }
+            for name, (legacy_query, new_query, legacy_repeat) in cases.items():
+                legacy_summary, _ = timed(legacy_query, legacy_repeat)
+                new_summary, rows = timed(new_query, args.repeat)
+                assert len(rows) == (5 if name == "popular_top5" else limit), name
+                result[name] = {"legacy": legacy_summary, "new": new_summary}
+
+            # 키셋 결과가 OFFSET 결과와 같은 기사인지 확인
+            expected = [row.id for row in new.execute(text(
+                "SELECT id FROM news_articles WHERE source = :source ORDER BY published_at DESC, id DESC LIMIT :limit OFFSET :offset"
+            ), deep_params)]
+            assert [a.id for a in crud.get_articles_by_source(new, source, limit=limit, before=cursor)] == expected
+
+            keyset_sql = (
+                "SELECT * FROM news_articles WHERE source = :source AND (published_at, id) < (:published_at, :id)"
+                " ORDER BY published_at DESC, id DESC LIMIT :limit"
+            )
+            result["plans"] = {
+                "legacy_deep_page": query_plan(legacy, LEGACY_BY_DATE, deep_params),
+                "legacy_popular": query_plan(legacy, LEGACY_POPULAR, {"limit": 5}),
+                "new_keyset_page": query_plan(new, keyset_sql, {
+                    "source": source, "published_at": cursor[0].strftime("%Y-%m-%d %H:%M:%S.%f"), "id": cursor[1], "limit": limit,
+                }),
+                "new_popular": query_plan(new, "SELECT * FROM news_articles ORDER BY click_count DESC, id DESC LIMIT 5", {}),
+            }
+        finally:
+            legacy.close()
+            new.close()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
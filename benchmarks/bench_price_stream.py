@@ -0,0 +1,258 @@
+"""
+실시간 시세 WebSocket(/ws/stock/prices) 벤치마크/검증.
+
+로컬 네이버 시세 스텁을 사용합니다. 스텁은 조회할 때마다 현재가가 오르도록 설정합니다.
+앱은 별도 프로세스의 uvicorn 으로 띄우므로 네트워크 없이 실행됩니다.
+확인 항목
+- 팬아웃: 클라이언트 수를 늘려도 업스트림 조회 수는 구독 중인 서로 다른 종목 수 × 조회 주기로 일정한지
+  - 비교 대상: 같은 클라이언트들이 같은 주기로 REST(/api/stock/search) 폴링할 때의 앱 요청 수와 업스트림 조회 수
+- 메시지: 종목마다 첫 메시지는 snapshot(전체 값), 이후 diff 에는 바뀐 필드(현재가)만 들어 있는지
+- 구독 해제: 모든 클라이언트가 떠나면 idle_timeout 뒤 종목별 폴러가 멈추고 업스트림 조회도 멈추는지
+- 느린 클라이언트(프로세스 안에서 PriceStreamHub 를 직접 실행)
+  - 전송이 느리면 밀린 변경분이 종목별로 합쳐지고 최신 값이 전달되는지
+  - 전송이 막히면 send_timeout 뒤 1013 으로 연결을 끊는지 (잘못된 메시지를 계속 보내 오류 응답이 쌓여도 마찬가지인지)
+실행: python -m benchmarks.bench_price_stream --clients 200 --tickers 20 --codes-per-client 5 --seconds 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+INTERVAL = 0.25
+IDLE_TIMEOUT = 1.0
+
+async def run_websocket_clients(base_url: str, subscriptions: list[list[str]], seconds: float) -> dict:
+    import websockets
+
+    url = base_url.replace("http://", "ws://") + "/ws/stock/prices"
+    messages = {"snapshot": 0, "diff": 0, "error": 0}
+    diff_fields: set[str] = set()
+    order_errors = 0
+    connections = []
+    for codes in subscriptions:
+        connections.append(await websockets.connect(f"{url}?codes={','.join(codes)}", max_queue=None))
+
+    async def read(connection, codes: list[str]):
+        nonlocal order_errors
+        seen: set[str] = set()
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                message = json.loads(await asyncio.wait_for(connection.recv(), remaining))
+            except asyncio.TimeoutError:
+                return
+            messages[message["type"]] += 1
+            if message["type"] == "snapshot":
+                seen.add(message["code"])
+            elif message["type"] == "diff":
+                if message["code"] not in seen:
+                    order_errors += 1
+                diff_fields.update(message["data"])
+
+    await asyncio.gather(*(read(connection, codes) for connection, codes in zip(connections, subscriptions)))
+    for connection in connections:
+        await connection.close()
+    return {"messages": messages, "diff_fields": sorted(diff_fields), "diff_before_snapshot": order_errors}
+
+async def run_rest_polling(base_url: str, subscriptions: list[list[str]], seconds: float) -> int:
+    """같은 클라이언트들이 INTERVAL 주기로 구독 종목을 REST 로 폴링합니다. 보낸 요청 수를 반환합니다."""
+    import httpx
+
+    requests = 0
+    async with httpx.AsyncClient(base_url=base_url, limits=httpx.Limits(max_connections=200), timeout=30) as client:
+        deadline = time.monotonic() + seconds
+
+        async def poll(codes: list[str]):
+            nonlocal requests
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                await asyncio.gather(*(client.get(f"/api/stock/search/{code}") for code in codes))
+                requests += len(codes)
+                await asyncio.sleep(max(0.0, INTERVAL - (time.monotonic() - started)))
+
+        await asyncio.gather(*(poll(codes) for codes in subscriptions))
+    return requests
+
+async def price_stream_stats(base_url: str) -> dict:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        return (await client.get("/api/system/stats")).json()["price_stream"]
+
+class _StubWebSocket:
+    """
+    PriceStreamHub.serve 에 넘기는 WebSocket 대역. 보낸 메시지를 기록하고 send_delay 만큼 전송을 늦춥니다.
+    incoming 을 주면 클라이언트가 그 메시지를 0.01초 간격으로 계속 보내는 것처럼 동작합니다.
+    """
+
+    def __init__(self, send_delay: float, incoming: str | None = None):
+        self.send_delay = send_delay
+        self.incoming = incoming
+        self.received = 0
+        self.sent: list[dict] = []
+        self.close_code = None
+
+    async def send_json(self, message: dict):
+        await asyncio.sleep(self.send_delay)
+        self.sent.append(message)
+
+    async def receive_text(self) -> str:
+        if self.incoming is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(0.01)
+        self.received += 1
+        return self.incoming
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+async def slow_consumers(naver) -> dict:
+    from app.core import stock_info
+    from app.services.price_stream import PriceStreamHub
+
+    result = {}
+    # 1) 느리지만 살아 있는 클라이언트: 전송 0.3초, 조회 주기 0.02초 → 밀린 변경분은 합쳐서 최신 값만 보냄
+    hub = PriceStreamHub(interval=0.02, idle_timeout=0.1, send_timeout=2.0)
+    websocket = _StubWebSocket(send_delay=0.3)
+    task = asyncio.create_task(hub.serve(websocket, ["005930"]))
+    await asyncio.sleep(2.0)
+    # 시세 변화를 멈추고 밀린 전송이 끝나면 마지막으로 받은 값이 최신 값이어야 합니다.
+    naver.price_step = 0
+    await asyncio.sleep(1.0)
+    latest_price = hub._latest["005930"]["price"]
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    received_prices = [message["data"]["price"] for message in websocket.sent if "price" in message["data"]]
+    assert websocket.sent[0]["type"] == "snapshot"
+    assert hub.conflated > 0 and len(websocket.sent) < hub.polls, (len(websocket.sent), hub.polls)
+    assert received_prices[-1] == latest_price, (latest_price, received_prices[-3:])
+    result["slow_client"] = {
+        "polls": hub.polls,
+        "messages_sent": len(websocket.sent),
+        "conflated_updates": hub.conflated,
+        "received_latest_price": True,
+    }
+    await hub.close()
+
+    # 2) 전송이 막힌 클라이언트: send_timeout 뒤 1013 으로 끊고 구독 해제 → 폴러 정지
+    hub = PriceStreamHub(interval=0.05, idle_timeout=0.2, send_timeout=0.5)
+    websocket = _StubWebSocket(send_delay=3600)
+    started = time.perf_counter()
+    await asyncio.wait_for(hub.serve(websocket, ["000660"]), 5)
+    disconnected_after = time.perf_counter() - started
+    await asyncio.sleep(0.5)
+    assert websocket.close_code == 1013 and hub.slow_disconnects == 1
+    assert hub.stats()["codes"] == 0, hub.stats()
+    result["stuck_client"] = {
+        "disconnected_after_s": round(disconnected_after, 2),
+        "close_code": websocket.close_code,
+        "pollers_after_idle": hub.stats()["codes"],
+    }
+
+    # 3) 구독 없이 잘못된 메시지만 계속 보내고 읽지는 않는 클라이언트: 오류 응답도 send loop 로만 보내므로 send_timeout 뒤 끊김
+    hub = PriceStreamHub(interval=0.05, idle_timeout=0.2, send_timeout=0.5)
+    websocket = _StubWebSocket(send_delay=3600, incoming="not json")
+    started = time.perf_counter()
+    await asyncio.wait_for(hub.serve(websocket, []), 5)
+    disconnected_after = time.perf_counter() - started
+    assert websocket.close_code == 1013 and hub.slow_disconnects == 1 and websocket.received > 10, (websocket.close_code, websocket.received)
+    result["stuck_client_sending_errors"] = {
+        "disconnected_after_s": round(disconnected_after, 2),
+        "close_code": websocket.close_code,
+        "messages_received": websocket.received,
+    }
+    await hub.close()
+    await stock_info.http_client.close_async_client()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--codes-per-client", type=int, default=5)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from benchmarks.fakes import FakeNaverStockServer
+    from benchmarks.harness import serve_app_process
+
+    naver = FakeNaverStockServer(price_step=10, latency=0.02).start()
+    tmp_dir = tempfile.TemporaryDirectory()
+    os.environ["NAVER_STOCK_API_BASE_URL"] = naver.stock_api_base_url
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp_dir.name, 'price_stream.db')}",
+        "NAVER_STOCK_API_BASE_URL": naver.stock_api_base_url,
+        # 스케줄러의 다른 수집 작업은 닫힌 로컬 포트로 보내 바로 실패하게 합니다.
+        "DEEPSEARCH_API_BASE_URL": "http://127.0.0.1:9",
+        "FRED_API_BASE_URL": "http://127.0.0.1:9/fred",
+        "FRED_STORE_DIR": os.path.join(tmp_dir.name, "fred"),
+        "STOCK_SYMBOLS_SOURCE": "csv",
+        "STOCK_SYMBOLS_CSV": os.path.join(tmp_dir.name, "missing.csv"),
+        "PRICE_STREAM_INTERVAL": str(INTERVAL),
+        "PRICE_STREAM_IDLE_TIMEOUT": str(IDLE_TIMEOUT),
+        "STOCK_QUOTE_CACHE_TTL": "5",
+    }
+    rng = random.Random(5)
+    tickers = [f"{100000 + i * 37:06d}" for i in range(args.tickers)]
+
+    def subscriptions(clients: int) -> list[list[str]]:
+        return [rng.sample(tickers, args.codes_per_client) for _ in range(clients)]
+
+    result = {"clients": args.clients, "tickers": args.tickers, "codes_per_client": args.codes_per_client, "interval_s": INTERVAL}
+    try:
+        with serve_app_process(env) as base_url:
+            # 1) 팬아웃: 클라이언트 수를 늘려도 업스트림 조회 수는 그대로
+            fanout = {}
+            for clients in (max(1, args.clients // 10), args.clients):
+                subs = subscriptions(clients)
+                distinct = len({code for codes in subs for code in codes})
+                naver.reset_hits()
+                ws = asyncio.run(run_websocket_clients(base_url, subs, args.seconds))
+                upstream = naver.hits
+                assert ws["diff_fields"] == ["price"] and not ws["diff_before_snapshot"] and not ws["messages"]["error"], ws
+                fanout[f"{clients}_clients"] = {
+                    "distinct_codes": distinct,
+                    "upstream_hits": upstream,
+                    "upstream_hits_per_code_per_s": round(upstream / distinct / args.seconds, 2),
+                    **ws,
+                }
+                # 2) 구독 해제: 모두 떠나면 idle_timeout 뒤 폴러가 멈추고 업스트림 조회도 멈춤
+                time.sleep(IDLE_TIMEOUT + INTERVAL * 4)
+                stats = asyncio.run(price_stream_stats(base_url))
+                hits = naver.hits
+                time.sleep(INTERVAL * 4)
+                assert stats["codes"] == 0 and stats["connections"] == 0, stats
+                assert naver.hits == hits, (naver.hits, hits)
+                fanout[f"{clients}_clients"]["pollers_after_idle"] = stats["codes"]
+            small, large = fanout.values()
+            # 폴러는 코드당 주기마다 1회 → 클라이언트 수가 10배여도 코드당 조회율은 비슷해야 합니다.
+            assert large["upstream_hits_per_code_per_s"] <= small["upstream_hits_per_code_per_s"] * 1.5, fanout
+            result["websocket"] = fanout
+
+            # 3) 같은 조건의 REST 폴링 (시세 캐시 TTL 5초)
+            subs = subscriptions(args.clients)
+            naver.reset_hits()
+            requests = asyncio.run(run_rest_polling(base_url, subs, args.seconds))
+            result["rest_polling"] = {
+                "app_requests": requests,
+                "app_requests_per_s": round(requests / args.seconds, 1),
+                "upstream_hits": naver.hits,
+                "note": "시세 캐시 TTL 동안은 같은 값을 돌려주므로, 폴링 주기보다 늦게 바뀐 값을 봅니다.",
+            }
+            result["server_stats"] = asyncio.run(price_stream_stats(base_url))
+
+        # 4) 느린 클라이언트 (프로세스 안에서 허브 직접 실행)
+        result["backpressure"] = asyncio.run(slow_consumers(naver))
+    finally:
+        naver.stop()
+        tmp_dir.cleanup()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
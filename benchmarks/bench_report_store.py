@@ -0,0 +1,93 @@
+"""
+보고서 저장소 벤치마크: 기존 reports/{uuid}.txt 파일 방식 vs SQLite(zlib 압축) 저장소.
+
+임시 디렉터리에 합성 보고서 N개를 만들고, migrate_reports 로 SQLite 저장소에 옮긴 뒤
+무작위 읽기(LRU 없음)와 핫 리포트 반복 읽기(LRU 사용) 지연 시간, 디스크 사용량을 비교합니다.
+실행: python -m benchmarks.bench_report_store --reports 100000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from app.core.report_store import FileReportStore, SQLiteReportStore
+from benchmarks.harness import latency_summary
+from migrate_reports import migrate
+
+SENTENCES = [
+    "미국 기준 금리 동결로 단기 변동성은 제한적일 것으로 보입니다.",
+    "2022년 금리인상기와 비교하면 실적 모멘텀이 더 견조합니다.",
+    "환율 상승은 수출 비중이 높은 기업에 우호적으로 작용합니다.",
+    "관세 협상 결과에 따라 반도체 업종의 밸류에이션이 재평가될 수 있습니다.",
+    "빅컷 시그널이 나타나면 경기 침체 우려로 위험 자산 선호가 약해질 수 있습니다.",
+]
+
+def synthetic_report(rng: random.Random) -> str:
+    return "\n".join(rng.choice(SENTENCES) for _ in range(rng.randint(15, 30)))
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+def measure_reads(store, report_ids: list[str]) -> dict:
+    samples = []
+    for report_id in report_ids:
+        started = time.perf_counter()
+        text = store.get(report_id)
+        samples.append(time.perf_counter() - started)
+        assert text, report_id
+    return latency_summary(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=5_000)
+    parser.add_argument("--hot", type=int, default=100, help="반복해서 읽히는 핫 리포트 수")
+    parser.add_argument("--cache-size", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    report_ids = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(args.reports)]
+    random_reads = [rng.choice(report_ids) for _ in range(args.reads)]
+    hot_ids = report_ids[:args.hot]
+    hot_reads = [rng.choice(hot_ids) for _ in range(args.reads)]
+
+    result = {"reports": args.reports, "reads": args.reads}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files_dir = os.path.join(tmp_dir, "reports")
+        file_store = FileReportStore(files_dir, cache_size=0)
+        started = time.perf_counter()
+        for report_id in report_ids:
+            file_store.put(report_id, synthetic_report(rng))
+        result["files_write_s"] = round(time.perf_counter() - started, 2)
+
+        db_path = os.path.join(tmp_dir, "reports.db")
+        started = time.perf_counter()
+        migrated = migrate(files_dir, SQLiteReportStore(db_path, cache_size=0), batch_size=5000)
+        result["migrate_s"] = round(time.perf_counter() - started, 2)
+        assert migrated == args.reports, migrated
+
+        result["disk_bytes"] = {
+            "files": directory_size(files_dir),
+            "sqlite": sum(os.path.getsize(db_path + suffix) for suffix in ("", "-wal") if os.path.exists(db_path + suffix)),
+        }
+        result["random_read"] = {
+            "files": measure_reads(file_store, random_reads),
+            "sqlite": measure_reads(SQLiteReportStore(db_path, cache_size=0), random_reads),
+        }
+        cached_store = SQLiteReportStore(db_path, cache_size=args.cache_size)
+        result["hot_read"] = {
+            "files": measure_reads(file_store, hot_reads),
+            "sqlite_lru": measure_reads(cached_store, hot_reads),
+        }
+        result["lru"] = cached_store.stats()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
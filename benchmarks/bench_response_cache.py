@@ -0,0 +1,146 @@
+"""
+조회 API 응답 캐시 벤치마크/검증: /api/news/macro, /api/news/popular, /api/themes, /api/keywords/top
+
+임시 SQLite DB 에 기사를 채우고 앱을 프로세스 안(ASGI)에서 호출하므로 네트워크 없이 실행됩니다.
+SQLAlchemy 이벤트로 실행된 SQL 문 수를 셉니다.
+확인 항목
+- 캐시 없이(요청마다 다시 만들기) vs 캐시 적중 시 지연, 적중 구간의 DB 쿼리 수 = 0
+- If-None-Match 로 304 응답
+- 기사 저장(crud) / 클릭 반영 / 검색어 기록 / 스케줄러 재생성 후 바로 새 응답이 나오는지
+실행: python -m benchmarks.bench_response_cache --articles 20000 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ENDPOINTS = {
+    "news_macro": "/api/news/macro",
+    "news_popular": "/api/news/popular",
+    "themes": "/api/themes",
+    "keywords_top": "/api/keywords/top",
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000, help="엔드포인트별 요청 수")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir.name, 'response_cache.db')}"
+
+    import httpx
+    from sqlalchemy import event, insert
+
+    from app import crud
+    from app.core.response_cache import response_cache
+    from app.database import SessionLocal, engine, init_db, read_engine
+    from app.main import app
+    from app.models import db_models, schemas
+    from app.services.click_counter import click_counter
+    from app.services.keyword_ranking import keyword_ranking
+    from app.services.scheduler import refresh_news_job  # noqa: F401  (스케줄러 모듈이 임포트되는지 확인)
+    from benchmarks.harness import latency_summary
+
+    init_db()
+    base = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(db_models.NewsArticle), [
+            {
+                "title": f"기사 {i}", "url": f"https://example.com/{i}", "published_at": base + timedelta(minutes=i),
+                "source": "macro" if i % 4 == 0 else f"테마{i % 7}", "click_count": (i * 7919) % 1000,
+            }
+            for i in range(args.articles)
+        ])
+    for i in range(200):
+        keyword_ranking.record(f"검색어{i % 37}")
+
+    queries = {"count": 0}
+    for target in {engine, read_engine}:
+        event.listen(target, "before_cursor_execute", lambda *a, **k: queries.__setitem__("count", queries["count"] + 1))
+
+    async def timed_requests(client, path: str, count: int, invalidate: str | None = None) -> tuple[list[float], int]:
+        samples = []
+        before = queries["count"]
+        for _ in range(count):
+            if invalidate:
+                response_cache.invalidate(invalidate)
+            started = time.perf_counter()
+            response = await client.get(path)
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, (path, response.status_code)
+        return samples, queries["count"] - before
+
+    async def scenario() -> dict:
+        result = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # 1) 캐시 없이 (요청마다 비우고 다시 만들기 = 기존처럼 세션 열기/조회/직렬화) vs 캐시 적중
+            for name, path in ENDPOINTS.items():
+                uncached, uncached_queries = await timed_requests(client, path, args.requests // 4, invalidate=name)
+                await client.get(path)
+                cached, cached_queries = await timed_requests(client, path, args.requests)
+                assert cached_queries == 0, (name, cached_queries)
+                result[name] = {
+                    "uncached": {**latency_summary(uncached), "db_queries_per_request": round(uncached_queries / len(uncached), 2)},
+                    "cached": {**latency_summary(cached), "db_queries_per_request": cached_queries / len(cached)},
+                }
+
+            # 2) ETag / 304
+            response = await client.get("/api/news/macro")
+            etag = response.headers["etag"]
+            conditional = await client.get("/api/news/macro", headers={"If-None-Match": etag})
+            assert conditional.status_code == 304 and not conditional.content, conditional.status_code
+            result["conditional"] = {"status": conditional.status_code, "etag": etag}
+
+            # 3) 쓰기 후 바로 새 응답
+            freshness = {}
+            db = SessionLocal()
+            try:
+                new_article = schemas.NewsArticle(id=0, title="새 거시 기사", url="https://example.com/new", published_at=datetime(2030, 1, 1), click_count=0)
+                crud.create_news_articles(db, [new_article], source="macro")
+            finally:
+                db.close()
+            latest = (await client.get("/api/news/macro", headers={"If-None-Match": etag})).json()
+            assert latest[0]["title"] == "새 거시 기사", latest[0]
+            freshness["macro_after_insert"] = latest[0]["title"]
+
+            popular = (await client.get("/api/news/popular")).json()
+            target_id = popular[-1]["id"]
+            for _ in range(5000):
+                click_counter.record(target_id)
+            # 반영 전에는 캐시된 순위 (클릭 반영 주기만큼 늦을 수 있음), 반영 후에는 바로 1위
+            assert (await client.get("/api/news/popular")).json()[0]["id"] != target_id
+            click_counter.flush()
+            popular = (await client.get("/api/news/popular")).json()
+            assert popular[0]["id"] == target_id, popular[0]
+            freshness["popular_after_click_flush"] = {"id": popular[0]["id"], "click_count": popular[0]["click_count"]}
+
+            for _ in range(500):
+                keyword_ranking.record("새 인기 검색어")
+            top = (await client.get("/api/keywords/top")).json()
+            assert top[0]["keyword"] == "새 인기 검색어", top[0]
+            freshness["keywords_after_search"] = top[0]
+
+            # 스케줄러 작업처럼 다른 스레드에서 다시 만들어 두면 다음 요청은 DB 조회 없이 응답
+            await asyncio.to_thread(response_cache.rebuild, "news_macro")
+            before = queries["count"]
+            await client.get("/api/news/macro")
+            assert queries["count"] == before
+            freshness["macro_after_rebuild_db_queries"] = queries["count"] - before
+            result["freshness"] = freshness
+        return result
+
+    try:
+        result = {"articles": args.articles, "requests_per_endpoint": args.requests, **asyncio.run(scenario())}
+        result["stats"] = response_cache.stats()
+    finally:
+        tmp_dir.cleanup()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+스케줄러 리더 선출 검증: 여러 워커 프로세스가 하나의 SQLite 파일을 공유할 때
+수집 작업이 리더 한 곳에서만 실행되는지, 리더가 죽거나 종료되면 다른 워커가 넘겨받는지 확인합니다.
+
+각 워커는 실제 scheduler_lease(LeaderLease)로 리스를 연장하면서, leader_only 로 감싼 작업을 짧은 주기로 실행해
+공유 로그 파일에 기록합니다. 부모 프로세스는 리더를 SIGKILL(장애) / SIGTERM(정상 종료) 한 뒤
+넘겨받는 데 걸린 시간과 두 워커가 동시에 작업을 실행한 구간이 없는지를 확인합니다.
+실행: python -m benchmarks.bench_scheduler_leader --workers 4 --ttl 2
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+def run_worker(args):
+    # 설정은 import 시점에 읽히므로, app 모듈을 불러오기 전에 환경 변수를 지정합니다.
+    os.environ["DATABASE_URL"] = args.db
+    os.environ["LEADER_LEASE_TTL"] = str(args.ttl)
+
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from app.services.leader_election import scheduler_lease
+
+    def log(event: str):
+        with open(args.log, "a") as f:
+            f.write(f"{time.time():.4f} {os.getpid()} {event}\n")
+
+    def collect_job():
+        log("tick")
+
+    def stop(signum, frame):
+        scheduler.shutdown(wait=False)
+        scheduler_lease.release()
+        log("released")
+        sys.exit(0)
+
+    scheduler_lease.on_elected(lambda: log("elected"))
+    scheduler = BackgroundScheduler(daemon=True)
+    scheduler.add_job(scheduler_lease.leader_only(collect_job), "interval", seconds=args.tick, id="collect_job")
+    scheduler.add_job(scheduler_lease.renew, "interval", seconds=args.renew, id="leader_lease_job")
+    signal.signal(signal.SIGTERM, stop)
+    scheduler.start()
+    scheduler_lease.renew()
+    while True:
+        time.sleep(1)
+
+def read_events(path: str) -> list[tuple[float, int, str]]:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [(float(ts), int(pid), event) for ts, pid, event in (line.split() for line in f if line.strip())]
+
+def ticks_by_pid(events, since: float = 0.0) -> dict[int, int]:
+    counts: dict[int, int] = {}
+    for ts, pid, event in events:
+        if event == "tick" and ts >= since:
+            counts[pid] = counts.get(pid, 0) + 1
+    return counts
+
+def wait_for_new_leader(log_path: str, old_leader: int, since: float, timeout: float) -> tuple[int, float]:
+    """since 이후 old_leader 가 아닌 워커가 처음 작업을 실행할 때까지 기다립니다. (새 리더 PID, 걸린 시간)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        for ts, pid, event in read_events(log_path):
+            if event == "tick" and ts >= since and pid != old_leader:
+                return pid, ts - since
+        time.sleep(0.05)
+    raise AssertionError(f"{timeout}s 안에 새 리더가 작업을 실행하지 않았습니다.")
+
+def check_no_overlap(events) -> int:
+    """
+    리더가 바뀐 뒤 이전 리더가 다시 작업을 실행한 적이 없는지 확인합니다.
+    (같은 시각대에 두 워커가 번갈아 실행했다면 split-brain) 리더 교체 횟수를 반환합니다.
+    """
+    ticks = [(ts, pid) for ts, pid, event in events if event == "tick"]
+    finished: set[int] = set()
+    current, handovers = None, 0
+    for ts, pid in ticks:
+        if pid == current:
+            continue
+        assert pid not in finished, f"이전 리더 {pid} 가 교체 후 다시 작업을 실행했습니다. ({ts})"
+        if current is not None:
+            finished.add(current)
+            handovers += 1
+        current = pid
+    return handovers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ttl", type=float, default=2.0, help="리더 리스 TTL(초)")
+    parser.add_argument("--renew", type=float, default=0.5, help="리스 연장 주기(초)")
+    parser.add_argument("--tick", type=float, default=0.1, help="리더 전용 작업 실행 주기(초)")
+    parser.add_argument("--steady", type=float, default=3.0, help="각 단계에서 리더가 작업을 실행하도록 둘 시간(초)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--log", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        run_worker(args)
+        return
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_url = f"sqlite:///{os.path.join(tmp_dir.name, 'lease.db')}"
+    log_path = os.path.join(tmp_dir.name, "jobs.log")
+
+    os.environ["DATABASE_URL"] = db_url
+    from app.database import Base, engine
+    from app.models import db_models  # noqa: F401  (테이블 정의 로딩)
+    Base.metadata.create_all(bind=engine)
+
+    def spawn():
+        return subprocess.Popen([
+            sys.executable, "-m", "benchmarks.bench_scheduler_leader", "--worker",
+            "--db", db_url, "--log", log_path,
+            "--ttl", str(args.ttl), "--renew", str(args.renew), "--tick", str(args.tick),
+        ])
+
+    workers = {p.pid: p for p in (spawn() for _ in range(args.workers))}
+    result = {"workers": args.workers, "ttl_s": args.ttl, "renew_interval_s": args.renew}
+    try:
+        # 1단계: 평상시에는 한 워커만 작업을 실행해야 합니다. (워커들이 모두 뜬 뒤부터 확인)
+        deadline = time.time() + 60
+        while len(ticks_by_pid(read_events(log_path))) == 0 and time.time() < deadline:
+            time.sleep(0.1)
+        time.sleep(args.steady)
+        steady_since = time.time() - args.steady / 2
+        counts = ticks_by_pid(read_events(log_path), since=steady_since)
+        assert len(counts) == 1, f"여러 워커가 동시에 작업을 실행했습니다: {counts}"
+        leader = next(iter(counts))
+        result["steady_state"] = {"leaders": len(counts), "ticks": counts[leader]}
+
+        # 2단계: 리더 장애 (SIGKILL) — 리스가 만료된 뒤 다른 워커가 넘겨받아야 합니다.
+        killed_at = time.time()
+        os.kill(leader, signal.SIGKILL)
+        workers.pop(leader).wait()
+        leader, elapsed = wait_for_new_leader(log_path, leader, killed_at, timeout=args.ttl * 3 + args.renew)
+        assert elapsed <= args.ttl + args.renew + args.tick + 0.5, f"장애 조치가 너무 늦습니다: {elapsed:.2f}s"
+        result["failover_after_kill_s"] = round(elapsed, 3)
+
+        # 3단계: 리더 정상 종료 (SIGTERM) — 리스를 반납하므로 TTL 을 기다리지 않고 넘겨받아야 합니다.
+        time.sleep(args.steady)
+        stopped_at = time.time()
+        workers.pop(leader).send_signal(signal.SIGTERM)
+        leader, elapsed = wait_for_new_leader(log_path, leader, stopped_at, timeout=args.ttl * 3 + args.renew)
+        assert elapsed <= args.renew + args.tick + 0.5, f"정상 종료 후 인계가 너무 늦습니다: {elapsed:.2f}s"
+        result["failover_after_release_s"] = round(elapsed, 3)
+
+        time.sleep(args.steady)
+        events = read_events(log_path)
+        result["handovers"] = check_no_overlap(events)
+        result["elections"] = sum(1 for _, _, event in events if event == "elected")
+        result["ticks_by_worker"] = {str(pid): count for pid, count in ticks_by_pid(events).items()}
+    finally:
+        for process in workers.values():
+            process.kill()
+            process.wait()
+        tmp_dir.cleanup()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
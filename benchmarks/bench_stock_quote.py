@@ -0,0 +1,106 @@
+"""
+종목 시세 조회 벤치마크: 기존 경로(urllib 동기 호출 + 스레드풀) vs 비동기 풀링 엔진(+TTL 캐시).
+
+로컬 네이버 스텁 서버를 띄워 네트워크 없이 실행됩니다.
+실행: python -m benchmarks.bench_stock_quote --requests 2000 --concurrency 64 --tickers 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fakes import FakeNaverStockServer
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(name: str, latencies: list[float], elapsed: float, upstream_hits: int) -> dict:
+    return {
+        "name": name,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "upstream_hits": upstream_hits,
+    }
+
+def legacy_fetch(base_url: str, stock_code: str) -> dict:
+    """기존 구현과 같은 방식: 요청마다 urllib 로 새 커넥션을 맺고 블로킹 호출합니다."""
+    url = f"{base_url}/{stock_code}/integration"
+    raw_data = urllib.request.urlopen(url).read()
+    return json.loads(raw_data)
+
+def run_legacy(base_url: str, codes: list[str], concurrency: int) -> tuple[list[float], float]:
+    def one(code):
+        started = time.perf_counter()
+        legacy_fetch(base_url, code)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    # FastAPI 의 동기 핸들러는 기본 스레드풀(40개)에서 실행되므로 같은 조건으로 맞춥니다.
+    with ThreadPoolExecutor(max_workers=min(concurrency, 40)) as pool:
+        latencies = list(pool.map(one, codes))
+    return latencies, time.perf_counter() - started
+
+async def run_async(fetch, codes: list[str], concurrency: int) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(code):
+        async with semaphore:
+            started = time.perf_counter()
+            await fetch(code)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(code) for code in codes))
+    return latencies, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--tickers", type=int, default=20, help="요청이 분산될 인기 종목 수")
+    parser.add_argument("--latency", type=float, default=0.02, help="스텁 서버 응답 지연(초)")
+    args = parser.parse_args()
+
+    with FakeNaverStockServer(latency=args.latency) as server:
+        os.environ["NAVER_STOCK_API_BASE_URL"] = server.stock_api_base_url
+        # 설정값이 스텁 주소를 가리키도록 한 뒤에 앱 모듈을 임포트합니다.
+        from app.core import http_client, stock_info
+
+        random.seed(0)
+        hot_codes = [f"{100000 + i:06d}" for i in range(args.tickers)]
+        codes = [random.choice(hot_codes) for _ in range(args.requests)]
+        results = []
+
+        latencies, elapsed = run_legacy(server.stock_api_base_url, codes, args.concurrency)
+        results.append(summarize("legacy_urllib_threadpool", latencies, elapsed, server.hits))
+
+        async def run_engine():
+            server.reset_hits()
+            latencies, elapsed = await run_async(stock_info.fetch_stock_details, codes, args.concurrency)
+            results.append(summarize("async_pooled_no_cache", latencies, elapsed, server.hits))
+
+            server.reset_hits()
+            stock_info.quote_cache.invalidate()
+            latencies, elapsed = await run_async(stock_info.get_stock_details_from_naver, codes, args.concurrency)
+            results.append(summarize("async_pooled_ttl_cache", latencies, elapsed, server.hits))
+            await http_client.close_async_client()
+
+        asyncio.run(run_engine())
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+종목명 → 종목 코드 해석 벤치마크/검증: 매 요청 DeepSearch 조회(기존) vs 메모리 종목 색인.
+
+KRX 상장 목록과 비슷한 규모의 합성 종목 목록(실제 대표 종목 포함)을 CSV 로 만들어
+StockSymbolDirectory.refresh_from_source("csv") → DB → 색인 경로로 적재합니다.
+DeepSearch 는 로컬 스텁(요청당 지연 설정)을 사용하므로 네트워크 없이 실행됩니다.
+확인 항목
+- 정확히 일치/코드/접두어/초성/오타 허용 해석 결과와 조회 시간(µs)
+- 색인에 없는 이름만 DeepSearch 로 조회하고, 한 번 찾은 이름은 다시 조회하지 않는지
+- 자동완성 API(/api/stock/autocomplete) 응답
+실행: python -m benchmarks.bench_symbol_index --symbols 3000
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+REAL_SYMBOLS = [
+    ("삼성전자", "005930"), ("삼성전자우", "005935"), ("SK하이닉스", "000660"), ("LG에너지솔루션", "373220"),
+    ("삼성바이오로직스", "207940"), ("현대차", "005380"), ("기아", "000270"), ("NAVER", "035420"),
+    ("카카오", "035720"), ("셀트리온", "068270"), ("POSCO홀딩스", "005490"), ("삼성SDI", "006400"),
+    ("LG화학", "051910"), ("KB금융", "105560"), ("신한지주", "055550"), ("한화에어로스페이스", "012450"),
+]
+PREFIXES = ["한국", "대한", "동양", "서울", "미래", "신성", "태양", "우리", "하나", "제일", "대성", "한솔", "동부", "삼화", "금호", "세원", "에코", "오리온", "코스모", "유니"]
+SUFFIXES = ["전자", "화학", "바이오", "제약", "건설", "중공업", "에너지", "반도체", "홀딩스", "소재", "로보틱스", "정밀", "산업", "테크", "네트웍스", "푸드", "시스템", "머티리얼즈"]
+
+def synthetic_listing(count: int, seed: int = 11) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    symbols = list(REAL_SYMBOLS)
+    names = {name for name, _ in symbols}
+    codes = {code for _, code in symbols}
+    while len(symbols) < count:
+        name = rng.choice(PREFIXES) + rng.choice(SUFFIXES) + rng.choice(["", "", "우", str(rng.randint(1, 9))])
+        code = f"{rng.randrange(1, 999999):06d}"
+        if name not in names and code not in codes:
+            names.add(name)
+            codes.add(code)
+            symbols.append((name, code))
+    return symbols
+
+def time_per_call(func, queries: list[str], repeat: int = 200) -> float:
+    """질의 1건당 평균 시간(µs)."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            func(query)
+    return round((time.perf_counter() - started) / (repeat * len(queries)) * 1e6, 2)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.08, help="DeepSearch 요청당 지연(초)")
+    args = parser.parse_args()
+
+    from benchmarks.fakes import FakeDeepSearchServer
+    from benchmarks.harness import serve_app
+
+    listing = synthetic_listing(args.symbols)
+    # DeepSearch 에만 있는 종목 (상장 목록 이후 신규 상장 등) → 원격 조회 경로 확인용
+    remote_only = {"새로상장바이오": "499990"}
+    server = FakeDeepSearchServer([], companies={**dict(listing), **remote_only}, latency=args.latency).start()
+    tmp_dir = tempfile.TemporaryDirectory()
+    csv_path = os.path.join(tmp_dir.name, "stock_symbols.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Code", "Name"])
+        writer.writerows((code, name) for name, code in listing)
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir.name, 'symbols.db')}"
+    os.environ["DEEPSEARCH_API_BASE_URL"] = server.deepsearch_api_base_url
+    os.environ["STOCK_SYMBOLS_CSV"] = csv_path
+
+    from app.core import stock_info
+    from app.services.stock_symbols import StockSymbolDirectory, stock_symbols
+
+    result = {"symbols": args.symbols, "upstream_latency_ms": args.latency * 1000}
+    try:
+        from app.database import init_db
+
+        init_db()
+
+        started = time.perf_counter()
+        saved = stock_symbols.refresh_from_source("csv")
+        result["load"] = {"saved": saved, "refresh_ms": round((time.perf_counter() - started) * 1000, 2), "index_build_ms": stock_symbols.build_ms}
+        # 다른 워커: 원본을 다시 받지 않고 DB 에서 색인만 만듭니다.
+        other_worker = StockSymbolDirectory()
+        assert other_worker.load_from_db() == saved == len(stock_symbols.index)
+
+        index = stock_symbols.index
+        expectations = {
+            "삼성전자": ("005930", "exact"),
+            "삼성 전자": ("005930", "exact"),
+            "005930": ("005930", "code"),
+            "sk하이닉스": ("000660", "exact"),
+            "카카": ("035720", "prefix"),
+            "한화에어로": ("012450", "prefix"),
+            "ㅅㅅㅈㅈ": ("005930", "chosung"),
+            "삼성ㅂㅇ": ("207940", "chosung"),
+            "셀트리언": ("068270", "fuzzy"),
+            "삼성바이오로직": ("207940", "prefix"),
+            "엘지화학": None,
+        }
+        resolved = {}
+        for query, expected in expectations.items():
+            match = index.resolve(query)
+            resolved[query] = match and f"{match.name} {match.code} ({match.match}, {match.score})"
+            if expected is None:
+                assert match is None or match.code != "051910", (query, match)
+            else:
+                assert match is not None and (match.code, match.match) == expected, (query, match, expected)
+        result["resolved"] = resolved
+
+        queries = {
+            "exact": ["삼성전자", "카카오", "NAVER", "기아"],
+            "prefix": ["카카", "한화에어", "셀트", "POSCO"],
+            "chosung": ["ㅅㅅㅈㅈ", "ㅋㅋㅇ", "삼성ㅂㅇ"],
+            "fuzzy": ["셀트리언", "삼송전자", "한화에어로스페아스"],
+        }
+        result["resolve_us_per_call"] = {kind: time_per_call(index.resolve, items) for kind, items in queries.items()}
+        result["suggest_us_per_call"] = time_per_call(lambda q: index.suggest(q, limit=10), ["삼", "ㅅㅅ", "한국전", "바이오"], repeat=50)
+
+        # 기존: 요청마다 DeepSearch 조회
+        names = [name for name, _ in REAL_SYMBOLS] * 5
+        server.reset_hits()
+        started = time.perf_counter()
+        for name in names:
+            assert stock_info.get_stock_code_by_name(name) == dict(listing)[name]
+        result["legacy_remote_per_lookup_ms"] = round((time.perf_counter() - started) / len(names) * 1000, 2)
+
+        # 색인: 목록에 있는 이름은 원격 조회 없음, 없는 이름은 한 번만 원격 조회
+        server.reset_hits()
+
+        async def resolve_all():
+            for name in names + ["새로상장바이오"] * 3:
+                code = await stock_symbols.resolve(name)
+                assert code == {**dict(listing), **remote_only}[name], (name, code)
+
+        started = time.perf_counter()
+        asyncio.run(resolve_all())
+        result["index_per_lookup_ms"] = round((time.perf_counter() - started) / (len(names) + 3) * 1000, 4)
+        assert server.hits == 1 and stock_symbols.remote_lookups == 1, (server.hits, stock_symbols.stats())
+        result["remote_calls_with_index"] = server.hits
+
+        with serve_app() as base_url:
+            import httpx
+
+            response = httpx.get(f"{base_url}/api/stock/autocomplete", params={"q": "ㅅㅅㅈ", "limit": 5})
+            response.raise_for_status()
+            suggestions = response.json()
+            assert suggestions[0]["code"] == "005930" and len(suggestions) <= 5, suggestions
+            result["autocomplete_example"] = {"q": "ㅅㅅㅈ", "items": [f"{item['name']} ({item['match']})" for item in suggestions]}
+        result["stats"] = stock_symbols.stats()
+    finally:
+        server.stop()
+        tmp_dir.cleanup()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
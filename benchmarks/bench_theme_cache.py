@@ -0,0 +1,148 @@
+"""
+테마 뉴스 캐시 벤치마크/검증: 매 요청 DeepSearch 직접 조회(기존) vs read-through 캐시.
+
+로컬 DeepSearch 스텁(ETag/304, 지연/오류 주입)과 uvicorn 으로 띄운 앱의 /api/news/theme/{theme} 를 사용합니다.
+요청 테마는 소수 테마에 몰리는 Zipf 분포로 뽑습니다.
+확인 항목
+- 업스트림 호출 수/지연, 캐시 적중률 (신선/오래됨 적중, 동시 miss 합치기)
+- 오래된 항목은 바로 응답하고 백그라운드에서 304 로 갱신되는지
+- 캐시 크기 상한(LRU), 조회 실패 시 옛 값 응답
+- 조회에 실패한 테마는 요청이 많아도 승격되지 않는지
+- 자주 요청된 테마가 promoted_themes 로 승격되어 정기 수집(NewsRefresher) 대상에 들어가는지
+실행: python -m benchmarks.bench_theme_cache --requests 2000 --themes 60
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def zipf_themes(themes: list[str], count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(themes))]
+    return rng.choices(themes, weights=weights, k=count)
+
+async def fire(base_url: str, themes: list[str], concurrency: int, expect_ok: bool = True) -> list[float]:
+    import httpx
+
+    samples: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        async def one(theme: str):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(f"/api/news/theme/{theme}")
+                samples.append(time.perf_counter() - started)
+                if expect_ok:
+                    assert response.status_code == 200 and response.json(), (theme, response.status_code)
+        await asyncio.gather(*(one(theme) for theme in themes))
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--themes", type=int, default=60, help="요청에 쓰는 비주요 테마 수")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05, help="DeepSearch 요청당 지연(초)")
+    args = parser.parse_args()
+
+    from benchmarks.fakes import FakeDeepSearchServer
+    from benchmarks.harness import latency_summary, serve_app
+
+    themes = [f"테마{i:02d}" for i in range(args.themes)]
+    server = FakeDeepSearchServer(themes, per_source=5, latency=args.latency).start()
+    tmp_dir = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir.name, 'theme_cache.db')}"
+    os.environ["DEEPSEARCH_API_BASE_URL"] = server.deepsearch_api_base_url
+    # 짧은 측정 시간 안에 만료/오래됨/승격이 모두 일어나도록 값을 줄입니다.
+    os.environ["THEME_CACHE_TTL"] = "1.0"
+    os.environ["THEME_CACHE_STALE_TTL"] = "30.0"
+    os.environ["THEME_CACHE_MAXSIZE"] = str(args.themes // 2)
+    os.environ["THEME_PROMOTE_THRESHOLD"] = "50"
+
+    from app.config import settings
+    from app.core import news_fetcher
+    from app.services.news_refresher import NewsRefresher
+    from app.services.theme_news_cache import theme_news_cache
+
+    workload = zipf_themes(themes, args.requests)
+    result = {"requests": args.requests, "themes": args.themes, "upstream_latency_ms": args.latency * 1000}
+    try:
+        # 1) 기존: 요청마다 DeepSearch 를 직접 조회 (스레드풀에서 동기 호출)
+        server.reset_hits()
+        samples = []
+
+        def legacy(theme: str):
+            started = time.perf_counter()
+            assert news_fetcher.get_articles_by_theme(theme_name=theme, limit=5)
+            samples.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(legacy, workload))
+        result["legacy_direct"] = {
+            "seconds": round(time.perf_counter() - started, 2),
+            "upstream_requests": server.hits,
+            **latency_summary(samples),
+        }
+
+        with serve_app() as base_url:
+            # 2) 캐시: 같은 작업량을 두 번 (두 번째는 TTL 이 지나 오래된 항목을 304 로 갱신)
+            server.reset_hits()
+            started = time.perf_counter()
+            first = asyncio.run(fire(base_url, workload, args.concurrency))
+            first_seconds = time.perf_counter() - started
+            first_hits = server.hits
+
+            time.sleep(theme_news_cache.ttl + 0.1)
+            server.reset_hits()
+            not_modified_before = server.not_modified
+            second = asyncio.run(fire(base_url, workload, args.concurrency))
+            time.sleep(args.latency * 3)
+            stats = theme_news_cache.stats()
+            assert stats["size"] <= theme_news_cache.maxsize, stats
+            assert stats["stale_hits"] > 0 and server.not_modified > not_modified_before, stats
+            result["read_through_cache"] = {
+                "cold_pass": {"seconds": round(first_seconds, 2), "upstream_requests": first_hits, **latency_summary(first)},
+                "stale_pass": {"upstream_requests": server.hits, "upstream_304": server.not_modified - not_modified_before, **latency_summary(second)},
+                "stats": stats,
+            }
+
+            # 3) 조회 실패 시 옛 값으로 응답
+            hot = workload[0]
+            time.sleep(theme_news_cache.ttl + 0.1)
+            server.fail_next(1)
+            errors_before = theme_news_cache.errors
+            asyncio.run(fire(base_url, [hot] * 3, 1))
+            time.sleep(args.latency * 3)
+            assert theme_news_cache.errors > errors_before
+            result["stale_on_error"] = theme_news_cache.stale_on_error
+
+            # 조회에 실패한(기사 없는) 테마는 아무리 많이 요청돼도 승격되지 않음
+            server.fail_next(60)
+            asyncio.run(fire(base_url, ["없는테마"] * 60, 1, expect_ok=False))
+            time.sleep(args.latency * 3)
+            assert "없는테마" not in theme_news_cache.promoted, theme_news_cache.stats()
+            assert len(theme_news_cache._request_counts) <= theme_news_cache.maxsize
+
+        # 4) 승격: 가장 많이 요청된 테마들이 정기 수집 대상이 되는지
+        # (요청 수가 승격 기준을 넘긴 테마 중 최대 THEME_PROMOTE_MAX 개, 가장 인기 있는 테마는 반드시 포함)
+        promoted = NewsRefresher().promoted_themes()
+        by_popularity = sorted(set(workload), key=workload.count, reverse=True)
+        assert len(promoted) == min(settings.THEME_PROMOTE_MAX, len(theme_news_cache.promoted)), promoted
+        assert set(by_popularity[:3]) <= set(promoted), (promoted, by_popularity[:10])
+        assert all(2 * workload.count(theme) >= 50 for theme in promoted), promoted
+        metrics = asyncio.run(NewsRefresher(themes=[]).run_async())
+        assert all(metrics["sources"][theme]["saved"] == 5 for theme in promoted), metrics
+        result["promotion"] = {"promoted": sorted(promoted), "saved_by_scheduled_refresh": metrics["saved"]}
+    finally:
+        server.stop()
+        tmp_dir.cleanup()
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
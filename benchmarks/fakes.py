@@ -0,0 +1,448 @@
+"""
+벤치마크용 로컬 스텁(가짜 업스트림) 서버입니다.
+실제 외부 API 와 같은 경로/응답 형식을 흉내 내며, 응답 지연(latency)을 설정할 수 있습니다.
+"""
+import json
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import quoteattr
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # keep-alive 커넥션을 지원해야 풀링 효과를 제대로 측정할 수 있습니다.
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문이 따로 전송되므로 Nagle 알고리즘이 켜져 있으면 keep-alive 요청마다 ~40ms 지연이 생깁니다.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload, status: int = 200, headers: dict | None = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_not_modified(self, etag: str):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_xml(self, body: str, status: int = 200):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def start_event_stream(self):
+        """SSE 응답 헤더를 보냅니다. 본문 길이를 모르므로 전송 후 연결을 닫습니다."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def send_event(self, data: str):
+        self.wfile.write(f"data: {data}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _prepare(self) -> bool:
+        """공통 처리: 호출 기록, 지연 주입, 오류 주입. 오류를 응답했으면 False."""
+        stub: FakeServer = self.server.stub
+        stub.record_hit(self.path)
+        if stub.latency:
+            time.sleep(stub.latency)
+        error_status = stub.next_error()
+        if error_status is not None:
+            self.read_json_body()
+            self.send_json({"error": {"message": "injected error", "code": error_status}}, status=error_status)
+            return False
+        return True
+
+    def do_GET(self):
+        if self._prepare():
+            self.server.stub.handle_get(self)
+
+    def do_POST(self):
+        if self._prepare():
+            self.server.stub.handle_post(self)
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 기본 backlog(5)로는 동시 접속 시 SYN 재전송 지연이 생겨 측정값이 왜곡됩니다.
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # 앱 프로세스 종료 등으로 클라이언트가 응답 도중 연결을 끊은 경우는 조용히 넘어갑니다.
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+class FakeServer:
+    """백그라운드 스레드에서 동작하는 스텁 HTTP 서버의 기본 클래스입니다."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, error_status: int = 503):
+        self.latency = latency
+        # error_rate 확률로 error_status 응답을 돌려줍니다. fail_next(n) 으로 다음 n 건을 확정적으로 실패시킬 수도 있습니다.
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._forced_errors: list[int] = []
+        self.errors = 0
+        self.hits = 0
+        self.hits_by_path: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server: _StubHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_hit(self, path: str):
+        with self._lock:
+            self.hits += 1
+            self.hits_by_path[path] = self.hits_by_path.get(path, 0) + 1
+
+    def fail_next(self, count: int, status: int | None = None):
+        with self._lock:
+            self._forced_errors.extend([status or self.error_status] * count)
+
+    def next_error(self) -> int | None:
+        with self._lock:
+            if self._forced_errors:
+                self.errors += 1
+                return self._forced_errors.pop(0)
+            if self.error_rate and random.random() < self.error_rate:
+                self.errors += 1
+                return self.error_status
+        return None
+
+    def reset_hits(self):
+        with self._lock:
+            self.hits = 0
+            self.hits_by_path.clear()
+
+    def handle_get(self, handler: _StubHandler):
+        handler.send_json({"error": "not found"}, status=404)
+
+    def handle_post(self, handler: _StubHandler):
+        handler.send_json({"error": "not found"}, status=404)
+
+    def start(self) -> "FakeServer":
+        self._server = _StubHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def naver_integration_payload(stock_code: str) -> dict:
+    """네이버 /api/stock/{code}/integration 응답과 같은 구조의 샘플 데이터를 만듭니다."""
+    seed = int(stock_code) if stock_code.isdigit() else len(stock_code)
+    price = 10_000 + seed % 90_000
+    return {
+        "stockName": f"테스트종목{stock_code}",
+        "dealTrendInfos": [
+            {"bizdate": "20250101", "closePrice": f"{price:,}"},
+        ],
+        "totalInfos": [
+            {"code": "marketValue", "key": "시총", "value": f"{seed % 500 + 1}조 원"},
+            {"code": "per", "key": "PER", "value": f"{(seed % 300) / 10:.2f}배"},
+            {"code": "pbr", "key": "PBR", "value": f"{(seed % 50) / 10:.2f}배"},
+        ],
+    }
+
+class FakeNaverStockServer(FakeServer):
+    """
+    네이버 증권 /api/stock/{code}/integration 스텁.
+    price_step 을 주면 같은 종목을 조회할 때마다 현재가가 그만큼 오릅니다. (실시간 시세 변화 흉내)
+    """
+
+    def __init__(self, price_step: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.price_step = price_step
+        self.quotes_by_code: dict[str, int] = {}
+
+    def handle_get(self, handler: _StubHandler):
+        parts = urlparse(handler.path).path.strip("/").split("/")
+        # 기대 경로: api/stock/{code}/integration
+        if len(parts) == 4 and parts[:2] == ["api", "stock"] and parts[3] == "integration":
+            payload = naver_integration_payload(parts[2])
+            if self.price_step:
+                with self._lock:
+                    count = self.quotes_by_code[parts[2]] = self.quotes_by_code.get(parts[2], 0) + 1
+                price = int(payload["dealTrendInfos"][0]["closePrice"].replace(",", "")) + self.price_step * count
+                payload["dealTrendInfos"][0]["closePrice"] = f"{price:,}"
+            handler.send_json(payload)
+        else:
+            handler.send_json({"error": "not found"}, status=404)
+
+    @property
+    def stock_api_base_url(self) -> str:
+        return f"{self.base_url}/api/stock"
+
+# FOMC 결정에 따른 실효 연방기금금리(DFF) 변화 시점을 본뜬 재현 데이터 (적용일, 금리 %)
+DFF_STEPS = [
+    (date(2019, 1, 1), 2.40), (date(2019, 8, 1), 2.13), (date(2019, 9, 19), 1.90), (date(2019, 10, 31), 1.55),
+    (date(2020, 3, 4), 1.10), (date(2020, 3, 16), 0.08), (date(2022, 3, 17), 0.33), (date(2022, 5, 5), 0.83),
+    (date(2022, 6, 16), 1.58), (date(2022, 7, 28), 2.33), (date(2022, 9, 22), 3.08), (date(2022, 11, 3), 3.83),
+    (date(2022, 12, 15), 4.33), (date(2023, 2, 2), 4.58), (date(2023, 3, 23), 4.83), (date(2023, 5, 4), 5.08),
+    (date(2023, 7, 27), 5.33), (date(2024, 9, 19), 4.83), (date(2024, 11, 8), 4.58), (date(2024, 12, 19), 4.33),
+]
+# 미국 실질 GDP 성장률(전분기 대비 연율, A191RL1Q225SBEA) 재현 데이터
+GDP_QUARTERS = [
+    -1.0, 0.3, 2.7, 3.4,   # 2022
+    2.8, 2.4, 4.4, 3.2,    # 2023
+    1.6, 3.0, 3.1, 2.4,    # 2024
+    -0.5,                  # 2025 Q1
+]
+
+def fred_recorded_series(until: date) -> dict[str, list[tuple[date, float]]]:
+    """DFF(일별, 2019-01-01~until) 와 GDP 성장률(분기별, 2022Q1~) 관측값 목록을 만듭니다."""
+    dff, step = [], 0
+    day = DFF_STEPS[0][0]
+    while day <= until:
+        while step + 1 < len(DFF_STEPS) and DFF_STEPS[step + 1][0] <= day:
+            step += 1
+        dff.append((day, DFF_STEPS[step][1]))
+        day += timedelta(days=1)
+    gdp = [(date(2022 + i // 4, 1 + 3 * (i % 4), 1), value) for i, value in enumerate(GDP_QUARTERS)]
+    return {"DFF": dff, "A191RL1Q225SBEA": [item for item in gdp if item[0] <= until]}
+
+class FakeFredServer(FakeServer):
+    """
+    FRED /fred/series/observations 스텁 (fredapi 가 읽는 XML 형식).
+    observation_start 이후 관측값만 돌려주며, 요청마다 돌려준 관측 수를 observations_served 에 기록합니다.
+    advance(days) 로 날짜를 넘겨 새 관측값이 생기는 상황을 만들 수 있습니다.
+    """
+
+    def __init__(self, until: date = date(2025, 6, 30), **kwargs):
+        super().__init__(**kwargs)
+        self.until = until
+        self.series = fred_recorded_series(until)
+        self.observations_served: list[tuple[str, str | None, int]] = []
+
+    def advance(self, days: int = 1):
+        """DFF 에 마지막 금리와 같은 값으로 days 일치 관측값을 추가합니다."""
+        with self._lock:
+            last_day, last_value = self.series["DFF"][-1]
+            for offset in range(1, days + 1):
+                self.series["DFF"].append((last_day + timedelta(days=offset), last_value))
+            self.until = last_day + timedelta(days=days)
+
+    def handle_get(self, handler: _StubHandler):
+        url = urlparse(handler.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path != "/fred/series/observations":
+            handler.send_xml('<error code="404" message="Not Found."/>', status=404)
+            return
+        series_id = query.get("series_id")
+        with self._lock:
+            observations = list(self.series.get(series_id, []))
+        if series_id not in self.series:
+            handler.send_xml('<error code="400" message="Bad Request.  The series does not exist."/>', status=400)
+            return
+        start = query.get("observation_start")
+        if start:
+            observations = [item for item in observations if item[0] >= date.fromisoformat(start)]
+        with self._lock:
+            self.observations_served.append((series_id, start, len(observations)))
+        rows = "".join(
+            f'<observation realtime_start="{self.until}" realtime_end="{self.until}" date="{day}" value={quoteattr(f"{value:.2f}")}/>'
+            for day, value in observations
+        )
+        handler.send_xml(f'<?xml version="1.0" encoding="utf-8"?><observations count="{len(observations)}">{rows}</observations>')
+
+    @property
+    def fred_api_base_url(self) -> str:
+        return f"{self.base_url}/fred"
+
+class FakeDeepSearchServer(FakeServer):
+    """
+    DeepSearch /v1/global-articles/topics/trending, /v1/articles?keyword= 스텁.
+    - 출처(거시 토픽 / 키워드)마다 최신순 기사 목록과 버전을 두고, 버전으로 ETag 를 만듭니다.
+    - If-None-Match 가 현재 ETag 와 같으면 304 를 돌려줍니다. (etag=False 이면 ETag 없이 항상 200)
+    - publish(keyword, count) 로 새 기사가 올라온 상황을 만들 수 있습니다. (keyword=None 이면 거시 토픽)
+    - keyword_latency 로 특정 키워드만 느리게 응답하게 할 수 있습니다.
+    - /v2/companies/search 는 companies(종목명 → 종목 코드)에서 키워드가 포함된 첫 종목을 돌려줍니다.
+    """
+
+    def __init__(
+        self,
+        keywords: list[str],
+        per_source: int = 10,
+        etag: bool = True,
+        keyword_latency: dict[str, float] | None = None,
+        companies: dict[str, str] | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.companies = companies or {}
+        self.etag = etag
+        self.keyword_latency = keyword_latency or {}
+        self.feeds: dict[str | None, list[dict]] = {}
+        self.versions: dict[str | None, int] = {}
+        self.not_modified = 0
+        self._sequence = 0
+        for keyword in [None, *keywords]:
+            self.feeds[keyword] = []
+            self.versions[keyword] = 0
+            self.publish(keyword, per_source)
+
+    def publish(self, keyword: str | None, count: int = 1):
+        with self._lock:
+            for _ in range(count):
+                self._sequence += 1
+                published_at = (datetime(2025, 1, 1) + timedelta(minutes=self._sequence)).isoformat()
+                if keyword is None:
+                    item = {"id": f"topic-{self._sequence}", "title": f"Topic {self._sequence}", "title_ko": f"거시 토픽 {self._sequence}", "date": published_at}
+                else:
+                    item = {"title": f"{keyword} 기사 {self._sequence}", "url": f"https://news.example.com/{self._sequence}", "published_at": published_at}
+                self.feeds[keyword].insert(0, item)
+            self.versions[keyword] += 1
+
+    def handle_get(self, handler: _StubHandler):
+        url = urlparse(handler.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/v2/companies/search":
+            keyword = query.get("keyword", "")
+            found = [{"name": name, "symbol": code} for name, code in self.companies.items() if keyword and keyword in name]
+            handler.send_json({"data": found[:int(query.get("page_size", 10))]})
+            return
+        if url.path == "/v1/global-articles/topics/trending":
+            keyword = None
+        elif url.path == "/v1/articles" and query.get("keyword") in self.feeds:
+            keyword = query["keyword"]
+        else:
+            handler.send_json({"error": "not found"}, status=404)
+            return
+        if keyword in self.keyword_latency:
+            time.sleep(self.keyword_latency[keyword])
+        page_size = int(query.get("page_size", 10))
+        with self._lock:
+            items = self.feeds[keyword][:page_size]
+            # 헤더는 latin-1 만 허용하므로 키워드 대신 출처 순번으로 ETag 를 만듭니다.
+            etag = f'"feed{list(self.feeds).index(keyword)}-{self.versions[keyword]}"'
+        if self.etag and handler.headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.not_modified += 1
+            handler.send_not_modified(etag)
+            return
+        handler.send_json({"data": items}, headers={"ETag": etag} if self.etag else None)
+
+    @property
+    def deepsearch_api_base_url(self) -> str:
+        return self.base_url
+
+class FakeOpenAIServer(FakeServer):
+    """
+    OpenAI 호환 /v1/chat/completions 스텁 (HyperCLOVA X 게이트웨이와 GPT 모두 대체).
+    stream=true 요청에는 토큰 단위 SSE 청크를 token_delay 간격으로 보냅니다.
+    prefill_delay_per_1k_chars 를 주면 프롬프트 길이에 비례해 첫 토큰까지 더 기다립니다. (긴 입력의 처리 비용)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        token_delay: float = 0.0,
+        report_tokens: int = 50,
+        prefill_delay_per_1k_chars: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(latency=latency, **kwargs)
+        self.token_delay = token_delay
+        self.report_tokens = report_tokens
+        self.prefill_delay_per_1k_chars = prefill_delay_per_1k_chars
+        self.prompt_chars: list[int] = []
+
+    def completion_text(self, prompt: str) -> str:
+        if "결론: [매수/매도/중립]" in prompt:
+            return "결론: 중립, 근거: 금리 인하 기대와 무역 갈등 리스크가 함께 존재합니다."
+        return " ".join(f"분석문장{i}." for i in range(self.report_tokens))
+
+    def handle_post(self, handler: _StubHandler):
+        if not urlparse(handler.path).path.endswith("/chat/completions"):
+            handler.send_json({"error": "not found"}, status=404)
+            return
+        body = handler.read_json_body()
+        prompt = "\n".join(message.get("content", "") for message in body.get("messages", []))
+        with self._lock:
+            self.prompt_chars.append(len(prompt))
+        if self.prefill_delay_per_1k_chars:
+            time.sleep(self.prefill_delay_per_1k_chars * len(prompt) / 1000)
+        text = self.completion_text(prompt)
+        model = body.get("model", "fake-model")
+        created = int(time.time())
+
+        if not body.get("stream"):
+            # 실제 LLM 처럼 모든 토큰을 생성한 뒤에야 응답합니다.
+            if self.token_delay:
+                time.sleep(self.token_delay * len(text.split(" ")))
+            handler.send_json({
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(text), "total_tokens": len(prompt) + len(text)},
+            })
+            return
+
+        handler.start_event_stream()
+        for token in text.split(" "):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token + " "}, "finish_reason": None}],
+            }
+            handler.send_event(json.dumps(chunk, ensure_ascii=False))
+        handler.send_event(json.dumps({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }))
+        handler.send_event("[DONE]")
+
+    @property
+    def api_base_url(self) -> str:
+        return f"{self.base_url}/v1"
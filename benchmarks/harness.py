@@ -0,0 +1,109 @@
+"""
+벤치마크 공용 도우미: FastAPI 앱을 백그라운드 스레드(또는 별도 프로세스)의 uvicorn 으로 띄우고, 지연 시간을 요약합니다.
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def latency_summary(samples: list[float]) -> dict:
+    """초 단위 지연 시간 목록을 ms 단위 p50/p95/p99/mean 으로 요약합니다."""
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2),
+    }
+
+@contextmanager
+def serve_app(lifespan: str = "off"):
+    """
+    app.main:app 을 임의 포트의 uvicorn 으로 띄우고 base URL 을 돌려줍니다.
+    (환경 변수로 업스트림 주소를 바꾼 뒤에 호출해야 합니다)
+    lifespan="off" 이면 스케줄러 등은 시작하지 않고 테이블만 만듭니다.
+    """
+    import uvicorn
+    from app.database import init_db
+    from app.main import app
+
+    if lifespan == "off":
+        init_db()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan=lifespan))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("uvicorn 서버가 시작되지 않았습니다.")
+        time.sleep(0.02)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join(10)
+        sock.close()
+
+@contextmanager
+def serve_app_process(env: dict[str, str], workers: int = 1, log_path: str | None = None, timeout: float = 60.0):
+    """
+    app.main:app 을 별도 프로세스의 uvicorn 으로 띄우고 base URL 을 돌려줍니다.
+    부하 생성기와 GIL 을 나눠 쓰지 않으므로 처리량 측정에 사용합니다.
+    lifespan(테이블 생성, 검색 로그 기록기, 스케줄러)을 그대로 실행하며, env 로 업스트림 주소 등을 덮어씁니다.
+    """
+    import httpx
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn 프로세스가 종료되었습니다. (exit {process.returncode}, 로그: {log_path})")
+            try:
+                # lifespan 시작 처리가 끝나야 요청을 받으므로 첫 200 응답이 곧 준비 완료입니다.
+                if httpx.get(base_url + "/", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn 서버가 시작되지 않았습니다.")
+            time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        if log_path:
+            log.close()
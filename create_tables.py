@@ -1,10 +1,10 @@
 # ./create_tables.py
-from app.database import engine, Base
-import app.db_models  # ✅ 테이블 정의를 실제로 메모리에 로딩
+# 스키마 생성 단계 (배포 시 1회). 앱은 임포트 시점에 테이블을 만들지 않습니다.
+from app.database import engine, init_db
 import os
 
-# 모든 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 모든 테이블 생성 (app/models/db_models.py 기준)
+init_db()
 
 # 실제 DB 경로 출력
 db_url = str(engine.url)
@@ -0,0 +1,79 @@
+# ./migrate_news_articles.py
+# 기존 news_articles 테이블(published_at 문자열, source 단일 인덱스)을
+# published_at DATETIME + (source, published_at DESC) / (click_count DESC) 복합 인덱스 스키마로 옮깁니다.
+# (app/database.py 의 SQLite DB 기준) 사용법: python migrate_news_articles.py [--batch-size 10000]
+import argparse
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect, insert, text
+
+from app.database import engine
+from app.models import db_models
+from app.models.schemas import parse_published_at
+
+LEGACY_TABLE = "news_articles_legacy"
+
+def needs_migration(conn) -> bool:
+    inspector = inspect(conn)
+    if not inspector.has_table("news_articles"):
+        return False
+    index_names = {index["name"] for index in inspector.get_indexes("news_articles")}
+    return "ix_news_articles_source_published_at" not in index_names
+
+def migrate(batch_size: int = 10_000) -> int:
+    """기존 행을 id 를 유지한 채 새 스키마 테이블로 복사하고, 옮긴 행 수를 반환합니다. (한 트랜잭션)"""
+    table = db_models.NewsArticle.__table__
+    fallback = datetime.now(timezone.utc).replace(tzinfo=None)
+    migrated = 0
+    if engine.dialect.name != "sqlite":
+        raise SystemExit("SQLite DB 만 지원합니다.")
+    with engine.begin() as conn:
+        if not needs_migration(conn):
+            print("이미 새 스키마입니다. 건너뜁니다.")
+            return 0
+
+        # 1. 기존 테이블 이름을 바꾸고, 새 테이블과 이름이 겹치는 인덱스를 지웁니다.
+        conn.execute(text(f"ALTER TABLE news_articles RENAME TO {LEGACY_TABLE}"))
+        for index in inspect(conn).get_indexes(LEGACY_TABLE):
+            conn.execute(text(f'DROP INDEX IF EXISTS "{index["name"]}"'))
+
+        # 2. 새 스키마로 테이블/인덱스 생성
+        table.create(conn)
+
+        # 3. id 순서대로 나눠 읽으면서 published_at 을 datetime 으로 변환해 복사
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                text(
+                    f"SELECT id, title, url, published_at, source, click_count FROM {LEGACY_TABLE} "
+                    "WHERE id > :last_id ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                break
+            conn.execute(insert(table), [
+                {
+                    "id": row.id,
+                    "title": row.title,
+                    "url": row.url,
+                    "published_at": parse_published_at(row.published_at) or fallback,
+                    "source": row.source or "",
+                    "click_count": row.click_count or 0,
+                }
+                for row in rows
+            ])
+            last_id = rows[-1].id
+            migrated += len(rows)
+            print(f"  {migrated}개 이전 완료")
+
+        conn.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+    return migrated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="news_articles 테이블을 새 스키마로 마이그레이션합니다.")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    count = migrate(args.batch_size)
+    print(f"✅ news_articles 마이그레이션 완료 ({count}개 행)")
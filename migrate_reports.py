@@ -0,0 +1,44 @@
+# ./migrate_reports.py
+# 기존 reports/{uuid}.txt 보고서 파일을 보고서 저장소(기본: SQLite)로 옮깁니다.
+# 사용법: python migrate_reports.py [--source reports] [--batch-size 1000] [--delete]
+import argparse
+import os
+
+from app.config import settings
+from app.core.report_store import FileReportStore, SQLiteReportStore
+
+def migrate(source_dir: str, target: SQLiteReportStore, batch_size: int = 1000, delete: bool = False) -> int:
+    """source_dir 의 .txt 보고서를 batch_size 개씩 묶어 target 에 저장하고, 옮긴 개수를 반환합니다."""
+    source = FileReportStore(source_dir, cache_size=0)
+    migrated = 0
+    batch = []
+
+    def flush():
+        nonlocal migrated
+        migrated += target.put_many((report_id, text) for report_id, _, text in batch)
+        if delete:
+            # 저장이 끝난 배치만 원본 파일을 지웁니다. (파일 이름이 대문자 UUID 여도 스캔한 경로 그대로)
+            for _, file_path, _ in batch:
+                os.remove(file_path)
+        batch.clear()
+        print(f"  {migrated}개 이전 완료")
+
+    for report in source.iter_report_files():
+        batch.append(report)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return migrated
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="reports/*.txt 보고서를 보고서 저장소로 이전합니다.")
+    parser.add_argument("--source", default=settings.REPORTS_DIR, help="기존 .txt 보고서 디렉터리")
+    parser.add_argument("--target", default=settings.REPORT_STORE_PATH, help="SQLite 보고서 저장소 경로")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--delete", action="store_true", help="이전한 .txt 파일 삭제")
+    args = parser.parse_args()
+
+    store = SQLiteReportStore(args.target, cache_size=0)
+    count = migrate(args.source, store, args.batch_size, args.delete)
+    print(f"✅ 보고서 {count}개 이전 완료 → {os.path.abspath(args.target)} (총 {store.count()}개)")